@@ -1,16 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import io
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
 
 import numpy as np
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from PIL import Image
 
-from bodycomp_estimator.estimator import estimate_body_fat_percent
-from bodycomp_estimator.pose import PoseExtractor
-from bodycomp_estimator.schemas import SubjectMetadata
-from bodycomp_estimator.quality import quality_gate_message
+from bodycomp_estimator.config import ConfigStore, RuntimeConfig
+from bodycomp_estimator.analytics import OK, CohortAnalytics
+from bodycomp_estimator.bodyfat_model import HEURISTIC_V0, load_bodyfat_model
+from bodycomp_estimator.estimator import estimate_body_fat_percent, estimate_body_fat_percent_multiview
+from bodycomp_estimator.history import SubjectHistory
+from bodycomp_estimator.pose import LivePoseTracker, PoseExtractor, PoseExtractorPool
+from bodycomp_estimator.schemas import EstimateResult, SubjectMetadata
+from bodycomp_estimator.quality import QUALITY_MESSAGES_PTBR, QualityGates, QualityReport
+from bodycomp_estimator.quality_model import load_quality_model, precheck_reason
+from bodycomp_estimator.selection import iter_video_frames, select_best_frame, select_burst_frame
+from bodycomp_estimator.uncertainty import jitter_uncertainty
+from bodycomp_estimator.telemetry import GateTelemetry, load_snapshots
+
+from .responses import BurstEstimateResponse, EstimateResponse, FastJSONResponse, VideoEstimateResponse
 
 app = FastAPI(title="NextNutri BodyComp MVP", version="0.1.0")
 
@@ -22,81 +40,615 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-pose_extractor = PoseExtractor(static_image_mode=True, model_complexity=1)
+# Gate thresholds + model paths, versioned and hot-reloaded from BODYCOMP_CONFIG
+# (file mtime or SIGHUP). Each request reads one snapshot and uses it throughout.
+config_store = ConfigStore.from_env()
+config_store.install_sighup()
+
+# IMAGE-mode landmarkers, checked out per call: a landmarker must not be used from
+# two threads at once. Landmarkers load their model on first use, so idle instances
+# are cheap. `side_pose_pool` serves the side photo of /estimate/multiview, so the
+# two views run in parallel without one request holding two instances of one pool.
+POSE_POOL_SIZE = int(os.environ.get("BODYCOMP_POSE_POOL_SIZE", "2"))
+
+
+def _pose_pool(model_path: str | None = None) -> PoseExtractorPool:
+    return PoseExtractorPool(
+        lambda: PoseExtractor(static_image_mode=True, model_path=model_path), size=POSE_POOL_SIZE
+    )
+
+
+pose_pool = _pose_pool()
+side_pose_pool = _pose_pool()
+_pose_model_path: str | None = None  # config value the landmarkers were built for
+_pose_swap_lock = threading.Lock()
+
+
+def _runtime() -> tuple[RuntimeConfig, PoseExtractorPool, PoseExtractorPool]:
+    """Config snapshot for one request and the (front, side) landmarker pools matching it.
+
+    The pools are only rebuilt when the configured pose model changes. Requests
+    already running keep the pools they started with; the replaced pools are
+    retired, so each landmarker is closed once its current request returns it.
+    """
+    global pose_pool, side_pose_pool, _pose_model_path
+    with _pose_swap_lock:
+        cfg = config_store.current()
+        if cfg.pose_model_path != _pose_model_path:
+            retired = (pose_pool, side_pose_pool)
+            pose_pool = _pose_pool(cfg.pose_model_path)
+            side_pose_pool = _pose_pool(cfg.pose_model_path)
+            _pose_model_path = cfg.pose_model_path
+            for pool in retired:
+                pool.retire()
+        return cfg, pose_pool, side_pose_pool
+
+
+# Landmark-jitter band (`jitter_samples` form field): hard caps per request.
+JITTER_MAX_SAMPLES = 1024
+JITTER_BUDGET_MS = 5.0
+
+
+# Per-subject estimate history (SQLite), opened on first use.
+HISTORY_DB = os.environ.get(
+    "BODYCOMP_HISTORY_DB", str(Path(__file__).resolve().parents[2] / "data" / "history" / "subjects.sqlite3")
+)
+_subject_history: SubjectHistory | None = None
+_stores_lock = threading.Lock()
+
+
+def subject_history() -> SubjectHistory:
+    global _subject_history
+    if _subject_history is None:
+        with _stores_lock:
+            if _subject_history is None:
+                _subject_history = SubjectHistory(HISTORY_DB)
+    return _subject_history
+
+
+# Clinic analytics (estimate records + day/clinic rollups, SQLite), opened on first use.
+ANALYTICS_DB = os.environ.get(
+    "BODYCOMP_ANALYTICS_DB", str(Path(__file__).resolve().parents[2] / "data" / "analytics" / "estimates.sqlite3")
+)
+_cohort_analytics: CohortAnalytics | None = None
+_DAY_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def cohort_analytics() -> CohortAnalytics:
+    global _cohort_analytics
+    if _cohort_analytics is None:
+        with _stores_lock:
+            if _cohort_analytics is None:
+                _cohort_analytics = CohortAnalytics(ANALYTICS_DB)
+    return _cohort_analytics
+
+
+# Gate-metric histograms (fixed memory, no photos kept). With several worker processes,
+# set BODYCOMP_TELEMETRY_DIR to a shared directory: each worker dumps its snapshot
+# there and /telemetry/gates merges them.
+gate_telemetry = GateTelemetry()
+TELEMETRY_DIR = os.environ.get("BODYCOMP_TELEMETRY_DIR", "")
+TELEMETRY_DUMP_EVERY = 100
+_telemetry_pending = 0
+_telemetry_lock = threading.Lock()
+
+
+def _dump_telemetry() -> None:
+    if TELEMETRY_DIR:
+        gate_telemetry.dump(Path(TELEMETRY_DIR) / f"gates-{os.getpid()}.json")
+
+
+def _record_telemetry(report: QualityReport, gates: QualityGates, pose_xy: np.ndarray | None = None) -> None:
+    global _telemetry_pending
+    if pose_xy is None:
+        gate_telemetry.record_precheck(report, gates)
+    else:
+        gate_telemetry.record_pose(report, pose_xy)
+    with _telemetry_lock:
+        _telemetry_pending += 1
+        due = _telemetry_pending >= TELEMETRY_DUMP_EVERY
+        if due:
+            _telemetry_pending = 0
+    if due:
+        _dump_telemetry()
+
+
+# One tracker per WebSocket stream (tracking state is per client).
+live_tracker_factory = LivePoseTracker
+
+
+def video_extractor_factory(model_path: str | None = None) -> PoseExtractor:
+    # VIDEO mode: tracking state belongs to one clip, so one extractor per request.
+    return PoseExtractor(static_image_mode=False, model_path=model_path)
+
+
+NO_POSE_MESSAGE_PTBR = (
+    "Não detectei pose. Use uma foto de corpo inteiro (cabeça aos pés), "
+    "bem iluminada, em pé, sem oclusões (braços colados no corpo ajudam)."
+)
+NO_GOOD_FRAME_MESSAGE_PTBR = (
+    "Nenhum quadro do vídeo passou nos critérios de qualidade. Grave de novo com boa luz, "
+    "celular apoiado e o corpo inteiro visível (cabeça aos pés)."
+)
 
 
-def _quality_payload(ok: bool, reason: str, message_ptbr: str) -> dict:
+def _quality_payload(ok: bool, reason: str, message_ptbr: str, config_version: str) -> dict:
     return {
         "quality_ok": ok,
         "quality_reason": reason,
         "quality_message_ptbr": message_ptbr,
+        "config_version": config_version,
     }
 
 
 @app.get("/health")
 def health() -> dict:
-    return {"ok": True}
+    cfg = config_store.current()
+    return {"ok": True, "config_version": cfg.version, "config_error": config_store.last_error}
+
+
+@app.get("/telemetry/gates")
+def telemetry_gates() -> dict:
+    """Merged gate-metric histograms + acceptance rates under the live QualityGates."""
+    cfg = config_store.current()
+    if TELEMETRY_DIR:
+        _dump_telemetry()
+        snapshots = load_snapshots([TELEMETRY_DIR])
+    else:
+        snapshots = [gate_telemetry.as_dict()]
+    merged = GateTelemetry.merged(snapshots)
+    return {
+        "workers": len(snapshots),
+        "config_version": cfg.version,
+        "acceptance": merged.acceptance(cfg.gates),
+        **merged.as_dict(),
+    }
+
+
+@app.get("/analytics")
+def analytics(clinic_id: str | None = None, start_day: str | None = None, end_day: str | None = None) -> dict:
+    """Outcome counts and BF%/confidence percentiles from the day x clinic rollups.
+
+    Days are UTC `YYYY-MM-DD`, inclusive; omitting `clinic_id` aggregates all clinics.
+    """
+    for day in (start_day, end_day):
+        if day is not None and not _DAY_RE.fullmatch(day):
+            raise HTTPException(status_code=400, detail="days must be YYYY-MM-DD")
+    out = cohort_analytics().query(clinic=clinic_id, start_day=start_day, end_day=end_day)
+    return {"clinic_id": clinic_id, "start_day": start_day, "end_day": end_day, **out}
 
 
-@app.post("/estimate")
+@app.get("/subjects/{subject_id}/trend")
+def subject_trend(subject_id: str, history: int = 0) -> dict:
+    """Stored trend aggregates (O(1) lookup) plus, optionally, the last `history` scans."""
+    store = subject_history()
+    trend = store.trend(subject_id)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="Unknown subject_id")
+    out = trend.as_dict()
+    if history > 0:
+        out["history"] = store.history(subject_id, limit=min(history, 500))
+    return out
+
+
+COMPACT_DESCRIPTION = "Omit the debug `features` from the response"
+
+
+@app.post("/estimate", response_model=EstimateResponse)
 async def estimate(
     image: UploadFile = File(..., description="Front-facing full-body photo"),
     sex: str = Form("unknown"),
     age_years: float | None = Form(None),
     height_cm: float | None = Form(None),
     weight_kg: float | None = Form(None),
-) -> dict:
-    content = await image.read()
+    jitter_samples: int = Form(0, description="Landmark-jitter samples for an empirical BF% band (0 = off)"),
+    subject_id: str | None = Form(None, description="Record the estimate in this subject's history"),
+    clinic_id: str | None = Form(None, description="Count this request in the clinic's analytics"),
+    compact: bool = Form(False, description=COMPACT_DESCRIPTION),
+) -> FastJSONResponse:
+    clinic = _short_id(clinic_id, "clinic_id")
+    image_rgb = _decode_image(await image.read())
+    cfg, pool, _ = _runtime()
+    try:
+        pose = await run_in_threadpool(_gated_pose, image_rgb, pool, cfg)
+    except HTTPException as e:
+        await run_in_threadpool(_record_rejection, clinic, e, cfg)
+        raise
+
+    meta = _subject_meta(sex, age_years, height_cm, weight_kg)
+    subject = _short_id(subject_id, "subject_id")
+    payload = await run_in_threadpool(
+        _estimate, pose, meta, cfg, jitter_samples, subject, clinic=clinic, compact=compact
+    )
+    return FastJSONResponse(payload)
+
+
+def _short_id(value: str | None, field: str) -> str | None:
+    v = (value or "").strip()
+    if len(v) > 128:
+        raise HTTPException(status_code=400, detail=f"{field} must be at most 128 characters")
+    return v or None
+
+
+def _decode_image(content: bytes) -> np.ndarray:
     if not content:
         raise HTTPException(status_code=400, detail="Empty upload")
-
     try:
         pil = Image.open(io.BytesIO(content)).convert("RGB")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {e}") from e
+    return np.array(pil)
+
+
+def _rejection(kind: str, code: str, msg: str, cfg: RuntimeConfig, view: str | None) -> HTTPException:
+    # structured detail for clients; `reason_code` is the specific gate that failed
+    detail = {**_quality_payload(False, kind, msg, cfg.version), "reason_code": code}
+    if view is not None:
+        detail["view"] = view
+    return HTTPException(status_code=422, detail=detail)
+
+
+def _gated_pose(image_rgb: np.ndarray, pool: PoseExtractorPool, cfg: RuntimeConfig, view: str | None = None):
+    """Quality gates + pose for one photo; raises a 422 `_rejection` when a gate fails.
 
-    image_rgb = np.array(pil)
+    A landmarker is checked out of `pool` only for the pose call itself.
+    """
+    gates = cfg.gates
 
-    # Fast quality gates before pose (blur/light).
-    msg = quality_gate_message(image_rgb)
-    if msg is not None:
-        # structured detail for clients
-        raise HTTPException(status_code=422, detail=_quality_payload(False, 'precheck', msg))
+    # Fast quality gates before pose (blur/light). Metrics are computed once and
+    # reused by the post-pose gate.
+    report = QualityReport.compute(image_rgb, gates)
+    _record_telemetry(report, gates)
+    reason = precheck_reason(report, gates, load_quality_model(cfg.quality_model_path))
+    if reason is not None:
+        raise _rejection("precheck", reason, QUALITY_MESSAGES_PTBR[reason], cfg, view)
 
-    pose = pose_extractor.extract(image_rgb)
+    with pool.checkout() as extractor:
+        pose = extractor.extract(image_rgb)
     if pose is None:
-        raise HTTPException(
-            status_code=422,
-            detail=_quality_payload(
-                False,
-                'no_pose',
-                ("Não detectei pose. Use uma foto de corpo inteiro (cabeça aos pés), "
-                 "bem iluminada, em pé, sem oclusões (braços colados no corpo ajudam)."),
-            ),
-        )
+        raise _rejection("no_pose", "no_pose", NO_POSE_MESSAGE_PTBR, cfg, view)
 
     # Post-pose gate: person too small in frame.
-    msg2 = quality_gate_message(image_rgb, pose_xy_norm=pose.xy)
-    if msg2 is not None:
-        raise HTTPException(status_code=422, detail=_quality_payload(False, 'too_small', msg2))
+    _record_telemetry(report, gates, pose.xy)
+    # Size gate only: the precheck above (heuristic or learned model) already passed.
+    reason = report.pose_reason(pose.xy, gates)
+    if reason is not None:
+        raise _rejection("too_small", reason, QUALITY_MESSAGES_PTBR[reason], cfg, view)
+    return pose
+
 
+@app.post("/estimate/multiview", response_model=EstimateResponse)
+async def estimate_multiview(
+    front: UploadFile = File(..., description="Front-facing full-body photo"),
+    side: UploadFile = File(..., description="Side (profile) full-body photo"),
+    sex: str = Form("unknown"),
+    age_years: float | None = Form(None),
+    height_cm: float | None = Form(None),
+    weight_kg: float | None = Form(None),
+    subject_id: str | None = Form(None, description="Record the estimate in this subject's history"),
+    clinic_id: str | None = Form(None, description="Count this request in the clinic's analytics"),
+    compact: bool = Form(False, description=COMPACT_DESCRIPTION),
+) -> FastJSONResponse:
+    meta = _subject_meta(sex, age_years, height_cm, weight_kg)
+    clinic = _short_id(clinic_id, "clinic_id")
+    front_rgb = _decode_image(await front.read())
+    side_rgb = _decode_image(await side.read())
+    cfg, pool, side_pool = _runtime()
+
+    # Both views on separate landmarkers in parallel: latency ~ the slower view.
+    try:
+        front_pose, side_pose = await asyncio.gather(
+            run_in_threadpool(_gated_pose, front_rgb, pool, cfg, "front"),
+            run_in_threadpool(_gated_pose, side_rgb, side_pool, cfg, "side"),
+        )
+    except HTTPException as e:
+        await run_in_threadpool(_record_rejection, clinic, e, cfg)
+        raise
+
+    payload = await run_in_threadpool(
+        _estimate,
+        front_pose,
+        meta,
+        cfg,
+        subject_id=_short_id(subject_id, "subject_id"),
+        side_pose=side_pose,
+        clinic=clinic,
+        compact=compact,
+    )
+    return FastJSONResponse(payload)
+
+
+def _subject_meta(
+    sex: str, age_years: float | None, height_cm: float | None, weight_kg: float | None
+) -> SubjectMetadata:
     sex_norm = sex.lower().strip()
     if sex_norm not in {"female", "male", "unknown"}:
         raise HTTPException(status_code=400, detail="sex must be female|male|unknown")
 
-    meta = SubjectMetadata(
+    return SubjectMetadata(
         sex=sex_norm, age_years=age_years, height_cm=height_cm, weight_kg=weight_kg
     )
-    result = estimate_body_fat_percent(pose, meta)
 
-    return {
+
+def _estimate(
+    pose,
+    meta: SubjectMetadata,
+    cfg: RuntimeConfig,
+    jitter_samples: int = 0,
+    subject_id: str | None = None,
+    side_pose=None,
+    clinic: str | None = None,
+    compact: bool = False,
+) -> dict:
+    """Estimate payload as plain JSON types, ready for `FastJSONResponse`.
+
+    Blocking (SQLite history/analytics writes, jitter sampling): handlers run it
+    with `run_in_threadpool`, never on the event loop.
+    """
+    # A configured but unreadable model file falls back to the built-in coefficients.
+    model = load_bodyfat_model(cfg.bodyfat_model_path)
+    if side_pose is None:
+        result = estimate_body_fat_percent(pose, meta, model)
+    else:
+        result = estimate_body_fat_percent_multiview(pose, side_pose, meta, model)
+    model_version = model.version if model else HEURISTIC_V0["version"]
+    payload = _estimate_payload(result, cfg.version, model_version, compact)
+    if jitter_samples > 0:
+        band = jitter_uncertainty(
+            pose, meta, model, max_samples=min(jitter_samples, JITTER_MAX_SAMPLES), budget_ms=JITTER_BUDGET_MS
+        )
+        payload["jitter"] = {
+            "low": band.low_percent,
+            "median": band.median_percent,
+            "high": band.high_percent,
+            "samples": band.samples,
+            "truncated": band.truncated,
+        }
+    if subject_id:
+        trend = subject_history().record(subject_id, result, model_version=model_version)
+        payload["history"] = trend.as_dict()
+    if clinic:
+        cohort_analytics().record(
+            clinic,
+            OK,
+            result.body_fat_percent,
+            result.confidence,
+            model_version=model_version,
+            config_version=cfg.version,
+        )
+    return payload
+
+
+def _record_rejection(clinic: str | None, e: HTTPException, cfg: RuntimeConfig) -> None:
+    # Blocking SQLite write: call through `run_in_threadpool` from the handlers.
+    if clinic and isinstance(e.detail, dict) and "reason_code" in e.detail:
+        cohort_analytics().record(clinic, e.detail["reason_code"], config_version=cfg.version)
+
+
+DISCLAIMER = (
+    "This is a research/prototype estimate with high uncertainty; not medical advice. "
+    "Do not use for diagnosis or treatment decisions."
+)
+
+
+def _estimate_payload(
+    result: EstimateResult, config_version: str, model_version: str, compact: bool = False
+) -> dict:
+    payload = {
         "body_fat_percent": result.body_fat_percent,
         "range": {"low": result.low_percent, "high": result.high_percent},
         "confidence": result.confidence,
         "notes": result.notes,
-        "features": result.features,
-        "disclaimer": (
-            "This is a research/prototype estimate with high uncertainty; not medical advice. "
-            "Do not use for diagnosis or treatment decisions."
-        ),
+        "disclaimer": DISCLAIMER,
+        "config_version": config_version,
+        "model_version": model_version,
     }
+    if not compact:
+        payload["features"] = result.features
+    return payload
+
+
+# Upload cap for /estimate/video: decoding stops at `max_frames`, but the clip is
+# spooled to disk first.
+MAX_VIDEO_BYTES = 64 * 2**20
+_COPY_CHUNK = 2**20
+
+
+def _spool_capped(src, dst, limit: int) -> int:
+    """Copy `src` to `dst` in chunks; 413 as soon as more than `limit` bytes arrive."""
+    total = 0
+    while chunk := src.read(_COPY_CHUNK):
+        total += len(chunk)
+        if total > limit:
+            raise HTTPException(status_code=413, detail=f"Video too large (max {limit // 2**20} MB)")
+        dst.write(chunk)
+    return total
+
+
+@app.post("/estimate/video", response_model=VideoEstimateResponse)
+async def estimate_video(
+    video: UploadFile = File(..., description="Short clip (a few seconds), full body in frame"),
+    sex: str = Form("unknown"),
+    age_years: float | None = Form(None),
+    height_cm: float | None = Form(None),
+    weight_kg: float | None = Form(None),
+    compact: bool = Form(False, description=COMPACT_DESCRIPTION),
+) -> FastJSONResponse:
+    """Estimate from the best frame of a short clip.
+
+    Frames are decoded lazily; brightness/blur gates run on every decoded frame and
+    VIDEO-mode pose tracking only on frames that pass them, stopping at the first
+    frame that passes every gate with high key-landmark visibility.
+    """
+    meta = _subject_meta(sex, age_years, height_cm, weight_kg)
+    cfg = config_store.current()
+
+    suffix = Path(video.filename or "clip.mp4").suffix or ".mp4"
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        # cv2.VideoCapture needs a path; stream the upload to disk in chunks.
+        size = await run_in_threadpool(_spool_capped, video.file, tmp, MAX_VIDEO_BYTES)
+        tmp.flush()
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        extractor = video_extractor_factory(cfg.pose_model_path)
+        try:
+            sel = await run_in_threadpool(
+                lambda: select_best_frame(
+                    iter_video_frames(tmp.name),
+                    extractor,
+                    cfg.gates,
+                    model=load_quality_model(cfg.quality_model_path),
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid video: {e}") from e
+        finally:
+            extractor.close()
+
+    if sel is None:
+        raise HTTPException(
+            status_code=422,
+            detail=_quality_payload(False, "no_good_frame", NO_GOOD_FRAME_MESSAGE_PTBR, cfg.version),
+        )
+
+    payload = await run_in_threadpool(_estimate, sel.pose, meta, cfg, compact=compact)
+    payload["frame"] = {
+        "index": sel.frame_index,
+        "timestamp_ms": sel.timestamp_ms,
+        "frames_seen": sel.frames_seen,
+        "pose_calls": sel.pose_calls,
+    }
+    return FastJSONResponse(payload)
+
+
+MAX_BURST_IMAGES = 10
+
+
+@app.post("/estimate/burst", response_model=BurstEstimateResponse)
+async def estimate_burst(
+    images: list[UploadFile] = File(..., description="2-10 shots of the same pose"),
+    sex: str = Form("unknown"),
+    age_years: float | None = Form(None),
+    height_cm: float | None = Form(None),
+    weight_kg: float | None = Form(None),
+    compact: bool = Form(False, description=COMPACT_DESCRIPTION),
+) -> FastJSONResponse:
+    """Estimate from the best shot of a burst.
+
+    All shots are scored with the brightness/blur gates (or one batched call of the
+    learned quality model, when present); pose runs only on
+    the top-ranked shots until one passes the post-pose bbox gate.
+    """
+    meta = _subject_meta(sex, age_years, height_cm, weight_kg)
+    if not images or len(images) > MAX_BURST_IMAGES:
+        raise HTTPException(status_code=400, detail=f"Send 1-{MAX_BURST_IMAGES} images")
+
+    arrays: list[np.ndarray] = []
+    for up in images:
+        content = await up.read()
+        if not content:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        try:
+            arrays.append(np.array(Image.open(io.BytesIO(content)).convert("RGB")))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid image: {e}") from e
+
+    cfg, pool, _ = _runtime()
+
+    def select():
+        with pool.checkout() as extractor:
+            return select_burst_frame(
+                arrays, extractor, cfg.gates, model=load_quality_model(cfg.quality_model_path)
+            )
+
+    sel = await run_in_threadpool(select)
+    if sel.pose is None:
+        message = sel.message_ptbr or NO_POSE_MESSAGE_PTBR
+        raise HTTPException(status_code=422, detail=_quality_payload(False, sel.reason, message, cfg.version))
+
+    payload = await run_in_threadpool(_estimate, sel.pose, meta, cfg, compact=compact)
+    payload["burst"] = {"selected": sel.index, "ranking": sel.order, "pose_calls": sel.pose_calls}
+    return FastJSONResponse(payload)
+
+
+def _process_live_frame(tracker: LivePoseTracker, data: bytes) -> dict:
+    """Gate + track one streamed frame; returns the JSON payload for the client."""
+    try:
+        image_rgb = np.array(Image.open(io.BytesIO(data)).convert("RGB"))
+    except Exception:
+        return {"pose": None, "error": "invalid_frame"}
+
+    cfg = config_store.current()
+    report = QualityReport.compute(image_rgb, cfg.gates)
+    reason = precheck_reason(report, cfg.gates, load_quality_model(cfg.quality_model_path))
+    if reason is not None:
+        # Skip pose on frames that fail the cheap gates.
+        return {"pose": None, **_quality_payload(False, "precheck", QUALITY_MESSAGES_PTBR[reason], cfg.version)}
+
+    if not tracker.submit(image_rgb, timestamp_ms=int(time.monotonic() * 1000)):
+        return {"pose": None, "skipped": True}
+    res = tracker.wait_result(timeout_s=1.0)
+    pose = res[1] if res is not None else None
+    if pose is None:
+        return {"pose": None, **_quality_payload(False, "no_pose", NO_POSE_MESSAGE_PTBR, cfg.version)}
+
+    vis = pose.visibility if pose.visibility is not None else np.zeros(len(pose.xy), dtype=np.float32)
+    landmarks = np.round(np.column_stack([pose.xy, vis]), 4).tolist()
+    reason = report.pose_reason(pose.xy, cfg.gates)
+    if reason is not None:
+        message = QUALITY_MESSAGES_PTBR[reason]
+        return {"pose": {"landmarks": landmarks}, **_quality_payload(False, "too_small", message, cfg.version)}
+    return {"pose": {"landmarks": landmarks}, **_quality_payload(True, "ok", "", cfg.version)}
+
+
+@app.websocket("/ws/pose")
+async def pose_stream(ws: WebSocket) -> None:
+    """Live pose + quality verdicts for a guided capture screen.
+
+    The client sends small encoded frames (JPEG/PNG) as binary messages; the server
+    answers each processed frame with landmarks [[x, y, visibility], ...] and the
+    quality payload. Only the newest pending frame is kept: frames that arrive while
+    the server is busy are dropped (counted in `dropped`).
+    """
+    await ws.accept()
+    pose_model_path = config_store.current().pose_model_path
+    tracker = live_tracker_factory() if pose_model_path is None else live_tracker_factory(model_path=pose_model_path)
+
+    pending: bytes | None = None
+    dropped = 0
+    closed = False
+    ready = asyncio.Event()
+
+    async def receive() -> None:
+        nonlocal pending, dropped, closed
+        try:
+            while True:
+                data = await ws.receive_bytes()
+                if pending is not None:
+                    dropped += 1
+                pending = data
+                ready.set()
+        except (WebSocketDisconnect, RuntimeError, KeyError):
+            closed = True
+            ready.set()
+
+    receiver = asyncio.create_task(receive())
+    frame = 0
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            if closed:
+                break
+            data, pending = pending, None
+            if data is None:
+                continue
+            frame += 1
+            payload = await run_in_threadpool(_process_live_frame, tracker, data)
+            payload.update(frame=frame, dropped=dropped)
+            await ws.send_json(payload)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        tracker.close()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:  # optional: ~5-10x faster than the stdlib encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _numpy_default(o: Any) -> Any:
+    if isinstance(o, (np.generic, np.ndarray)):
+        return o.tolist()
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes; orjson when installed, else the stdlib encoder."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_numpy_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered straight from plain dicts/lists/floats.
+
+    Returning it from a handler skips FastAPI's `jsonable_encoder` walk; the
+    endpoint's `response_model` then only documents the shape in OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class Range(BaseModel):
+    low: float
+    high: float
+
+
+class Jitter(BaseModel):
+    low: float
+    median: float
+    high: float
+    samples: int
+    truncated: bool
+
+
+class Trend(BaseModel):
+    subject_id: str
+    n: int
+    first_ts: float
+    last_ts: float
+    last_body_fat_percent: float
+    smoothed_body_fat_percent: float
+    trend_percent_per_week: float
+    ew_std: float
+    mean_body_fat_percent: float
+    std_body_fat_percent: float
+
+
+class EstimateResponse(BaseModel):
+    body_fat_percent: float
+    range: Range
+    confidence: float
+    notes: list[str]
+    features: dict[str, float] | None = None  # omitted with compact=true
+    disclaimer: str
+    config_version: str
+    model_version: str
+    jitter: Jitter | None = None
+    history: Trend | None = None
+
+
+class FrameInfo(BaseModel):
+    index: int
+    timestamp_ms: int
+    frames_seen: int
+    pose_calls: int
+
+
+class VideoEstimateResponse(EstimateResponse):
+    frame: FrameInfo
+
+
+class BurstInfo(BaseModel):
+    selected: int
+    ranking: list[int]
+    pose_calls: int
+
+
+class BurstEstimateResponse(EstimateResponse):
+    burst: BurstInfo
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.analytics import OK, CohortAnalytics
+
+DAY1 = 1_760_000_000.0  # 2025-10-09 UTC
+DAY2 = DAY1 + 86400.0
+
+
+def test_rollup_queries_match_raw_records(tmp_path) -> None:
+    store = CohortAnalytics(tmp_path / "a.sqlite3")
+    rng = np.random.default_rng(0)
+    bf = rng.uniform(10.0, 40.0, 400)
+    conf = rng.uniform(0.2, 0.8, 400)
+    for i in range(400):
+        store.record("c1" if i % 2 else "c2", OK, bf[i], conf[i], ts=DAY1 if i < 300 else DAY2)
+    for _ in range(7):
+        store.record("c1", "too_dark", ts=DAY2)
+
+    everything = store.query()
+    assert everything["count"] == 407 and everything["accepted"] == 400
+    assert everything["outcomes"] == {"ok": 400, "too_dark": 7}
+    for q in (0.1, 0.5, 0.9):
+        key = f"p{round(q * 100):02d}"
+        assert abs(everything["body_fat_percent"][key] - np.quantile(bf, q)) < 0.5
+        assert abs(everything["confidence"][key] - np.quantile(conf, q)) < 0.02
+
+    c1_day2 = store.query(clinic="c1", start_day="2025-10-10", end_day="2025-10-10")
+    assert c1_day2["outcomes"] == {"ok": 50, "too_dark": 7}
+    assert abs(c1_day2["body_fat_percent"]["p50"] - np.median(bf[301::2])) < 0.5
+
+    assert store.query(clinic="nobody")["body_fat_percent"] is None
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import io
+import json
+import time
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
@@ -8,6 +11,7 @@ from fastapi.testclient import TestClient
 from PIL import Image
 
 from backend.app.main import app
+from backend.app.responses import EstimateResponse
 
 
 @pytest.fixture()
@@ -51,10 +55,7 @@ def test_estimate_happy_path_monkeypatched_pose(client: TestClient, monkeypatch:
     def fake_extract(_img_rgb: np.ndarray):
         return PoseLandmarks(xy=xy, visibility=vis)
 
-    # Patch the global extractor in the app module
-    import backend.app.main as main
-
-    monkeypatch.setattr(main.pose_extractor, "extract", fake_extract)
+    _use_pose(monkeypatch, fake_extract)
 
     img_bytes = _make_test_image()
     r = client.post(
@@ -69,6 +70,49 @@ def test_estimate_happy_path_monkeypatched_pose(client: TestClient, monkeypatch:
     assert "disclaimer" in data
 
 
+def test_estimate_compact_and_full_response_shapes(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+    img_bytes = _make_test_image()
+    form = {"sex": "female", "age_years": 30, "height_cm": 165, "weight_kg": 65}
+
+    shapes = {}
+    for compact in (False, True):
+        r = client.post(
+            "/estimate",
+            files={"image": ("test.png", img_bytes, "image/png")},
+            data={**form, "compact": str(compact).lower()},
+        )
+        assert r.status_code == 200, r.text
+        assert r.headers["content-type"] == "application/json"
+        EstimateResponse.model_validate(r.json())
+        shapes[compact] = r
+
+    full, compact = shapes[False].json(), shapes[True].json()
+    assert "features" in full and "features" not in compact
+    assert compact["body_fat_percent"] == full["body_fat_percent"]
+    assert len(shapes[True].content) < len(shapes[False].content)
+
+
+def test_estimate_reports_jitter_uncertainty(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+    img_bytes = _make_test_image()
+    form = {"sex": "female", "age_years": 30}
+
+    r = client.post("/estimate", files={"image": ("test.png", img_bytes, "image/png")}, data=form)
+    assert r.status_code == 200, r.text
+    assert "jitter" not in r.json()
+
+    r = client.post(
+        "/estimate",
+        files={"image": ("test.png", img_bytes, "image/png")},
+        data={**form, "jitter_samples": 128},
+    )
+    assert r.status_code == 200, r.text
+    jitter = r.json()["jitter"]
+    assert 0 < jitter["samples"] <= 128
+    assert jitter["low"] <= jitter["median"] <= jitter["high"]
+
+
 def test_estimate_invalid_sex(client: TestClient) -> None:
     img_bytes = _make_test_image()
     r = client.post(
@@ -77,3 +121,298 @@ def test_estimate_invalid_sex(client: TestClient) -> None:
         data={"sex": "other"},
     )
     assert r.status_code in (400, 422)
+
+
+def _use_pose(monkeypatch: pytest.MonkeyPatch, extract, pool: str = "pose_pool") -> None:
+    """Serve pose from `extract` through the app's landmarker pool."""
+    import backend.app.main as main
+    from bodycomp_estimator.pose import PoseExtractorPool
+
+    monkeypatch.setattr(main, pool, PoseExtractorPool(lambda: SimpleNamespace(extract=extract), size=2))
+
+
+def _fake_pose():
+    from bodycomp_estimator.pose import PoseLandmarks
+
+    xy = np.zeros((33, 2), dtype=np.float32)
+    xy[0] = [0.5, 0.1]
+    xy[11] = [0.4, 0.3]
+    xy[12] = [0.6, 0.3]
+    xy[23] = [0.45, 0.55]
+    xy[24] = [0.55, 0.55]
+    xy[27] = [0.47, 0.95]
+    xy[28] = [0.53, 0.95]
+    return PoseLandmarks(xy=xy, visibility=np.ones((33,), dtype=np.float32))
+
+
+def test_pose_stream_websocket(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    import backend.app.main as main
+
+    class FakeTracker:
+        def submit(self, _img, timestamp_ms: int) -> bool:
+            self.ts = timestamp_ms
+            return True
+
+        def wait_result(self, timeout_s: float = 1.0):
+            return self.ts, _fake_pose()
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(main, "live_tracker_factory", FakeTracker)
+
+    with client.websocket_connect("/ws/pose") as ws:
+        ws.send_bytes(_make_test_image())
+        msg = ws.receive_json()
+        assert msg["frame"] == 1
+        assert msg["quality_ok"] is True
+        assert len(msg["pose"]["landmarks"]) == 33
+
+        dark = np.zeros((32, 32, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(dark, mode="RGB").save(buf, format="PNG")
+        ws.send_bytes(buf.getvalue())
+        msg = ws.receive_json()
+        assert msg["quality_ok"] is False
+        assert msg["quality_reason"] == "precheck"
+
+
+def test_estimate_burst_runs_pose_once(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+
+    def fake_extract(img_rgb: np.ndarray):
+        calls.append(1)
+        return _fake_pose()
+
+    _use_pose(monkeypatch, fake_extract)
+
+    dark = io.BytesIO()
+    Image.fromarray(np.zeros((64, 64, 3), dtype=np.uint8), mode="RGB").save(dark, format="PNG")
+    files = [
+        ("images", ("a.png", dark.getvalue(), "image/png")),
+        ("images", ("b.png", _make_test_image(), "image/png")),
+        ("images", ("c.png", _make_test_image(), "image/png")),
+    ]
+    r = client.post("/estimate/burst", files=files, data={"sex": "male"})
+    assert r.status_code == 200, r.text
+    burst = r.json()["burst"]
+    assert burst["selected"] in (1, 2)
+    assert burst["ranking"][-1] == 0  # dark shot ranked last
+    assert burst["pose_calls"] == 1 and len(calls) == 1
+
+
+def test_telemetry_gates_records_estimates(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.telemetry import GateTelemetry
+
+    monkeypatch.setattr(main, "gate_telemetry", GateTelemetry())
+    _use_pose(monkeypatch, lambda image_rgb: _fake_pose())
+
+    r = client.post("/estimate", files={"image": ("x.png", _make_test_image(), "image/png")}, data={"sex": "male"})
+    assert r.status_code == 200
+
+    assert r.json()["config_version"] == "builtin"
+
+    body = client.get("/telemetry/gates").json()
+    assert body["workers"] == 1
+    assert sum(map(sum, body["precheck"]["counts"])) == 1
+    assert sum(map(sum, body["pose"]["counts"])) == 1
+    assert body["acceptance"]["precheck"] == 1.0
+
+
+def test_estimate_multiview_runs_views_concurrently(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    def slow_extract(img_rgb: np.ndarray):
+        time.sleep(0.3)
+        return _fake_pose()
+
+    _use_pose(monkeypatch, slow_extract)
+    _use_pose(monkeypatch, slow_extract, pool="side_pose_pool")
+
+    t0 = time.perf_counter()
+    r = client.post(
+        "/estimate/multiview",
+        files={
+            "front": ("front.png", _make_test_image(), "image/png"),
+            "side": ("side.png", _make_test_image(), "image/png"),
+        },
+        data={"sex": "female"},
+    )
+    elapsed = time.perf_counter() - t0
+    assert r.status_code == 200, r.text
+    feats = r.json()["features"]
+    assert {"side_trunk_to_leg_ratio", "side_view_weight"} <= set(feats)
+    assert elapsed < 0.55  # two 0.3 s extractions overlapped
+
+    dark = io.BytesIO()
+    Image.fromarray(np.zeros((64, 64, 3), dtype=np.uint8), mode="RGB").save(dark, format="PNG")
+    r = client.post(
+        "/estimate/multiview",
+        files={"front": ("f.png", _make_test_image(), "image/png"), "side": ("s.png", dark.getvalue(), "image/png")},
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"]["view"] == "side"
+
+
+def test_subject_history_records_and_serves_trend(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.history import SubjectHistory
+
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+    monkeypatch.setattr(main, "_subject_history", SubjectHistory(tmp_path / "h.sqlite3"))
+
+    for _ in range(2):
+        r = client.post(
+            "/estimate",
+            files={"image": ("test.png", _make_test_image(), "image/png")},
+            data={"sex": "male", "subject_id": "patient-7"},
+        )
+        assert r.status_code == 200, r.text
+    assert r.json()["history"]["n"] == 2
+
+    trend = client.get("/subjects/patient-7/trend", params={"history": 5}).json()
+    assert trend["n"] == 2 and len(trend["history"]) == 2
+    assert client.get("/subjects/unknown/trend").status_code == 404
+
+
+def test_analytics_counts_estimates_and_rejections(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.analytics import CohortAnalytics
+
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+    monkeypatch.setattr(main, "_cohort_analytics", CohortAnalytics(tmp_path / "a.sqlite3"))
+
+    dark = io.BytesIO()
+    Image.fromarray(np.zeros((64, 64, 3), dtype=np.uint8), mode="RGB").save(dark, format="PNG")
+    for img in (_make_test_image(), _make_test_image(), dark.getvalue()):
+        client.post("/estimate", files={"image": ("x.png", img, "image/png")}, data={"clinic_id": "clinic-a"})
+
+    body = client.get("/analytics", params={"clinic_id": "clinic-a"}).json()
+    assert body["count"] == 3 and body["accepted"] == 2
+    assert body["outcomes"]["too_dark"] == 1
+    assert body["body_fat_percent"]["p50"] > 0
+    assert client.get("/analytics", params={"start_day": "yesterday"}).status_code == 400
+
+
+def test_estimate_video_rejects_oversized_upload(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    import backend.app.main as main
+
+    monkeypatch.setattr(main, "MAX_VIDEO_BYTES", 4096)
+    monkeypatch.setattr(main, "_COPY_CHUNK", 1024)
+    r = client.post("/estimate/video", files={"video": ("clip.mp4", b"\0" * 5000, "video/mp4")})
+    assert r.status_code == 413
+
+
+def test_pose_model_swap_retires_the_old_landmarkers(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.config import ConfigStore
+
+    closed: list[str | None] = []
+
+    class FakeExtractor:
+        def __init__(self, static_image_mode: bool = True, model_path: str | None = None):
+            self.model_path = model_path
+
+        def close(self) -> None:
+            closed.append(self.model_path)
+
+    monkeypatch.setattr(main, "PoseExtractor", FakeExtractor)
+    monkeypatch.setattr(main, "pose_pool", main._pose_pool())
+    monkeypatch.setattr(main, "side_pose_pool", main._pose_pool())
+    monkeypatch.setattr(main, "_pose_model_path", None)
+    cfg_path = tmp_path / "cfg.json"
+    cfg_path.write_text(json.dumps({"version": "v2", "gates": {}, "pose_model_path": "full.task"}))
+    monkeypatch.setattr(main, "config_store", ConfigStore(cfg_path, check_interval_s=0.0))
+
+    old = main.pose_pool
+    with old.checkout():  # an in-flight request on the old front pool
+        cfg, front, side = main._runtime()
+        assert cfg.version == "v2" and front is not old
+        assert (front, side) == (main.pose_pool, main.side_pose_pool)
+        assert len(closed) == 2 * main.POSE_POOL_SIZE - 1  # idle ones closed, held one not yet
+    assert len(closed) == 2 * main.POSE_POOL_SIZE and set(closed) == {None}
+    assert main._runtime()[1:] == (front, side)  # same model: no second swap
+
+
+def test_learned_quality_model_is_not_overridden_after_pose(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.quality_model import QualityModel
+
+    always_ok = QualityModel(classes=("ok",), W=np.zeros((4, 1), np.float32), b=np.zeros(1, np.float32))
+    monkeypatch.setattr(main, "load_quality_model", lambda path=None: always_ok)
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+
+    flat = io.BytesIO()  # uniform gray: the heuristic blur gate would reject it
+    Image.fromarray(np.full((64, 64, 3), 128, dtype=np.uint8), mode="RGB").save(flat, format="PNG")
+    r = client.post("/estimate", files={"image": ("f.png", flat.getvalue(), "image/png")})
+    assert r.status_code == 200, r.text
+
+    files = [("images", (f"{i}.png", flat.getvalue(), "image/png")) for i in range(2)]
+    r = client.post("/estimate/burst", files=files)
+    assert r.status_code == 200, r.text
+    assert r.json()["burst"]["pose_calls"] == 1
+
+
+def _off_loop() -> bool:
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
+def test_history_write_runs_off_the_event_loop(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.history import SubjectHistory
+
+    store = SubjectHistory(tmp_path / "h.sqlite3")
+    on_thread: list[bool] = []
+    record = store.record
+
+    def spy(*args, **kwargs):
+        on_thread.append(_off_loop())
+        return record(*args, **kwargs)
+
+    monkeypatch.setattr(store, "record", spy)
+    monkeypatch.setattr(main, "_subject_history", store)
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+
+    r = client.post(
+        "/estimate", files={"image": ("x.png", _make_test_image(), "image/png")}, data={"subject_id": "p-1"}
+    )
+    assert r.status_code == 200, r.text
+    assert on_thread == [True]
+
+
+def test_analytics_writes_run_off_the_event_loop(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    import backend.app.main as main
+    from bodycomp_estimator.analytics import CohortAnalytics
+
+    store = CohortAnalytics(tmp_path / "a.sqlite3")
+    on_thread: list[bool] = []
+    record = store.record
+
+    def spy(*args, **kwargs):
+        on_thread.append(_off_loop())
+        return record(*args, **kwargs)
+
+    monkeypatch.setattr(store, "record", spy)
+    monkeypatch.setattr(main, "_cohort_analytics", store)
+    _use_pose(monkeypatch, lambda img_rgb: _fake_pose())
+
+    dark = io.BytesIO()
+    Image.fromarray(np.zeros((64, 64, 3), dtype=np.uint8), mode="RGB").save(dark, format="PNG")
+    for img in (_make_test_image(), dark.getvalue()):  # accepted, then rejected
+        client.post("/estimate", files={"image": ("x.png", img, "image/png")}, data={"clinic_id": "c"})
+    assert on_thread == [True, True]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from bodycomp_estimator.bodyfat_model import (
+    HEURISTIC_V0,
+    BodyFatModel,
+    load_bodyfat_model,
+    score_versions,
+)
+from bodycomp_estimator.estimator import (
+    estimate_body_fat_percent,
+    estimate_body_fat_percent_batch,
+    metadata_columns,
+)
+from bodycomp_estimator.pose import PoseBatch, PoseLandmarks
+from bodycomp_estimator.schemas import SubjectMetadata
+
+# hip_to_height_ratio <= 0.2 ? (is_female <= 0.5 ? 15 : 25) : 30
+TREE = {
+    "version": "tree-v1",
+    "model": {
+        "kind": "tree",
+        "inputs": ["hip_to_height_ratio", "is_female"],
+        "feature": [0, 1, -1, -1, -1],
+        "threshold": [0.2, 0.5, 0.0, 0.0, 0.0],
+        "left": [1, 2, -1, -1, -1],
+        "right": [4, 3, -1, -1, -1],
+        "value": [0.0, 0.0, 15.0, 25.0, 30.0],
+    },
+}
+
+
+def _cohort(n: int = 40):
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(0.0, 1.0, (n, 33, 2)).astype(np.float32)
+    vis = rng.uniform(0.3, 1.0, (n, 33)).astype(np.float32)
+    metas = [
+        SubjectMetadata(
+            sex=("female", "male", "unknown")[i % 3],
+            age_years=(None, 22.0, 47.0)[i % 3],
+            height_cm=(None, 160.0, 185.0, 171.0)[i % 4],
+            weight_kg=(58.0, None, 90.0)[i % 3],
+        )
+        for i in range(n)
+    ]
+    return xy, vis, metas
+
+
+def test_heuristic_artifact_reproduces_builtin_estimator() -> None:
+    xy, vis, metas = _cohort()
+    cols = metadata_columns(metas)
+    builtin = estimate_body_fat_percent_batch(xy, vis, **cols)
+    from_file = estimate_body_fat_percent_batch(xy, vis, **cols, model=BodyFatModel.from_dict(HEURISTIC_V0))
+    np.testing.assert_allclose(from_file.body_fat_percent, builtin.body_fat_percent, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(from_file.confidence, builtin.confidence, rtol=0, atol=1e-12)
+
+
+def test_tree_and_shadow_scoring_in_one_pass(tmp_path) -> None:
+    xy, vis, metas = _cohort()
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps(TREE), encoding="utf-8")
+    tree = load_bodyfat_model(path)
+    heuristic = BodyFatModel.from_dict(HEURISTIC_V0)
+
+    scores = score_versions(PoseBatch(xy=xy, visibility=vis), metadata_columns(metas), [heuristic, tree])
+    assert list(scores) == ["heuristic-v0", "tree-v1"]
+
+    for i, meta in enumerate(metas):
+        r = estimate_body_fat_percent(PoseLandmarks(xy=xy[i], visibility=vis[i]), meta, tree)
+        assert r.body_fat_percent == scores["tree-v1"][i]
+        ratio = r.features["hip_to_height_ratio"]
+        assert scores["tree-v1"][i] == (30.0 if ratio > 0.2 else 25.0 if meta.sex == "female" else 15.0)
+
+    bad = dict(TREE, model=dict(TREE["model"], inputs=["hip_to_height_ratio", "waist_cm"]))
+    with pytest.raises(ValueError):
+        BodyFatModel.from_dict(bad)
+    assert load_bodyfat_model(tmp_path / "missing.json") is None
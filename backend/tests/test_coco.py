@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from bodycomp_estimator.coco import coco_to_pose_batch, complete_mask, load_coco_persons
+from bodycomp_estimator.estimator import estimate_body_fat_percent, estimate_body_fat_percent_batch
+from bodycomp_estimator.features import compute_features
+from bodycomp_estimator.pose import PoseLandmarks
+from bodycomp_estimator.schemas import SubjectMetadata
+
+# MediaPipe-layout standing pose (normalized), the same one the API tests use.
+MP_POINTS = {
+    0: (0.5, 0.1),
+    11: (0.4, 0.3),
+    12: (0.6, 0.3),
+    23: (0.45, 0.55),
+    24: (0.55, 0.55),
+    27: (0.47, 0.95),
+    28: (0.53, 0.95),
+}
+# Their COCO keypoint indices.
+COCO_INDEX = {0: 0, 11: 5, 12: 6, 23: 11, 24: 12, 27: 15, 28: 16}
+
+
+def _coco_annotation(width: int, height: int, drop: int | None = None) -> list[float]:
+    kps = [0.0] * 51
+    for mp, (x, y) in MP_POINTS.items():
+        j = COCO_INDEX[mp]
+        if j != drop:
+            kps[3 * j : 3 * j + 3] = [x * width, y * height, 2.0]
+    return kps
+
+
+def test_coco_keypoints_match_the_mediapipe_pipeline(tmp_path: Path) -> None:
+    ann = tmp_path / "person_keypoints.json"
+    ann.write_text(
+        json.dumps(
+            {
+                "images": [{"id": 1, "width": 640, "height": 480, "file_name": "a.jpg"}],
+                "annotations": [
+                    {
+                        "id": 10,
+                        "image_id": 1,
+                        "category_id": 1,
+                        "iscrowd": 0,
+                        "keypoints": _coco_annotation(640, 480),
+                    },
+                    {
+                        "id": 11,
+                        "image_id": 1,
+                        "category_id": 1,
+                        "iscrowd": 0,
+                        "keypoints": _coco_annotation(640, 480, 15),
+                    },
+                    {
+                        "id": 12,
+                        "image_id": 1,
+                        "category_id": 1,
+                        "iscrowd": 1,
+                        "keypoints": _coco_annotation(640, 480),
+                    },
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    persons = load_coco_persons(ann)
+    assert persons.ann_ids.tolist() == [10, 11]  # crowd skipped
+    keep = complete_mask(persons.keypoints)
+    assert keep.tolist() == [True, False]  # left ankle missing
+
+    batch = coco_to_pose_batch(
+        persons.keypoints[keep], persons.image_wh[keep], ids=persons.ann_ids[keep]
+    )
+    xy = np.zeros((33, 2), dtype=np.float32)
+    for i, p in MP_POINTS.items():
+        xy[i] = p
+    np.testing.assert_allclose(batch.xy[0, list(MP_POINTS)], xy[list(MP_POINTS)], atol=1e-6)
+    assert np.isnan(batch.xy[0, 1]).all()  # not a COCO keypoint
+
+    vis = np.ones(33, dtype=np.float32)
+    meta = SubjectMetadata(sex="male", age_years=40)
+    ref = estimate_body_fat_percent(PoseLandmarks(xy=xy, visibility=vis), meta)
+    est = estimate_body_fat_percent_batch(
+        batch.xy, batch.visibility, sex=["male"], age_years=[40.0]
+    )
+    assert abs(float(est.body_fat_percent[0]) - ref.body_fat_percent) < 1e-4
+    assert abs(float(est.confidence[0]) - ref.confidence) < 1e-6
+    for k, v in compute_features(PoseLandmarks(xy=xy)).items():
+        assert abs(float(est.features[k][0]) - v) < 1e-5
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+from pathlib import Path
+
+import pytest
+
+from bodycomp_estimator.config import ConfigStore, RuntimeConfig, load_config
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _write(path: Path, payload: dict, mtime: float) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_example_config_loads() -> None:
+    cfg = load_config(REPO / "backend" / "config.example.json")
+    assert cfg.version == "2026-10-19.1"
+    assert cfg.gates.min_lap_var == 60.0
+    assert cfg.quality_model_path is not None and cfg.pose_model_path is None
+
+
+def test_unknown_gate_field_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        RuntimeConfig.from_dict({"version": "1", "gates": {"min_lap": 1}})
+    with pytest.raises(ValueError):
+        RuntimeConfig.from_dict({"gates": {}})
+    for payload in ([], "v1", {"version": "1", "gates": ["min_lap_var"]}):
+        with pytest.raises(ValueError):
+            RuntimeConfig.from_dict(payload)
+
+
+def test_store_swaps_on_change_and_keeps_last_good(tmp_path: Path) -> None:
+    path = tmp_path / "cfg.json"
+    _write(path, {"version": "v1", "gates": {"min_lap_var": 50}}, 1_000)
+    store = ConfigStore(path, check_interval_s=0.0)
+    first = store.current()
+    assert (first.version, first.gates.min_lap_var) == ("v1", 50.0)
+
+    _write(path, {"version": "v2", "gates": {"min_lap_var": 70}}, 2_000)
+    assert store.current().version == "v2"
+    assert first.gates.min_lap_var == 50.0  # snapshot held by an in-flight request is untouched
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (3_000, 3_000))
+    assert store.current().version == "v2"
+    assert store.last_error is not None
+
+    _write(path, [], 4_000)  # valid JSON, wrong shape
+    assert store.current().version == "v2"
+    assert store.last_error is not None and "ValueError" in store.last_error
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP on this platform")
+def test_sighup_handler_only_with_a_config_file(tmp_path: Path) -> None:
+    before = signal.getsignal(signal.SIGHUP)
+    assert ConfigStore(None).install_sighup() is False
+    assert signal.getsignal(signal.SIGHUP) is before
+
+    path = tmp_path / "cfg.json"
+    _write(path, {"version": "v1"}, 1_000)
+    try:
+        assert ConfigStore(path).install_sighup() is True
+        assert signal.getsignal(signal.SIGHUP) is not before
+    finally:
+        signal.signal(signal.SIGHUP, before)
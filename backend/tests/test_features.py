@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bodycomp_estimator.features import FEATURES, FeatureContext, compute_features, feature
+from bodycomp_estimator.pose import PoseBatch, PoseLandmarks
+
+
+def _batch() -> PoseBatch:
+    rng = np.random.default_rng(1)
+    return PoseBatch(xy=rng.uniform(0.0, 1.0, (5, 33, 2)).astype(np.float32))
+
+
+def test_only_requested_closure_is_evaluated() -> None:
+    ctx = FeatureContext(_batch())
+    out = ctx.get(["approx_height_norm"])
+    assert set(out) == {"approx_height_norm"}
+    assert set(ctx._values) == {"ones", "approx_height", "approx_height_norm"}
+
+    # Shared intermediates are reused, not re-measured.
+    height = ctx._values["approx_height"]
+    ctx.get(["hip_to_height_ratio"])
+    assert ctx._values["approx_height"] is height
+    assert "trunk_len" not in ctx._values
+
+    with pytest.raises(KeyError):
+        ctx.get(["no_such_feature"])
+
+
+def test_registered_feature_matches_single_pose() -> None:
+    feature("hip_to_leg_ratio", "hip_w", "leg_len")(lambda h, leg: h / leg)
+    try:
+        batch = _batch()
+        feats = compute_features(batch, ["hip_to_leg_ratio", "trunk_to_leg_ratio"])
+        for i in range(len(batch)):
+            single = compute_features(PoseLandmarks(xy=batch.xy[i]), ["hip_to_leg_ratio", "trunk_to_leg_ratio"])
+            assert {k: float(v[i]) for k, v in feats.items()} == single
+    finally:
+        FEATURES.pop("hip_to_leg_ratio")
+
+
+def test_side_view_fusion_only_touches_view_invariant_ratios() -> None:
+    from bodycomp_estimator.estimator import (
+        estimate_body_fat_percent,
+        estimate_body_fat_percent_multiview,
+    )
+    from bodycomp_estimator.schemas import SubjectMetadata
+
+    batch = _batch()
+    front, side = batch[0], batch[1]
+    meta = SubjectMetadata(sex="male", age_years=35)
+    single = estimate_body_fat_percent(front, meta)
+    fused = estimate_body_fat_percent_multiview(front, side, meta)
+
+    w = fused.features["side_view_weight"]
+    assert w == 0.6 / 1.2  # no visibility on either view -> equal weights
+    assert fused.features["shoulder_to_hip_ratio"] == single.features["shoulder_to_hip_ratio"]
+    side_ratio = compute_features(side)["trunk_to_leg_ratio"]
+    assert fused.features["side_trunk_to_leg_ratio"] == side_ratio
+    assert np.isclose(
+        fused.features["trunk_to_leg_ratio"], (1 - w) * single.features["trunk_to_leg_ratio"] + w * side_ratio
+    )
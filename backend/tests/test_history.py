@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.history import DAY_S, SubjectHistory
+from bodycomp_estimator.schemas import EstimateResult
+
+
+def _result(bf: float) -> EstimateResult:
+    return EstimateResult(bf, bf - 5, bf + 5, 0.5, [], {})
+
+
+def test_incremental_aggregates_match_full_history(tmp_path) -> None:
+    store = SubjectHistory(tmp_path / "h.sqlite3", half_life_days=14.0)
+    rng = np.random.default_rng(0)
+    days = np.cumsum(rng.uniform(7, 21, 12))
+    values = 30.0 - 0.2 * days / 7.0 + rng.normal(0, 0.3, days.size)
+    for d, v in zip(days, values, strict=True):
+        trend = store.record("p1", _result(float(v)), ts=float(d) * DAY_S)
+    store.record("p2", _result(20.0), ts=0.0)
+
+    assert trend == store.trend("p1")
+    assert trend.n == 12 and trend.last_body_fat_percent == values[-1]
+    assert np.isclose(trend.mean_body_fat_percent, values.mean())
+    assert np.isclose(trend.std_body_fat_percent, values.std(ddof=1))
+    assert -0.35 < trend.trend_percent_per_week < -0.05  # true slope: -0.2 / week
+    assert abs(trend.smoothed_body_fat_percent - values[-1]) < 1.5
+    assert store.trend("nobody") is None
+
+    rows = store.history("p1", limit=3)
+    assert [r["body_fat_percent"] for r in rows] == list(values[::-1][:3])
+
+    store.close()
+    reopened = SubjectHistory(tmp_path / "h.sqlite3", half_life_days=14.0)
+    assert reopened.trend("p1") == trend
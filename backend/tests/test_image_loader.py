@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from bodycomp_estimator.image_loader import iter_images, prefetch, read_image
+
+
+def test_prefetch_keeps_order_and_bounds_the_lookahead() -> None:
+    started: list[int] = []
+    lock = threading.Lock()
+
+    def slow(x: int) -> int:
+        with lock:
+            started.append(x)
+        time.sleep(0.002 * (x % 3))  # finish out of order
+        return x * x
+
+    gen = prefetch(slow, range(40), workers=4, depth=5)
+    first = next(gen)
+    assert first == (0, 0)
+    assert len(started) <= 6  # depth in flight + the one refilled
+    rest = list(gen)
+    assert [x for x, _ in [first, *rest]] == list(range(40))
+    assert all(y == x * x for x, y in rest)
+
+
+def test_read_image_crops_clamps_and_converts(tmp_path: Path) -> None:
+    bgr = np.zeros((20, 30, 3), dtype=np.uint8)
+    bgr[5:10, 10:20] = (255, 0, 0)  # blue in BGR
+    path = tmp_path / "a.png"
+    cv2.imwrite(str(path), bgr)
+
+    rgb = read_image(path)
+    assert rgb is not None and rgb.shape == (20, 30, 3)
+    assert tuple(rgb[6, 12]) == (0, 0, 255)
+
+    crop = read_image(path, box=(10, 5, 20, 10), rgb=False)
+    assert crop is not None and crop.shape == (5, 10, 3)
+    assert (crop == (255, 0, 0)).all()
+
+    clamped = read_image(path, box=(-5, -5, 100, 8))
+    assert clamped is not None and clamped.shape == (8, 30, 3)
+    empty = read_image(path, box=(40, 0, 50, 10))
+    assert empty is not None and empty.size == 0
+
+    missing = tmp_path / "missing.png"
+    images = list(iter_images([path, missing, path], boxes=[None, None, (0, 0, 4, 4)]))
+    assert images[1] is None
+    assert images[0].shape == (20, 30, 3) and images[2].shape == (4, 4, 3)
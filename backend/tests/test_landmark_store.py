@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from bodycomp_estimator.landmark_store import LandmarkKey, LandmarkStore
+from bodycomp_estimator.pose import PoseLandmarks
+
+
+def _pose(seed: int) -> PoseLandmarks:
+    rng = np.random.default_rng(seed)
+    return PoseLandmarks(
+        xy=rng.random((33, 2), dtype=np.float32),
+        visibility=rng.random(33, dtype=np.float32),
+    )
+
+
+def test_store_roundtrip_and_reopen(tmp_path: Path) -> None:
+    store = LandmarkStore(tmp_path / "store")
+    k1 = LandmarkKey.from_roi("a.jpg", [10.4, 20.6, 100, 200], model="lite:n1")
+    k2 = LandmarkKey.from_roi("a.jpg", None, model="lite:n1")
+    k3 = LandmarkKey.from_roi("b.jpg", None, model="lite:n1")
+    p1, p3 = _pose(1), _pose(3)
+
+    store.put(k1, p1)
+    store.put_many([k2, k3], [None, p3])
+
+    reopened = LandmarkStore(tmp_path / "store")
+    assert len(reopened) == 3
+    assert reopened.status(k2) == "no_pose"
+    assert reopened.get(k2) is None
+    np.testing.assert_allclose(reopened.get(k1).xy, p1.xy)
+
+    batch = reopened.get_many([k3, k2, k1])
+    assert batch.ids.tolist() == [0, 2]
+    np.testing.assert_allclose(batch.visibility[0], p3.visibility)
+    assert len(reopened.as_batch()) == 2
+
+
+def test_float16_store_keeps_dtype(tmp_path: Path) -> None:
+    key = LandmarkKey.from_roi("c.jpg", None, model="lite:n1")
+    LandmarkStore(tmp_path / "s16", dtype="float16").put(key, _pose(5))
+
+    # dtype comes from meta.json on reopen, not from the constructor argument.
+    store = LandmarkStore(tmp_path / "s16")
+    assert store.dtype == np.float16
+    np.testing.assert_allclose(store.get(key).xy, _pose(5).xy, atol=1e-3)
+
+
+def test_roi_key_follows_the_pixels_cropped() -> None:
+    a = LandmarkKey.from_roi("a.jpg", [9.6, 0, 100.4, 50], model="lite:n1")
+    b = LandmarkKey.from_roi("a.jpg", [10.4, 0, 99.6, 50], model="lite:n1")
+    assert (a.roi, b.roi) == ((9, 0, 110, 50), (10, 0, 110, 50))  # same as `read_image` cuts
+    assert a.as_str() != b.as_str()
+    assert LandmarkKey.from_roi("a.jpg", [-3.5, 2.9, 10, 10], model="m").roi == (0, 2, 6, 12)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.mosaic import assign_poses_to_tiles, pack_mosaic
+from bodycomp_estimator.pose import PoseBatch
+
+
+def test_mosaic_roundtrip_maps_poses_back_to_crops() -> None:
+    rng = np.random.default_rng(0)
+    crops = [
+        rng.integers(0, 255, (200, 100, 3), dtype=np.uint8),
+        rng.integers(0, 255, (120, 160, 3), dtype=np.uint8),
+        rng.integers(0, 255, (90, 90, 3), dtype=np.uint8),
+    ]
+    canvas, tiles = pack_mosaic(crops, tile_size=128)
+    assert canvas.shape == (256, 256, 3)
+
+    # Simulate the detector: crop-normalized poses placed on the canvas, out of order.
+    truth = [rng.uniform(0.2, 0.8, (33, 2)).astype(np.float32) for _ in crops]
+    H, W = canvas.shape[:2]
+    canvas_xy = []
+    for t in (tiles[2], tiles[0]):  # crop 1 gets no detection
+        px = truth[t.src] * [t.w, t.h] + [t.x0, t.y0]
+        canvas_xy.append(px / [W, H])
+    batch = PoseBatch(xy=np.stack(canvas_xy).astype(np.float32), visibility=np.ones((2, 33), np.float32))
+
+    poses = assign_poses_to_tiles(batch, (H, W), tiles)
+
+    assert poses[1] is None
+    np.testing.assert_allclose(poses[0].xy, truth[0], atol=1e-4)
+    np.testing.assert_allclose(poses[2].xy, truth[2], atol=1e-4)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from bodycomp_estimator.estimator import (
+    estimate_body_fat_percent,
+    estimate_body_fat_percent_batch,
+    metadata_columns,
+)
+from bodycomp_estimator.features import compute_features
+from bodycomp_estimator.pose import PoseBatch, PoseLandmarks
+from bodycomp_estimator.schemas import SubjectMetadata
+
+
+def _standing_xy(shift: float = 0.0) -> np.ndarray:
+    xy = np.zeros((33, 2), dtype=np.float32)
+    xy[0] = [0.5, 0.1]
+    xy[11] = [0.4 - shift, 0.3]
+    xy[12] = [0.6 + shift, 0.3]
+    xy[23] = [0.45 - shift, 0.55]
+    xy[24] = [0.55 + shift, 0.55]
+    xy[27] = [0.47, 0.95]
+    xy[28] = [0.53, 0.95]
+    return xy
+
+
+def _fake_result(*poses: np.ndarray):
+    lms = [
+        [SimpleNamespace(x=float(x), y=float(y), z=0.1, visibility=0.9, presence=None) for x, y in xy]
+        for xy in poses
+    ]
+    return SimpleNamespace(pose_landmarks=lms)
+
+
+def test_from_mediapipe_packs_rows_and_ids() -> None:
+    a, b = _standing_xy(), _standing_xy(0.02)
+    batch = PoseBatch.from_mediapipe([_fake_result(a), _fake_result(), _fake_result(b)], ids=[7, 8, 9])
+
+    assert len(batch) == 2
+    assert batch.xy.shape == (2, 33, 2)
+    assert batch.ids.tolist() == [7, 9]
+    np.testing.assert_allclose(batch.xy[1], b)
+    # Missing optional fields are zero-filled in batches.
+    assert float(batch.presence.max()) == 0.0
+
+    # Slices are views, not copies.
+    sub = batch[1:]
+    assert np.shares_memory(sub.xy, batch.xy)
+    assert isinstance(batch[0], PoseLandmarks)
+
+
+def test_features_and_estimator_accept_batch() -> None:
+    poses = [_standing_xy(s) for s in (0.0, 0.01, 0.03)]
+    vis = np.ones((3, 33), dtype=np.float32)
+    batch = PoseBatch(xy=np.stack(poses), visibility=vis)
+
+    feats = compute_features(batch)
+    for i, xy in enumerate(poses):
+        single = compute_features(PoseLandmarks(xy=xy, visibility=vis[i]))
+        for k, v in single.items():
+            assert np.isclose(feats[k][i], v), k
+
+    meta = SubjectMetadata(sex="female", age_years=30, height_cm=165, weight_kg=65)
+    results = estimate_body_fat_percent(batch, meta)
+    assert len(results) == 3
+    expected = estimate_body_fat_percent(PoseLandmarks(xy=poses[2], visibility=vis[2]), meta)
+    assert results[2].body_fat_percent == expected.body_fat_percent
+
+
+def test_batch_estimator_matches_scalar_exactly() -> None:
+    rng = np.random.default_rng(0)
+    n = 64
+    xy = np.stack([_standing_xy(s) for s in rng.uniform(-0.05, 0.08, n)])
+    xy += rng.normal(0.0, 0.01, xy.shape).astype(np.float32)
+    xy[::7, 27:29, 1] = 0.4  # cropped legs -> quality penalty
+    vis = rng.uniform(0.2, 1.0, (n, 33)).astype(np.float32)
+
+    sexes = ["female", "male", "unknown"]
+    ages = [None, 0.0, 25.0, 61.5]
+    heights = [None, 0.0, 150.0, 182.5]
+    weights = [None, 48.0, 97.3]
+    metas = [
+        SubjectMetadata(sex=sexes[i % 3], age_years=ages[i % 4], height_cm=heights[i % 4], weight_kg=weights[i % 3])
+        for i in range(n)
+    ]
+
+    for visibility in (vis, None):
+        out = estimate_body_fat_percent_batch(xy, visibility, **metadata_columns(metas))
+        assert len(out) == n
+        for i, meta in enumerate(metas):
+            ref = estimate_body_fat_percent(
+                PoseLandmarks(xy=xy[i], visibility=None if visibility is None else visibility[i]), meta
+            )
+            assert out.body_fat_percent[i] == ref.body_fat_percent
+            assert out.low_percent[i] == ref.low_percent
+            assert out.high_percent[i] == ref.high_percent
+            assert out.confidence[i] == ref.confidence
+            assert {k: float(v[i]) for k, v in out.features.items()} == ref.features
+
+
+def test_pose_pool_gives_each_caller_its_own_extractor() -> None:
+    import threading
+    import time
+
+    from bodycomp_estimator.pose import PoseExtractorPool
+
+    active: dict[int, int] = {}
+    overlaps: list[int] = []
+    lock = threading.Lock()
+
+    def use(pool: PoseExtractorPool) -> None:
+        with pool.checkout() as ex:
+            with lock:
+                active[id(ex)] = active.get(id(ex), 0) + 1
+                overlaps.append(active[id(ex)])
+            time.sleep(0.01)
+            with lock:
+                active[id(ex)] -= 1
+
+    pool = PoseExtractorPool(lambda: SimpleNamespace(), size=2)
+    threads = [threading.Thread(target=use, args=(pool,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(overlaps) == 1 and len(overlaps) == 8
+    assert len(active) == 2  # both instances used
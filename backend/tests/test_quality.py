@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bodycomp_estimator.quality import (
+    QualityGates,
+    QualityReport,
+    pyramid_factor,
+    quality_gate_message,
+    set_metrics_backend,
+)
+
+
+@pytest.fixture
+def numpy_backend():
+    previous = set_metrics_backend("numpy")
+    yield
+    set_metrics_backend(previous)
+
+
+def _roll_reference(image_rgb: np.ndarray) -> tuple[float, float]:
+    rgb = image_rgb.astype(np.float32)
+    c = (0.299 * rgb[:, :, 0] + 0.587 * rgb[:, :, 1] + 0.114 * rgb[:, :, 2]).astype(np.float32)
+    lap = -4.0 * c + np.roll(c, 1, 0) + np.roll(c, -1, 0) + np.roll(c, 1, 1) + np.roll(c, -1, 1)
+    return float(c.mean()), float(lap.var())
+
+
+def test_quality_report_matches_roll_reference(numpy_backend) -> None:
+    rng = np.random.default_rng(1)
+    image = rng.integers(0, 256, (97, 131, 3), dtype=np.uint8)
+
+    report = QualityReport.compute(image)
+    b, lv = _roll_reference(image)
+
+    assert report.brightness_L_mean == b
+    assert np.isclose(report.lap_var, lv, rtol=1e-6)
+    assert (report.height, report.width) == (97, 131)
+
+
+def test_quality_report_reasons_and_message_reuse() -> None:
+    dark = np.full((40, 40, 3), 10, dtype=np.uint8)
+    assert QualityReport.compute(dark).precheck_reason() == "too_dark"
+    assert QualityReport.compute(np.full((40, 40, 3), 128, dtype=np.uint8)).precheck_reason() == "too_blurry"
+
+    rng = np.random.default_rng(2)
+    sharp = rng.integers(60, 200, (80, 80, 3), dtype=np.uint8)
+    report = QualityReport.compute(sharp)
+    tiny_person = np.array([[0.5, 0.5], [0.52, 0.55]], dtype=np.float32)
+
+    assert report.precheck_reason() is None
+    assert report.pose_reason(tiny_person) == "too_small"
+    assert quality_gate_message(sharp, pose_xy_norm=tiny_person, report=report) == report.message(tiny_person)
+
+
+def test_quality_report_pyramid_level() -> None:
+    rng = np.random.default_rng(3)
+    image = rng.integers(60, 200, (240, 320, 3), dtype=np.uint8)
+    gates = QualityGates(pyramid_max_side=80, pyramid_lap_exponent=1.0)
+
+    assert pyramid_factor(240, 320, 0) == 1
+    assert pyramid_factor(240, 320, 80) == 4
+    report = QualityReport.compute(image, gates)
+    assert report.level_factor == 4
+    assert (report.height, report.width) == (240, 320)
+    assert abs(report.brightness_L_mean - QualityReport.compute(image).brightness_L_mean) < 1e-3
+    assert gates.min_lap_var_at(4) == gates.min_lap_var * 4
+    # Off by default: full resolution, unchanged threshold.
+    assert QualityReport.compute(image).level_factor == 1
+    assert QualityGates().min_lap_var_at(1) == QualityGates().min_lap_var
+
+
+def test_scratch_pool_reuses_per_thread_buffers() -> None:
+    import threading
+
+    from bodycomp_estimator.quality import _ScratchPool
+
+    pool = _ScratchPool(max_bytes=3 * _ScratchPool._CLASS * 4)
+    a1, b1 = pool.get((10, 10), 2)
+    a2, _ = pool.get((20, 5), 2)  # same size class: same memory, new shape
+    assert a2.shape == (20, 5) and np.shares_memory(a1, a2) and not np.shares_memory(a1, b1)
+
+    other: list[np.ndarray] = []
+    t = threading.Thread(target=lambda: other.extend(pool.get((10, 10), 1)))
+    t.start()
+    t.join()
+    assert not np.shares_memory(other[0], a1)
+
+    pool.get((_ScratchPool._CLASS + 1,), 1)  # 2 classes + the first bucket exceed the budget
+    assert not np.shares_memory(pool.get((10, 10), 1)[0], a1)
+    assert pool.get((4 * _ScratchPool._CLASS,), 1)[0].shape == (4 * _ScratchPool._CLASS,)  # over budget
+
+
+def test_strip_metrics_match_single_pass(numpy_backend) -> None:
+    from bodycomp_estimator.quality import _gray_metrics
+
+    rng = np.random.default_rng(4)
+    image = rng.integers(0, 256, (301, 200, 3), dtype=np.uint8)
+    b, lv = _gray_metrics(image, strip_pixels=10**9)
+    b_s, lv_s = _gray_metrics(image, strip_pixels=1000)  # 5-row strips, uneven last strip
+
+    assert np.isclose(b_s, b, rtol=1e-6)
+    assert np.isclose(lv_s, lv, rtol=1e-6)
+
+
+@pytest.mark.parametrize("shape", [(97, 131, 3), (480, 640, 3), (1500, 1500, 3)])
+def test_opencv_backend_matches_numpy_reference(shape) -> None:
+    pytest.importorskip("cv2")
+    rng = np.random.default_rng(5)
+    noisy = rng.integers(0, 256, shape, dtype=np.uint8)
+    # Smooth gradient + mild noise: low Laplacian variance, near the blur threshold.
+    yy, xx = np.mgrid[0 : shape[0], 0 : shape[1]]
+    smooth = ((xx + yy) % 256)[..., None] + rng.integers(0, 4, shape)
+    smooth = smooth.clip(0, 255).astype(np.uint8)
+
+    previous = set_metrics_backend("numpy")
+    try:
+        ref = [QualityReport.compute(im) for im in (noisy, smooth)]
+        set_metrics_backend("opencv")
+        got = [QualityReport.compute(im) for im in (noisy, smooth)]
+    finally:
+        set_metrics_backend(previous)
+
+    for r, g in zip(ref, got, strict=True):
+        assert np.isclose(g.brightness_L_mean, r.brightness_L_mean, rtol=1e-6)
+        assert np.isclose(g.lap_var, r.lap_var, rtol=1e-5)
+        assert g.precheck_reason() == r.precheck_reason()
+
+
+def test_burst_batch_stacks_only_small_frames(numpy_backend, monkeypatch: pytest.MonkeyPatch) -> None:
+    from bodycomp_estimator import quality
+
+    rng = np.random.default_rng(6)
+    shots = [rng.integers(0, 256, (60, 80, 3), dtype=np.uint8) for _ in range(4)]
+    b, lv = quality.full_image_metrics_batch(shots)  # 4 x 60 x 80 px: one stacked pass
+    ref = [QualityReport.compute(im) for im in shots]
+    assert np.allclose(b, [r.brightness_L_mean for r in ref], rtol=1e-6)
+    assert np.allclose(lv, [r.lap_var for r in ref], rtol=1e-6)
+
+    def no_stack(*args, **kwargs):
+        raise AssertionError("burst over the stack budget must not be stacked")
+
+    monkeypatch.setattr(quality.np, "stack", no_stack)
+    b2, lv2 = quality.full_image_metrics_batch(shots, max_stack_pixels=3 * 60 * 80)
+    assert np.allclose(b2, b, rtol=1e-6) and np.allclose(lv2, lv, rtol=1e-6)
+
+
+def test_auto_backend_picks_by_frame_size() -> None:
+    pytest.importorskip("cv2")
+    from bodycomp_estimator import quality
+
+    previous = set_metrics_backend("auto")
+    try:
+        assert quality.metrics_backend() == "auto"
+        assert quality._BACKEND.for_frame(480, 640).name == "numpy"  # live / video frames
+        assert quality._BACKEND.for_frame(3000, 4000).name == "opencv"
+    finally:
+        set_metrics_backend(previous)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "opencv"])
+def test_full_frame_planes_match_the_gate_metrics(backend) -> None:
+    if backend == "opencv":
+        pytest.importorskip("cv2")
+    from bodycomp_estimator.quality import _laplacian, _to_gray, gray_laplacian_planes
+
+    image = np.random.default_rng(7).integers(0, 256, (45, 61, 3), dtype=np.uint8)
+    previous = set_metrics_backend(backend)
+    try:
+        gray, lap = gray_laplacian_planes(image)
+        report = QualityReport.compute(image)
+    finally:
+        set_metrics_backend(previous)
+    ref = _to_gray(image)
+    np.testing.assert_allclose(gray, ref, rtol=1e-6, atol=1e-4)
+    np.testing.assert_allclose(lap, _laplacian(ref), atol=1e-3)
+    assert np.isclose(lap.var(dtype=np.float64), report.lap_var, rtol=1e-5)
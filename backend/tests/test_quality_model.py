@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from bodycomp_estimator.quality import QualityReport
+from bodycomp_estimator.quality_model import (
+    QualityModel,
+    load_quality_model,
+    precheck_reason,
+    precheck_reasons,
+    report_features,
+)
+
+CLASSES = ["ok", "too_dark", "too_bright", "too_blurry", "too_small"]
+
+
+def _payload(seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "classes": CLASSES,
+        "features": ["brightness", "lap_var", "width", "height"],
+        "standardize_mu": [120.0, 300.0, 800.0, 1000.0],
+        "standardize_sigma": [40.0, 250.0, 300.0, 400.0],
+        "W": rng.normal(size=(4, 5)).tolist(),
+        "b": rng.normal(size=5).tolist(),
+    }
+
+
+def _reports() -> list[QualityReport]:
+    return [
+        QualityReport(20.0, 500.0, 1000, 800),
+        QualityReport(130.0, 15.0, 1280, 720),
+        QualityReport(240.0, 800.0, 640, 480),
+        QualityReport(120.0, 900.0, 4000, 3000),
+    ]
+
+
+def test_folded_weights_match_standardized_softmax() -> None:
+    payload = _payload()
+    model = QualityModel.from_dict(payload)
+    X = report_features(_reports())
+
+    mu, sigma = np.array(payload["standardize_mu"]), np.array(payload["standardize_sigma"])
+    z = ((X - mu) / sigma) @ np.array(payload["W"]) + np.array(payload["b"])
+    ref = np.exp(z - z.max(axis=1, keepdims=True))
+    ref /= ref.sum(axis=1, keepdims=True)
+
+    assert model.W.flags.c_contiguous and model.W.dtype == np.float32
+    assert np.allclose(model.predict_proba(X), ref, atol=1e-5)
+    assert model.predict_batch(_reports()) == [model.predict(r) for r in _reports()]
+    labels = model.predict_batch(_reports())
+    assert precheck_reasons(_reports(), model=model) == [None if c == "ok" else c for c in labels]
+
+
+def test_missing_or_invalid_model_falls_back_to_heuristic(tmp_path: Path) -> None:
+    assert load_quality_model(tmp_path / "missing.json") is None
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({**_payload(), "classes": ["ok", "weird", "a", "b", "c"]}), encoding="utf-8")
+    assert load_quality_model(bad) is None
+
+    good = tmp_path / "model.json"
+    good.write_text(json.dumps(_payload()), encoding="utf-8")
+    assert load_quality_model(good) is load_quality_model(good)  # parsed once
+
+    dark = QualityReport(20.0, 500.0, 100, 100)
+    assert precheck_reason(dark, model=None) == "too_dark"
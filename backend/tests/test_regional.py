@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.quality import _laplacian, _to_gray
+from bodycomp_estimator.regional import RegionalStats, clamp_rois_xywh
+
+
+def test_roi_metrics_match_direct_slices() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (120, 90, 3), dtype=np.uint8)
+    gray = _to_gray(image)
+    lap = _laplacian(gray)
+    stats = RegionalStats.from_image(image)
+
+    rois = clamp_rois_xywh([[10.4, 5.0, 30.0, 40.2], [0, 0, 90, 120], [80, 100, 50, 50]], 90, 120)
+    assert rois.tolist() == [[10, 5, 41, 46], [0, 0, 90, 120], [80, 100, 90, 120]]
+
+    b, lv = stats.roi_metrics(rois)
+    for (x0, y0, x1, y1), bi, li in zip(rois, b, lv, strict=True):
+        assert np.isclose(bi, gray[y0:y1, x0:x1].mean(dtype=np.float64))
+        assert np.isclose(li, lap[y0:y1, x0:x1].var(dtype=np.float64))
+    assert np.isclose(stats.luma_var(rois[:1])[0], gray[5:46, 10:41].var(dtype=np.float64))
+    assert stats.shape == (120, 90)
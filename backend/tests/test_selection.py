@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.pose import PoseLandmarks
+from bodycomp_estimator.selection import select_best_frame
+
+
+def _frame(value: int) -> np.ndarray:
+    arr = np.full((64, 64, 3), value, dtype=np.uint8)
+    arr[::4, :, :] = 40
+    arr[:, ::4, :] = 200
+    return arr
+
+
+def _pose(vis: float) -> PoseLandmarks:
+    xy = np.zeros((33, 2), dtype=np.float32)
+    xy[0] = [0.5, 0.1]
+    xy[11], xy[12] = [0.4, 0.3], [0.6, 0.3]
+    xy[23], xy[24] = [0.45, 0.55], [0.55, 0.55]
+    xy[27], xy[28] = [0.47, 0.95], [0.53, 0.95]
+    return PoseLandmarks(xy=xy, visibility=np.full((33,), vis, dtype=np.float32))
+
+
+class _ScriptedExtractor:
+    """Returns poses with the scripted visibilities, one per call."""
+
+    def __init__(self, vis: list[float]):
+        self.vis = list(vis)
+        self.calls: list[int] = []
+
+    def extract(self, _img, timestamp_ms: int | None = None):
+        self.calls.append(timestamp_ms)
+        return _pose(self.vis.pop(0))
+
+
+def test_select_best_frame_gates_then_stops_early() -> None:
+    dark = np.zeros((64, 64, 3), dtype=np.uint8)
+    frames = [(0, 0, dark), (2, 66, _frame(140)), (4, 133, _frame(140)), (6, 200, _frame(140))]
+    ext = _ScriptedExtractor([0.5, 0.95, 0.99])
+
+    sel = select_best_frame(iter(frames), ext, min_pose_quality=0.8)
+
+    assert sel is not None
+    assert sel.frame_index == 4
+    assert sel.early_stop is True
+    # Dark frame never reached pose; the last frame was never decoded/used.
+    assert ext.calls == [66, 133]
+    assert (sel.frames_seen, sel.pose_calls) == (3, 2)
+
+
+def test_select_best_frame_respects_pose_budget() -> None:
+    frames = ((i, i * 33, _frame(140)) for i in range(100))
+    ext = _ScriptedExtractor([0.3] * 100)
+
+    sel = select_best_frame(frames, ext, max_pose_calls=5)
+
+    assert sel is not None and sel.early_stop is False
+    assert len(ext.calls) == 5
+
+
+def test_select_burst_frame_keeps_the_model_verdict_after_pose() -> None:
+    from bodycomp_estimator.quality_model import QualityModel
+    from bodycomp_estimator.selection import select_burst_frame
+
+    always_ok = QualityModel(classes=("ok",), W=np.zeros((4, 1), np.float32), b=np.zeros(1, np.float32))
+    flat = np.full((64, 64, 3), 128, dtype=np.uint8)  # the heuristic calls this too_blurry
+    ext = _ScriptedExtractor([0.9, 0.9])
+
+    sel = select_burst_frame([flat, flat], ext, model=always_ok)
+    assert sel.pose is not None and sel.reason == "ok"
+    assert sel.pose_calls == 1
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from bodycomp_estimator.sharding import plan_shards, run_sharded
+
+
+class _Tagger:
+    """Per-process state: records which process handled an item."""
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+
+    def close(self) -> None:
+        pass
+
+
+def _square(state: _Tagger, items: list[int]):
+    for x in items:
+        yield {"x": x, "sq": x * x / 7.0, "pid": state.pid}
+
+
+def test_plan_shards_is_contiguous_and_balanced() -> None:
+    shards = plan_shards(10, 4)
+    assert [(s.start, s.stop) for s in shards] == [(0, 3), (3, 6), (6, 8), (8, 10)]
+    assert len(plan_shards(3, 8)) == 3
+    assert [(s.start, s.stop) for s in plan_shards(0, 4)] == [(0, 0)]
+
+
+def test_run_sharded_merges_in_order_like_a_serial_run(tmp_path: Path) -> None:
+    items = list(range(50))
+    serial = list(run_sharded(items, _square, init=_Tagger, workers=1))
+    parallel = list(run_sharded(items, _square, init=_Tagger, workers=2, shard_dir=tmp_path))
+
+    strip = [{k: v for k, v in r.items() if k != "pid"} for r in parallel]
+    assert strip == [{k: v for k, v in r.items() if k != "pid"} for r in serial]
+    assert [r["x"] for r in parallel] == items
+    assert {r["pid"] for r in serial} == {os.getpid()}
+    assert os.getpid() not in {r["pid"] for r in parallel}
+    assert len(list(tmp_path.glob("shard-*.jsonl"))) == 8
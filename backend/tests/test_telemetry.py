@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.quality import QualityGates, QualityReport
+from bodycomp_estimator.telemetry import Axis, GateTelemetry, load_snapshots, quantile_from_counts
+
+
+def _random_reports(seed: int, n: int) -> list[QualityReport]:
+    rng = np.random.default_rng(seed)
+    b = rng.uniform(20, 240, n)
+    lv = 10 ** rng.uniform(0, 4, n)
+    return [QualityReport(float(bi), float(li), 1000, 800) for bi, li in zip(b, lv, strict=True)]
+
+
+def test_acceptance_matches_direct_counts_and_merges(tmp_path) -> None:
+    reports_a, reports_b = _random_reports(0, 3000), _random_reports(1, 2000)
+    ta, tb = GateTelemetry(), GateTelemetry()
+    for r in reports_a:
+        ta.record_precheck(r)
+    for r in reports_b:
+        tb.record_precheck(r)
+    ta.dump(tmp_path / "a.json")
+    tb.dump(tmp_path / "b.json")
+
+    merged = GateTelemetry.merged(load_snapshots([tmp_path]))
+    assert merged.precheck.total == 5000
+
+    gates = QualityGates(min_brightness_L_mean=70.0, max_brightness_L_mean=200.0, min_lap_var=150.0)
+    direct = np.mean([r.precheck_reason(gates) is None for r in reports_a + reports_b])
+    assert abs(merged.acceptance(gates)["precheck"] - direct) < 0.01
+    assert GateTelemetry().acceptance(gates)["precheck"] is None
+
+
+def test_quantile_from_counts() -> None:
+    axis = Axis("v", 0.0, 100.0, 100)
+    values = np.random.default_rng(2).uniform(0, 100, 10000)
+    counts = np.bincount(axis.index(values), minlength=axis.bins + 2)
+    assert abs(quantile_from_counts(axis.edges(), counts, 0.5) - np.median(values)) < 1.0
+
+
+def test_concurrent_dumps_never_share_a_temp_file(tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    t = GateTelemetry()
+    for r in _random_reports(3, 200):
+        t.record_precheck(r, QualityGates())
+    path = tmp_path / "gates.json"
+    with ThreadPoolExecutor(8) as ex:
+        list(ex.map(lambda _: t.dump(path), range(64)))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["gates.json"]
+    assert GateTelemetry.merged(load_snapshots([path])).as_dict() == t.as_dict()
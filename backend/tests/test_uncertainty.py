@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bodycomp_estimator.estimator import estimate_body_fat_percent
+from bodycomp_estimator.pose import PoseLandmarks
+from bodycomp_estimator.schemas import SubjectMetadata
+from bodycomp_estimator.uncertainty import jitter_scale, jitter_uncertainty
+
+
+def _pose() -> PoseLandmarks:
+    xy = np.zeros((33, 2), dtype=np.float32)
+    xy[[0, 11, 12, 23, 24, 27, 28]] = [
+        [0.5, 0.1], [0.4, 0.3], [0.6, 0.3], [0.45, 0.55], [0.55, 0.55], [0.47, 0.95], [0.53, 0.95]
+    ]
+    vis = np.full(33, 0.9, dtype=np.float32)
+    vis[23] = 0.2
+    return PoseLandmarks(xy=xy, visibility=vis)
+
+
+def test_jitter_band_brackets_estimate_and_collapses_without_noise() -> None:
+    pose, meta = _pose(), SubjectMetadata(sex="male", age_years=40)
+    point = estimate_body_fat_percent(pose, meta).body_fat_percent
+
+    band = jitter_uncertainty(pose, meta, max_samples=200, budget_ms=1e6, rng=np.random.default_rng(0))
+    assert band.samples == 200 and not band.truncated
+    assert band.low_percent < point < band.high_percent
+
+    still = jitter_uncertainty(pose, meta, max_samples=64, sigma=0.0, budget_ms=1e6)
+    assert still.low_percent == still.median_percent == still.high_percent == point
+
+    scale = jitter_scale(pose.visibility, 0.01, 33)
+    assert scale[23] > scale[11]
+
+
+def test_jitter_respects_time_budget() -> None:
+    band = jitter_uncertainty(_pose(), SubjectMetadata(), max_samples=1_000_000, budget_ms=0.0, chunk=32)
+    assert band.truncated and band.samples == 32
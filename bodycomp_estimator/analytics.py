@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from .telemetry import Axis, quantile_from_counts
+
+OK = "ok"
+
+# Fixed binning of the rolled-up metrics; percentiles are exact up to bin width.
+ROLLUP_AXES = {
+    "body_fat_percent": Axis("body_fat_percent", 0.0, 65.0, 260),
+    "confidence": Axis("confidence", 0.0, 1.0, 100),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS estimate_records (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    clinic TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    body_fat_percent REAL,
+    confidence REAL,
+    model_version TEXT,
+    config_version TEXT
+);
+CREATE TABLE IF NOT EXISTS rollup_outcomes (
+    day TEXT NOT NULL,
+    clinic TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, clinic, outcome)
+);
+CREATE TABLE IF NOT EXISTS rollup_bins (
+    day TEXT NOT NULL,
+    clinic TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, clinic, metric, bin)
+);
+CREATE INDEX IF NOT EXISTS rollup_outcomes_clinic ON rollup_outcomes (clinic, day);
+CREATE INDEX IF NOT EXISTS rollup_bins_clinic ON rollup_bins (clinic, day);
+"""
+
+
+def utc_day(ts: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+class CohortAnalytics:
+    """Estimate records plus rollups partitioned by (UTC day, clinic).
+
+    Each `record` appends the raw record and bumps the matching rollup counters in
+    the same transaction: one outcome counter and one histogram bin per metric.
+    Queries only read the rollups, whose size is bounded by days x clinics x bins,
+    however many estimates were recorded.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def record(
+        self,
+        clinic: str,
+        outcome: str,
+        body_fat_percent: float | None = None,
+        confidence: float | None = None,
+        ts: float | None = None,
+        model_version: str | None = None,
+        config_version: str | None = None,
+    ) -> None:
+        """`outcome` is "ok" for an estimate, else the rejection reason code."""
+        ts = time.time() if ts is None else float(ts)
+        day = utc_day(ts)
+        metrics = {"body_fat_percent": body_fat_percent, "confidence": confidence}
+        bins = [
+            (name, int(ROLLUP_AXES[name].index(np.array([v]))[0])) for name, v in metrics.items() if v is not None
+        ]
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT INTO estimate_records (ts, day, clinic, outcome, body_fat_percent, confidence,"
+                    " model_version, config_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ts, day, clinic, outcome, body_fat_percent, confidence, model_version, config_version),
+                )
+                db.execute(
+                    "INSERT INTO rollup_outcomes (day, clinic, outcome, count) VALUES (?, ?, ?, 1)"
+                    " ON CONFLICT (day, clinic, outcome) DO UPDATE SET count = count + 1",
+                    (day, clinic, outcome),
+                )
+                db.executemany(
+                    "INSERT INTO rollup_bins (day, clinic, metric, bin, count) VALUES (?, ?, ?, ?, 1)"
+                    " ON CONFLICT (day, clinic, metric, bin) DO UPDATE SET count = count + 1",
+                    [(day, clinic, name, b) for name, b in bins],
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def query(
+        self,
+        clinic: str | None = None,
+        start_day: str | None = None,
+        end_day: str | None = None,
+        quantiles: Sequence[float] = (0.1, 0.25, 0.5, 0.75, 0.9),
+    ) -> dict:
+        """Counts per outcome and metric percentiles over [start_day, end_day] (inclusive)."""
+        where, args = ["1 = 1"], []
+        if clinic is not None:
+            where.append("clinic = ?")
+            args.append(clinic)
+        if start_day is not None:
+            where.append("day >= ?")
+            args.append(start_day)
+        if end_day is not None:
+            where.append("day <= ?")
+            args.append(end_day)
+        cond = " AND ".join(where)
+        with self._lock:
+            outcomes = self._db.execute(
+                f"SELECT outcome, SUM(count) FROM rollup_outcomes WHERE {cond} GROUP BY outcome", args
+            ).fetchall()
+            bins = self._db.execute(
+                f"SELECT metric, bin, SUM(count) FROM rollup_bins WHERE {cond} GROUP BY metric, bin", args
+            ).fetchall()
+
+        counts = {name: np.zeros(axis.bins + 2, dtype=np.int64) for name, axis in ROLLUP_AXES.items()}
+        for metric, b, c in bins:
+            if metric in counts:
+                counts[metric][b] += c
+        by_outcome = {o: int(c) for o, c in sorted(outcomes)}
+        total = sum(by_outcome.values())
+        out: dict = {
+            "count": total,
+            "accepted": by_outcome.get(OK, 0),
+            "outcomes": by_outcome,
+        }
+        for name, axis in ROLLUP_AXES.items():
+            edges = axis.edges()
+            if counts[name].sum() == 0:
+                out[name] = None
+                continue
+            out[name] = {f"p{round(q * 100):02d}": quantile_from_counts(edges, counts[name], q) for q in quantiles}
+        return out
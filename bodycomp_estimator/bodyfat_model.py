@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .features import FEATURES, FeatureContext
+from .pose import PoseBatch
+
+# Inputs derived from columnar metadata (see `estimator.metadata_columns`); every
+# other model input must be a registered feature.
+META_INPUTS = ("is_female", "is_male", "is_unknown_sex", "age_years", "height_cm", "weight_kg", "bmi")
+
+# The hand-tuned coefficients of `estimate_body_fat_percent` as an artifact.
+# Missing age is imputed as 30, which zeroes its term like the scalar path does.
+HEURISTIC_V0: dict = {
+    "version": "heuristic-v0",
+    "model": {
+        "kind": "linear",
+        "inputs": [
+            "hip_to_height_ratio",
+            "trunk_to_leg_ratio",
+            "shoulder_to_hip_ratio",
+            "is_female",
+            "is_male",
+            "age_years",
+        ],
+        "mu": [0.18, 0.60, 1.10, 0.0, 0.0, 30.0],
+        "coef": [18.0, 10.0, -6.0, 4.0, -2.0, 0.05],
+        "intercept": 22.0,
+        "impute": {"age_years": 30.0},
+    },
+    # Deurenberg-like BMI correction, applied only where BMI is known.
+    "blend": {
+        "input": "bmi",
+        "weight": 0.25,
+        "model": {
+            "kind": "linear",
+            "inputs": ["bmi", "age_years", "is_male"],
+            "coef": [1.2, 0.23, -10.8],
+            "intercept": -5.4,
+            "impute": {"age_years": 30.0},
+        },
+    },
+}
+
+
+def _check_inputs(inputs: Sequence[str]) -> tuple[str, ...]:
+    unknown = [i for i in inputs if i not in META_INPUTS and i not in FEATURES]
+    if unknown:
+        raise ValueError(f"unknown model inputs: {unknown}")
+    return tuple(inputs)
+
+
+def _matrix(columns: Mapping[str, np.ndarray], inputs: Sequence[str], impute: Mapping[str, float]) -> np.ndarray:
+    X = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in inputs])
+    for j, name in enumerate(inputs):
+        if name in impute:
+            col = X[:, j]
+            col[np.isnan(col)] = impute[name]
+    return X
+
+
+@dataclass(frozen=True)
+class LinearModel:
+    """y = X @ W + b on raw inputs; standardization is folded in at load time."""
+
+    inputs: tuple[str, ...]
+    W: np.ndarray  # (F,) float64
+    b: float
+    impute: Mapping[str, float]
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> LinearModel:
+        inputs = _check_inputs(d["inputs"])
+        coef = np.asarray(d["coef"], dtype=np.float64)
+        mu = np.asarray(d.get("mu", np.zeros(len(inputs))), dtype=np.float64)
+        sigma = np.asarray(d.get("sigma", np.ones(len(inputs))), dtype=np.float64)
+        if not coef.shape == mu.shape == sigma.shape == (len(inputs),):
+            raise ValueError("linear model coef/mu/sigma do not match inputs")
+        W = coef / sigma
+        return cls(inputs, W, float(d.get("intercept", 0.0)) - float(mu @ W), dict(d.get("impute", {})))
+
+    def predict(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return _matrix(columns, self.inputs, self.impute) @ self.W + self.b
+
+
+@dataclass(frozen=True)
+class TreeModel:
+    """Small regression tree in flat arrays (sklearn `tree_` layout).
+
+    Node i splits on `inputs[feature[i]] <= threshold[i]` (left) and is a leaf
+    when `feature[i] < 0`. All rows descend together, one level per step.
+    """
+
+    inputs: tuple[str, ...]
+    feature: np.ndarray  # (M,) int64
+    threshold: np.ndarray  # (M,) float64
+    left: np.ndarray  # (M,) int64
+    right: np.ndarray  # (M,) int64
+    value: np.ndarray  # (M,) float64
+    impute: Mapping[str, float]
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> TreeModel:
+        inputs = _check_inputs(d["inputs"])
+        arrays = {k: np.asarray(d[k]) for k in ("feature", "threshold", "left", "right", "value")}
+        m = arrays["feature"].shape
+        if any(a.shape != m for a in arrays.values()) or len(m) != 1:
+            raise ValueError("tree arrays must be 1D and the same length")
+        if (arrays["feature"] >= len(inputs)).any():
+            raise ValueError("tree splits on an input it does not declare")
+        return cls(
+            inputs,
+            arrays["feature"].astype(np.int64),
+            arrays["threshold"].astype(np.float64),
+            arrays["left"].astype(np.int64),
+            arrays["right"].astype(np.int64),
+            arrays["value"].astype(np.float64),
+            dict(d.get("impute", {})),
+        )
+
+    def predict(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        X = _matrix(columns, self.inputs, self.impute)
+        rows = np.arange(X.shape[0])
+        node = np.zeros(X.shape[0], dtype=np.int64)
+        for _ in range(len(self.feature)):
+            f = self.feature[node]
+            inner = f >= 0
+            if not inner.any():
+                break
+            go_left = X[rows, np.maximum(f, 0)] <= self.threshold[node]
+            node = np.where(inner, np.where(go_left, self.left[node], self.right[node]), node)
+        return self.value[node]
+
+
+def _submodel(d: Mapping) -> LinearModel | TreeModel:
+    kind = d.get("kind")
+    if kind == "linear":
+        return LinearModel.from_dict(d)
+    if kind == "tree":
+        return TreeModel.from_dict(d)
+    raise ValueError(f"unsupported model kind: {kind}")
+
+
+@dataclass(frozen=True)
+class BodyFatModel:
+    """Versioned BF% point estimate: a linear/tree model, optionally blended with a
+    second model where `blend_input` is known (e.g. the BMI correction)."""
+
+    version: str
+    model: LinearModel | TreeModel
+    blend: LinearModel | TreeModel | None = None
+    blend_input: str = "bmi"
+    blend_weight: float = 0.0
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> BodyFatModel:
+        if not str(d.get("version", "")).strip():
+            raise ValueError("body-fat model needs a non-empty 'version'")
+        blend = d.get("blend")
+        return cls(
+            version=str(d["version"]),
+            model=_submodel(d["model"]),
+            blend=None if blend is None else _submodel(blend["model"]),
+            blend_input=_check_inputs([blend["input"]])[0] if blend else "bmi",
+            blend_weight=float(blend["weight"]) if blend else 0.0,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> BodyFatModel:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        names = list(self.model.inputs)
+        if self.blend is not None:
+            names += [self.blend_input, *self.blend.inputs]
+        return tuple(dict.fromkeys(names))
+
+    def predict(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """(N,) unclamped BF% from input columns (see `model_columns`)."""
+        bf = self.model.predict(columns)
+        if self.blend is None:
+            return bf
+        w = self.blend_weight
+        known = ~np.isnan(np.asarray(columns[self.blend_input], dtype=np.float64))
+        return np.where(known, (1.0 - w) * bf + w * self.blend.predict(columns), bf)
+
+
+def _meta_input(name: str, meta: Mapping[str, np.ndarray]) -> np.ndarray:
+    if name.startswith("is_"):
+        sex = "unknown" if name == "is_unknown_sex" else name[3:]
+        return (np.asarray(meta["sex"], dtype=object) == sex).astype(np.float64)
+    if name == "bmi":
+        height = np.asarray(meta["height_cm"], dtype=np.float64)
+        weight = np.asarray(meta["weight_kg"], dtype=np.float64)
+        known = (np.nan_to_num(height) != 0) & (np.nan_to_num(weight) != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(known, weight / (height / 100.0) ** 2, np.nan)
+    return np.asarray(meta[name], dtype=np.float64)
+
+
+def model_columns(
+    ctx: FeatureContext, meta: Mapping[str, np.ndarray], names: Sequence[str]
+) -> dict[str, np.ndarray]:
+    """Input columns `names` from a batch feature context and columnar metadata.
+
+    Registry features come from `ctx` (shared intermediates computed once); missing
+    metadata is NaN, and "bmi" is NaN unless both height and weight are non-zero.
+    """
+    out = ctx.get([n for n in names if n not in META_INPUTS])
+    for name in names:
+        if name in META_INPUTS:
+            out[name] = _meta_input(name, meta)
+    return out
+
+
+def score_versions(
+    pose: PoseBatch, meta: Mapping[str, np.ndarray], models: Sequence[BodyFatModel]
+) -> dict[str, np.ndarray]:
+    """Shadow scoring: (N,) unclamped BF% per model version from one feature pass.
+
+    Landmarks are measured once for the union of all models' inputs, so adding
+    versions costs only their own matmul / tree descent.
+    """
+    ctx = FeatureContext(pose)
+    names = list(dict.fromkeys(n for m in models for n in m.inputs))
+    columns = model_columns(ctx, meta, names)
+    return {m.version: m.predict(columns) for m in models}
+
+
+_cache_lock = threading.Lock()
+_cache: dict[Path, tuple[float, BodyFatModel | None]] = {}
+
+
+def load_bodyfat_model(path: str | Path | None) -> BodyFatModel | None:
+    """Model at `path`, or None when no path is set or the file is absent/invalid.
+
+    Parsed once per file version (cached by mtime), so callers may ask per request.
+    """
+    if path is None:
+        return None
+    p = Path(path)
+    try:
+        mtime = p.stat().st_mtime
+    except OSError:
+        return None
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        try:
+            model: BodyFatModel | None = BodyFatModel.load(p)
+        except (OSError, ValueError, KeyError, TypeError):
+            model = None
+        _cache[p] = (mtime, model)
+        return model
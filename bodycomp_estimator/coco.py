@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .features import POINTS, SEGMENTS
+from .pose import NUM_LANDMARKS, PoseBatch
+
+# COCO person keypoints, in annotation order.
+COCO_KEYPOINTS = (
+    "nose",
+    "left_eye",
+    "right_eye",
+    "left_ear",
+    "right_ear",
+    "left_shoulder",
+    "right_shoulder",
+    "left_elbow",
+    "right_elbow",
+    "left_wrist",
+    "right_wrist",
+    "left_hip",
+    "right_hip",
+    "left_knee",
+    "right_knee",
+    "left_ankle",
+    "right_ankle",
+)
+
+# MediaPipe Pose index of each COCO keypoint (the 17 COCO points are a subset of the 33).
+COCO_TO_MEDIAPIPE = np.array([0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28], dtype=np.int64)
+
+# COCO visibility flag (0 = not labeled, 1 = labeled but occluded, 2 = visible) -> MediaPipe-style score.
+COCO_VISIBILITY = np.array([0.0, 0.5, 1.0], dtype=np.float32)
+
+# MediaPipe landmarks read by the registered segments (hence by every feature),
+# and the COCO keypoints they come from.
+FEATURE_LANDMARKS = tuple(sorted({i for seg in SEGMENTS.values() for p in seg for i in POINTS[p]}))
+FEATURE_KEYPOINTS = tuple(COCO_TO_MEDIAPIPE.tolist().index(i) for i in FEATURE_LANDMARKS)
+
+
+@dataclass(frozen=True)
+class CocoPersons:
+    """COCO person annotations as arrays (one row per annotation).
+
+    - keypoints: (N, 17, 3) float32 [x_px, y_px, v]
+    - image_wh: (N, 2) image width/height in pixels
+    - ann_ids / image_ids: (N,) int64
+    - file_names: (N,) image file names
+    """
+
+    keypoints: np.ndarray
+    image_wh: np.ndarray
+    ann_ids: np.ndarray
+    image_ids: np.ndarray
+    file_names: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.keypoints.shape[0])
+
+
+def load_coco_persons(ann_path: str | Path, include_crowd: bool = False) -> CocoPersons:
+    """Person annotations of a COCO `person_keypoints_*.json` file."""
+    data = json.loads(Path(ann_path).read_text(encoding="utf-8"))
+    images = {int(img["id"]): img for img in data.get("images", [])}
+    anns = [
+        a
+        for a in data.get("annotations", [])
+        if int(a.get("category_id", 0)) == 1
+        and (include_crowd or not a.get("iscrowd", 0))
+        and len(a.get("keypoints") or ()) == 3 * len(COCO_KEYPOINTS)
+        and int(a["image_id"]) in images
+    ]
+    imgs = [images[int(a["image_id"])] for a in anns]
+    return CocoPersons(
+        keypoints=np.asarray([a["keypoints"] for a in anns], dtype=np.float32).reshape(-1, len(COCO_KEYPOINTS), 3),
+        image_wh=np.asarray([(img["width"], img["height"]) for img in imgs], dtype=np.float32).reshape(-1, 2),
+        ann_ids=np.asarray([a["id"] for a in anns], dtype=np.int64),
+        image_ids=np.asarray([a["image_id"] for a in anns], dtype=np.int64),
+        file_names=np.asarray([str(img["file_name"]) for img in imgs], dtype=object),
+    )
+
+
+def coco_to_pose_batch(keypoints: np.ndarray, image_wh: np.ndarray, ids: np.ndarray | None = None) -> PoseBatch:
+    """COCO keypoints -> `PoseBatch` in the MediaPipe 33-landmark layout.
+
+    `keypoints` is (N, 17, 3) or (N, 51) in pixels; `image_wh` is (N, 2). Like
+    MediaPipe, x is normalized by image width and y by image height. Landmarks
+    COCO does not have, and keypoints that are not labeled, are NaN with
+    visibility 0; filter with `complete_mask` first.
+    """
+    kp = np.asarray(keypoints, dtype=np.float32).reshape(-1, len(COCO_KEYPOINTS), 3)
+    n = kp.shape[0]
+    wh = np.asarray(image_wh, dtype=np.float32).reshape(n, 1, 2)
+    labeled = kp[:, :, 2] > 0
+
+    xy = np.full((n, NUM_LANDMARKS, 2), np.nan, dtype=np.float32)
+    xy[:, COCO_TO_MEDIAPIPE] = np.where(labeled[:, :, None], kp[:, :, :2] / wh, np.nan)
+    visibility = np.zeros((n, NUM_LANDMARKS), dtype=np.float32)
+    visibility[:, COCO_TO_MEDIAPIPE] = COCO_VISIBILITY[np.clip(kp[:, :, 2], 0, 2).astype(np.int64)]
+    return PoseBatch(xy=xy, visibility=visibility, presence=(visibility > 0).astype(np.float32), ids=ids)
+
+
+def complete_mask(keypoints: np.ndarray) -> np.ndarray:
+    """(N,) True where every COCO keypoint the features read is labeled.
+
+    Cheap on the raw (N, 17, 3) annotations, so persons can be filtered before
+    `coco_to_pose_batch` builds the 33-landmark arrays.
+    """
+    kp = np.asarray(keypoints).reshape(-1, len(COCO_KEYPOINTS), 3)
+    return (kp[:, list(FEATURE_KEYPOINTS), 2] > 0).all(axis=1)
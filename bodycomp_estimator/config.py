@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+
+from .quality import QualityGates
+
+CONFIG_ENV = "BODYCOMP_CONFIG"
+BUILTIN_VERSION = "builtin"
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """One immutable, versioned snapshot of the serving configuration.
+
+    File format (JSON):
+      {"version": "2026-10-19.1",
+       "gates": {"min_lap_var": 60.0, ...},          # any QualityGates field; others keep defaults
+       "quality_model_path": "data/.../quality_multiclass.json",   # optional
+       "pose_model_path": "data/models/mediapipe/pose_landmarker_full.task",   # optional
+       "bodyfat_model_path": "data/models/bodyfat/refit-2026-10.json"}   # optional
+
+    Relative paths resolve against the config file's directory.
+    """
+
+    version: str = BUILTIN_VERSION
+    gates: QualityGates = field(default_factory=QualityGates)
+    quality_model_path: str | None = None  # None = quality_model.DEFAULT_MODEL_PATH
+    pose_model_path: str | None = None  # None = PoseExtractor default model
+    bodyfat_model_path: str | None = None  # None = hand-tuned estimator coefficients
+
+    @classmethod
+    def from_dict(cls, d: dict, base_dir: Path | None = None) -> RuntimeConfig:
+        if not isinstance(d, dict):
+            raise ValueError(f"config must be a JSON object, got {type(d).__name__}")
+        version = d.get("version")
+        if version is None or str(version).strip() == "":
+            raise ValueError("config needs a non-empty 'version'")
+        unknown = set(d) - {"version", "gates", "quality_model_path", "pose_model_path", "bodyfat_model_path"}
+        if unknown:
+            raise ValueError(f"unknown config keys: {sorted(unknown)}")
+
+        gate_values = d.get("gates") or {}
+        if not isinstance(gate_values, dict):
+            raise ValueError("config 'gates' must be a JSON object")
+        gate_fields = {f.name: f.type for f in fields(QualityGates)}
+        bad = set(gate_values) - set(gate_fields)
+        if bad:
+            raise ValueError(f"unknown gate fields: {sorted(bad)}")
+        defaults = QualityGates()
+        coerced = {k: type(getattr(defaults, k))(v) for k, v in gate_values.items()}
+
+        def _path(key: str) -> str | None:
+            v = d.get(key)
+            if not v:
+                return None
+            p = Path(v)
+            if not p.is_absolute() and base_dir is not None:
+                p = base_dir / p
+            return str(p)
+
+        return cls(
+            version=str(version),
+            gates=replace(defaults, **coerced),
+            quality_model_path=_path("quality_model_path"),
+            pose_model_path=_path("pose_model_path"),
+            bodyfat_model_path=_path("bodyfat_model_path"),
+        )
+
+
+def load_config(path: str | Path) -> RuntimeConfig:
+    p = Path(path)
+    return RuntimeConfig.from_dict(json.loads(p.read_text(encoding="utf-8")), base_dir=p.resolve().parent)
+
+
+class ConfigStore:
+    """Current `RuntimeConfig`, hot-swapped when the file changes or on SIGHUP.
+
+    Readers take `current()` once per request and use that snapshot throughout, so
+    a reload never changes thresholds halfway through a request and in-flight
+    requests keep the objects they started with. A reload builds the new snapshot
+    completely, then replaces a single reference. An invalid file keeps the
+    previous snapshot and is reported in `last_error`.
+    """
+
+    def __init__(self, path: str | Path | None = None, check_interval_s: float = 1.0):
+        self.path = Path(path) if path else None
+        self.check_interval_s = check_interval_s
+        self.last_error: str | None = None
+        # Re-entrant: the SIGHUP handler runs on the main thread, possibly mid-reload.
+        self._lock = threading.RLock()
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self._current = RuntimeConfig()
+        if self.path is not None:
+            self.reload()
+
+    @classmethod
+    def from_env(cls) -> ConfigStore:
+        return cls(os.environ.get(CONFIG_ENV) or None)
+
+    def current(self) -> RuntimeConfig:
+        """Latest snapshot; checks the file mtime at most every `check_interval_s`."""
+        if self.path is not None and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval_s
+            try:
+                mtime = self.path.stat().st_mtime
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                self.reload()
+        return self._current
+
+    def reload(self) -> bool:
+        """Re-read the file now; True if a new snapshot was installed."""
+        if self.path is None:
+            return False
+        with self._lock:
+            try:
+                # Remember the mtime even if parsing fails: a broken file is retried
+                # only after it changes again.
+                self._mtime = self.path.stat().st_mtime
+                cfg = load_config(self.path)
+            except (OSError, ValueError, TypeError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.last_error = None
+            self._current = cfg
+            return True
+
+    def install_sighup(self) -> bool:
+        """Reload on SIGHUP (main thread only; no-op without a config file or where SIGHUP does not exist)."""
+        if self.path is None or not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+        return True
@@ -1,30 +1,61 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from collections.abc import Sequence
+from dataclasses import replace
 
 import numpy as np
 
-from .features import compute_features, feature_quality_heuristic
-from .pose import PoseLandmarks
-from .schemas import EstimateResult, SubjectMetadata
+from .bodyfat_model import BodyFatModel, model_columns
+from .features import (
+    DEFAULT_FEATURES,
+    FeatureContext,
+    feature_quality_batch,
+    feature_quality_heuristic,
+    fuse_side_view,
+)
+from .pose import PoseBatch, PoseLandmarks
+from .schemas import EstimateBatch, EstimateResult, SubjectMetadata
 
 
 def _clamp(x: float, lo: float, hi: float) -> float:
     return float(max(lo, min(hi, x)))
 
 
-def estimate_body_fat_percent(pose: PoseLandmarks, meta: SubjectMetadata) -> EstimateResult:
+def estimate_body_fat_percent(
+    pose: PoseLandmarks | PoseBatch,
+    meta: SubjectMetadata | Sequence[SubjectMetadata],
+    model: BodyFatModel | None = None,
+) -> EstimateResult | list[EstimateResult]:
     """Heuristic BF% estimator.
 
     This MVP uses a hand-tuned linear model on geometric ratios + optional metadata.
 
     The goal is a *plausible* estimate + wide uncertainty, not clinical accuracy.
+
+    A `PoseBatch` returns one result per pose; `meta` is then either shared or one
+    entry per pose. Rows are read as views, so the batch is never copied. For large
+    cohorts where notes are not needed, use `estimate_body_fat_percent_batch`.
+
+    `model` (see `bodyfat_model.load_bodyfat_model`) replaces the hand-tuned point
+    estimate; notes, clamping and the uncertainty band stay the same.
     """
 
+    if isinstance(pose, PoseBatch):
+        metas = [meta] * len(pose) if isinstance(meta, SubjectMetadata) else list(meta)
+        if len(metas) != len(pose):
+            raise ValueError(f"Expected {len(pose)} metadata entries; got {len(metas)}")
+        return [estimate_body_fat_percent(p, m, model) for p, m in zip(pose, metas, strict=True)]
+
+    return _estimate_from_context(pose, FeatureContext(pose), meta, model)
+
+
+def _estimate_from_context(
+    pose: PoseLandmarks, ctx: FeatureContext, meta: SubjectMetadata, model: BodyFatModel | None
+) -> EstimateResult:
     notes: list[str] = []
 
-    feats = compute_features(pose)
-    q_pose, q_notes = feature_quality_heuristic(pose)
+    feats = ctx.get(DEFAULT_FEATURES)
+    q_pose, q_notes = feature_quality_heuristic(pose, feats)
     notes.extend(q_notes)
 
     x = feats
@@ -62,6 +93,9 @@ def estimate_body_fat_percent(pose: PoseLandmarks, meta: SubjectMetadata) -> Est
     else:
         notes.append("Height/weight not provided; BMI blend skipped.")
 
+    if model is not None:
+        bf = float(model.predict(model_columns(ctx, metadata_columns([meta]), model.inputs))[0])
+
     # Clamp to plausible human ranges
     bf = _clamp(bf, 3.0, 60.0)
 
@@ -94,3 +128,125 @@ def estimate_body_fat_percent(pose: PoseLandmarks, meta: SubjectMetadata) -> Est
         notes=notes,
         features={k: float(v) for k, v in feats.items()},
     )
+
+
+def estimate_body_fat_percent_multiview(
+    front: PoseLandmarks, side: PoseLandmarks, meta: SubjectMetadata, model: BodyFatModel | None = None
+) -> EstimateResult:
+    """Front + side estimate.
+
+    Width ratios come from the front photo only; view-invariant length ratios are
+    averaged with the side photo, weighted by each view's pose quality. The side
+    view's own values are reported as `side_*` features.
+    """
+
+    front_ctx, side_ctx = FeatureContext(front), FeatureContext(side)
+    q_front, _ = feature_quality_heuristic(front, front_ctx.get(["approx_height_norm"]))
+    q_side, _ = feature_quality_heuristic(side, side_ctx.get(["approx_height_norm"]))
+    w_side = q_side / (q_front + q_side) if q_front + q_side > 0 else 0.0
+
+    side_feats = fuse_side_view(front_ctx, side_ctx, w_side)
+    result = _estimate_from_context(front, front_ctx, meta, model)
+    return replace(
+        result,
+        notes=[*result.notes, "Side view fused into trunk/leg proportions."],
+        features={**result.features, **side_feats, "side_view_weight": float(w_side)},
+    )
+
+
+def metadata_columns(metas: Sequence[SubjectMetadata]) -> dict[str, np.ndarray]:
+    """Columnar metadata for `estimate_body_fat_percent_batch` (None -> NaN)."""
+    return {
+        "sex": np.asarray([m.sex for m in metas], dtype=object),
+        "age_years": np.asarray([m.age_years for m in metas], dtype=np.float64),
+        "height_cm": np.asarray([m.height_cm for m in metas], dtype=np.float64),
+        "weight_kg": np.asarray([m.weight_kg for m in metas], dtype=np.float64),
+    }
+
+
+def _heuristic_bf_batch(x, female, male, age, has_age, height, weight, has_bmi) -> np.ndarray:
+    # Same coefficients and operation order as `estimate_body_fat_percent`; adding
+    # 0.0 for rows where a term does not apply keeps results bit-identical.
+    bf = np.full(len(age), 22.0)
+    bf += 18.0 * (x["hip_to_height_ratio"] - 0.18)
+    bf += 10.0 * (x["trunk_to_leg_ratio"] - 0.60)
+    bf -= 6.0 * (x["shoulder_to_hip_ratio"] - 1.10)
+
+    bf += np.where(female, 4.0, np.where(male, -2.0, 0.0))
+    bf += np.where(has_age, 0.05 * (age - 30.0), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h_m = height / 100.0
+        bmi = weight / (h_m**2)
+        age_or_30 = np.where(has_age & (age != 0), age, 30.0)
+        bf_bmi = 1.2 * bmi + 0.23 * age_or_30 - 10.8 * male.astype(np.float64) - 5.4
+    return np.where(has_bmi, 0.75 * bf + 0.25 * bf_bmi, bf)
+
+
+def estimate_body_fat_percent_batch(
+    xy: np.ndarray,
+    visibility: np.ndarray | None,
+    sex,
+    age_years=None,
+    height_cm=None,
+    weight_kg=None,
+    model: BodyFatModel | None = None,
+) -> EstimateBatch:
+    """Vectorized `estimate_body_fat_percent` for N subjects.
+
+    `xy` is (N, 33, 2), `visibility` (N, 33) or None. Metadata is columnar: `sex`
+    is (N,) strings, the others (N,) floats with NaN for "not provided" (None for
+    a whole column). Numbers match the scalar estimator exactly; notes are skipped.
+    `model` replaces the hand-tuned point estimate as in the scalar estimator.
+    """
+
+    xy = np.asarray(xy)
+    n = xy.shape[0]
+
+    def _col(v) -> np.ndarray:
+        if v is None:
+            return np.full(n, np.nan)
+        c = np.asarray(v, dtype=np.float64)
+        if c.shape != (n,):
+            raise ValueError(f"Expected ({n},) metadata column; got {c.shape}")
+        return c
+
+    sex = np.asarray(sex, dtype=object)
+    if sex.shape != (n,):
+        raise ValueError(f"Expected ({n},) sex column; got {sex.shape}")
+    age, height, weight = _col(age_years), _col(height_cm), _col(weight_kg)
+    female, male, unknown = sex == "female", sex == "male", sex == "unknown"
+    has_age = ~np.isnan(age)
+    # Same truthiness as the scalar path: missing or zero height/weight skips the blend.
+    has_bmi = (np.nan_to_num(height) != 0) & (np.nan_to_num(weight) != 0)
+
+    ctx = FeatureContext(PoseBatch(xy=xy, visibility=visibility))
+    x = ctx.get(DEFAULT_FEATURES)
+    q_pose = feature_quality_batch(visibility, x["approx_height_norm"])
+
+    if model is not None:
+        meta = {"sex": sex, "age_years": age, "height_cm": height, "weight_kg": weight}
+        bf = model.predict(model_columns(ctx, meta, model.inputs))
+    else:
+        bf = _heuristic_bf_batch(x, female, male, age, has_age, height, weight, has_bmi)
+
+    bf = np.clip(bf, 3.0, 60.0)
+
+    width = np.full(n, 10.0)
+    width += np.where(unknown, 3.0, 0.0)
+    width += np.where(has_age, 0.0, 2.0)
+    width += np.where(has_bmi, 0.0, 2.5)
+    width += (1.0 - q_pose) * 10.0
+
+    low = np.clip(bf - width / 2.0, 2.0, 60.0)
+    high = np.clip(bf + width / 2.0, 2.0, 65.0)
+    confidence = np.clip(0.25 + 0.55 * q_pose - 0.03 * (width - 10.0), 0.05, 0.85)
+
+    return EstimateBatch(
+        body_fat_percent=bf,
+        low_percent=low,
+        high_percent=high,
+        confidence=confidence,
+        quality=q_pose,
+        features={k: np.asarray(v, dtype=np.float64) for k, v in x.items()},
+    )
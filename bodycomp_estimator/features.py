@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 
 import numpy as np
 
-from .pose import PoseLandmarks
+from .pose import PoseBatch, PoseLandmarks
 
 
 # MediaPipe Pose landmark indices
@@ -17,69 +18,230 @@ RIGHT_HIP = 24
 LEFT_ANKLE = 27
 RIGHT_ANKLE = 28
 
+KEY_LANDMARKS = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_ANKLE, RIGHT_ANKLE)
+
+EPS = 1e-6
+
+# Named points: one landmark, or the midpoint of two.
+POINTS: dict[str, tuple[int, ...]] = {
+    "nose": (NOSE,),
+    "left_shoulder": (LEFT_SHOULDER,),
+    "right_shoulder": (RIGHT_SHOULDER,),
+    "left_hip": (LEFT_HIP,),
+    "right_hip": (RIGHT_HIP,),
+    "mid_shoulder": (LEFT_SHOULDER, RIGHT_SHOULDER),
+    "mid_hip": (LEFT_HIP, RIGHT_HIP),
+    "mid_ankle": (LEFT_ANKLE, RIGHT_ANKLE),
+}
+
+# Named distances between two points.
+SEGMENTS: dict[str, tuple[str, str]] = {
+    "shoulder_w": ("left_shoulder", "right_shoulder"),
+    "hip_w": ("left_hip", "right_hip"),
+    "trunk_len": ("mid_shoulder", "mid_hip"),
+    "leg_len": ("mid_hip", "mid_ankle"),
+    "approx_height": ("nose", "mid_ankle"),
+}
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A derived value; `fn` receives the values of `inputs` positionally.
+
+    Inputs are segment names, other feature names, or "ones" (1.0 per pose).
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    fn: Callable
+
+
+FEATURES: dict[str, Feature] = {}
+
+
+def feature(name: str, *inputs: str) -> Callable[[Callable], Callable]:
+    """Register `fn` as feature `name` computed from `inputs`."""
+
+    def register(fn: Callable) -> Callable:
+        FEATURES[name] = Feature(name, tuple(inputs), fn)
+        return fn
+
+    return register
+
+
+feature("shoulder_to_hip_ratio", "shoulder_w", "hip_w")(lambda s, h: s / (h + EPS))
+feature("trunk_to_leg_ratio", "trunk_len", "leg_len")(lambda t, leg: t / (leg + EPS))
+feature("hip_to_height_ratio", "hip_w", "approx_height")(lambda h, ht: h / (ht + EPS))
+feature("shoulder_to_height_ratio", "shoulder_w", "approx_height")(lambda s, ht: s / (ht + EPS))
+feature("trunk_to_height_ratio", "trunk_len", "approx_height")(lambda t, ht: t / (ht + EPS))
+feature("approx_height_norm", "approx_height")(lambda ht: ht)  # already normalized (0..~1.5)
+feature("pose_ok", "ones")(lambda ones: ones)
+
+# Keys (and order) returned by `compute_features` when no names are given.
+DEFAULT_FEATURES = (
+    "shoulder_to_hip_ratio",
+    "trunk_to_leg_ratio",
+    "hip_to_height_ratio",
+    "shoulder_to_height_ratio",
+    "trunk_to_height_ratio",
+    "approx_height_norm",
+    "pose_ok",
+)
 
-def _dist(a: np.ndarray, b: np.ndarray) -> float:
-    return float(np.linalg.norm(a - b))
 
+class FeatureContext:
+    """Lazy feature evaluation for one pose or a `PoseBatch`.
 
-def _mid(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-    return (a + b) / 2.0
+    Only the dependency closure of the requested features is evaluated, and every
+    intermediate (segment lengths, other features) is kept, so later requests on
+    the same context reuse it. All segments a request needs are measured in one
+    vectorized gather over the landmark array.
+    """
+
+    def __init__(self, pose: PoseLandmarks | PoseBatch):
+        self.xy = pose.xy
+        self.batch = self.xy.ndim == 3
+        self._values: dict[str, float | np.ndarray] = {
+            "ones": np.ones(self.xy.shape[0], dtype=np.float32) if self.batch else 1.0
+        }
+
+    def _closure(self, names: Iterable[str]) -> tuple[list[str], list[str]]:
+        """(features in dependency order, segments) still missing for `names`."""
+        order: list[str] = []
+        segments: list[str] = []
+        seen: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in seen or name in self._values:
+                return
+            seen.add(name)
+            if name in SEGMENTS:
+                segments.append(name)
+            elif name in FEATURES:
+                for dep in FEATURES[name].inputs:
+                    visit(dep)
+                order.append(name)
+            else:
+                raise KeyError(f"unknown feature or segment: {name}")
+
+        for name in names:
+            visit(name)
+        return order, segments
+
+    def _measure(self, segments: list[str]) -> None:
+        points = sorted({p for s in segments for p in SEGMENTS[s]})
+        single = [p for p in points if len(POINTS[p]) == 1]
+        mids = [p for p in points if len(POINTS[p]) == 2]
+        slot = {p: i for i, p in enumerate(single + mids)}
+        xy = self.xy
+        parts = [xy[..., [POINTS[p][0] for p in single], :]]
+        if mids:
+            a = xy[..., [POINTS[p][0] for p in mids], :]
+            b = xy[..., [POINTS[p][1] for p in mids], :]
+            parts.append((a + b) / 2.0)
+        pts = np.concatenate(parts, axis=-2)  # (..., P, 2)
+
+        ia = [slot[SEGMENTS[s][0]] for s in segments]
+        ib = [slot[SEGMENTS[s][1]] for s in segments]
+        d = np.linalg.norm(pts[..., ia, :] - pts[..., ib, :], axis=-1)
+        for k, s in enumerate(segments):
+            # Batches are widened to float64 like the scalar `float(d)`, so ratios
+            # match the single-pose path exactly.
+            self._values[s] = d[:, k].astype(np.float64) if self.batch else float(d[k])
+
+    def put(self, name: str, value: float | np.ndarray) -> None:
+        """Override a value; features evaluated afterwards build on it."""
+        self._values[name] = value
+
+    def get(self, names: Iterable[str]) -> dict[str, float | np.ndarray]:
+        names = list(names)
+        order, segments = self._closure(names)
+        if segments:
+            self._measure(segments)
+        for name in order:
+            f = FEATURES[name]
+            self._values[name] = f.fn(*(self._values[i] for i in f.inputs))
+        return {name: self._values[name] for name in names}
+
+
+# Lengths along the body axis: measurable from the front and from the side.
+VIEW_INVARIANT_FEATURES = ("trunk_to_leg_ratio", "trunk_to_height_ratio")
+
+
+def fuse_side_view(front: FeatureContext, side: FeatureContext, side_weight: float) -> dict[str, float]:
+    """Blend the side view's view-invariant features into `front` (in place).
+
+    Returns the side view's own values as "side_<name>".
+    """
+    f = front.get(VIEW_INVARIANT_FEATURES)
+    s = side.get(VIEW_INVARIANT_FEATURES)
+    for name in VIEW_INVARIANT_FEATURES:
+        front.put(name, (1.0 - side_weight) * f[name] + side_weight * s[name])
+    return {f"side_{name}": float(v) for name, v in s.items()}
 
 
-def compute_features(pose: PoseLandmarks) -> dict[str, float]:
+def compute_features(
+    pose: PoseLandmarks | PoseBatch, names: Iterable[str] | None = None
+) -> dict[str, float]:
     """Compute simple, scale-invariant ratios from 2D pose.
 
+    `names` selects registered features (default: `DEFAULT_FEATURES`); only what
+    they depend on is computed. A `PoseBatch` yields the same keys with (N,)
+    arrays instead of floats.
+
     Important limitations:
       - These ratios are *not* direct circumferences.
       - Clothing, camera angle, and body pose can introduce large errors.
     """
 
-    xy = pose.xy
-
-    ls, rs = xy[LEFT_SHOULDER], xy[RIGHT_SHOULDER]
-    lh, rh = xy[LEFT_HIP], xy[RIGHT_HIP]
-    la, ra = xy[LEFT_ANKLE], xy[RIGHT_ANKLE]
-    nose = xy[NOSE]
-
-    shoulder_w = _dist(ls, rs)
-    hip_w = _dist(lh, rh)
-    trunk_len = _dist(_mid(ls, rs), _mid(lh, rh))
-    leg_len = _dist(_mid(lh, rh), _mid(la, ra))
-    approx_height = _dist(nose, _mid(la, ra))
+    return FeatureContext(pose).get(DEFAULT_FEATURES if names is None else names)
 
-    eps = 1e-6
 
-    return {
-        "shoulder_to_hip_ratio": shoulder_w / (hip_w + eps),
-        "trunk_to_leg_ratio": trunk_len / (leg_len + eps),
-        "hip_to_height_ratio": hip_w / (approx_height + eps),
-        "shoulder_to_height_ratio": shoulder_w / (approx_height + eps),
-        "trunk_to_height_ratio": trunk_len / (approx_height + eps),
-        "approx_height_norm": approx_height,  # already normalized (0..~1.5)
-        "pose_ok": 1.0,
-    }
+def feature_quality_heuristic(
+    pose: PoseLandmarks | PoseBatch, feats: dict[str, float] | None = None
+) -> tuple[float, list[str]]:
+    """Return (quality 0..1, notes).
 
+    `feats` may carry an already computed "approx_height_norm" (e.g. from
+    `compute_features`); otherwise only that feature is computed.
+    For a `PoseBatch`, returns ((N,) quality array, per-pose notes).
+    """
 
-def feature_quality_heuristic(pose: PoseLandmarks) -> tuple[float, list[str]]:
-    """Return (quality 0..1, notes)."""
+    if isinstance(pose, PoseBatch):
+        heights = (feats or compute_features(pose, ["approx_height_norm"]))["approx_height_norm"]
+        scored = [feature_quality_heuristic(p, {"approx_height_norm": h}) for p, h in zip(pose, heights, strict=True)]
+        return np.asarray([q for q, _ in scored], dtype=np.float64), [n for _, n in scored]
 
     notes: list[str] = []
     if pose.visibility is None:
         return 0.6, ["No landmark visibility provided; quality degraded."]
 
     # Require that key landmarks are reasonably visible
-    key_ids = [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_ANKLE, RIGHT_ANKLE]
-    key_vis = float(np.mean([pose.visibility[i] for i in key_ids]))
+    key_vis = float(np.mean([pose.visibility[i] for i in KEY_LANDMARKS]))
 
     q = max(0.0, min(1.0, key_vis))
     if q < 0.5:
         notes.append("Low landmark visibility; ensure full-body photo with good lighting.")
 
     # Penalize extreme aspect ratios (likely cropped)
-    feats = compute_features(pose)
-    h = feats["approx_height_norm"]
+    h = (feats or compute_features(pose, ["approx_height_norm"]))["approx_height_norm"]
     if h < 0.45:
         notes.append("Subject appears cropped; include full body head-to-feet.")
         q *= 0.6
 
     return q, notes
+
+
+def feature_quality_batch(
+    visibility: np.ndarray | None, approx_height_norm: np.ndarray
+) -> np.ndarray:
+    """(N,) quality scores of `feature_quality_heuristic`, without notes, fully vectorized.
+
+    `approx_height_norm` is the (N,) feature from `compute_features` (not recomputed here).
+    """
+    h = np.asarray(approx_height_norm, dtype=np.float64)
+    if visibility is None:
+        return np.full(h.shape, 0.6)
+    key_vis = np.asarray(visibility)[:, KEY_LANDMARKS].mean(axis=1).astype(np.float64)
+    q = np.clip(key_vis, 0.0, 1.0)
+    return np.where(h < 0.45, q * 0.6, q)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .schemas import EstimateResult
+
+DAY_S = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS estimates (
+    id INTEGER PRIMARY KEY,
+    subject_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    body_fat_percent REAL NOT NULL,
+    low_percent REAL NOT NULL,
+    high_percent REAL NOT NULL,
+    confidence REAL NOT NULL,
+    model_version TEXT
+);
+CREATE INDEX IF NOT EXISTS estimates_subject_ts ON estimates (subject_id, ts);
+CREATE TABLE IF NOT EXISTS subject_stats (
+    subject_id TEXT PRIMARY KEY,
+    n INTEGER NOT NULL,
+    first_ts REAL NOT NULL,
+    last_ts REAL NOT NULL,
+    last_bf REAL NOT NULL,
+    level REAL NOT NULL,
+    slope_per_day REAL NOT NULL,
+    ew_var REAL NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectTrend:
+    """Aggregates for one subject, maintained incrementally on every estimate."""
+
+    subject_id: str
+    n: int
+    first_ts: float
+    last_ts: float
+    last_body_fat_percent: float
+    smoothed_body_fat_percent: float  # time-decayed level (Holt)
+    trend_percent_per_week: float  # time-decayed slope (Holt)
+    ew_std: float  # time-decayed std of scans around the smoothed level
+    mean_body_fat_percent: float
+    std_body_fat_percent: float  # over all scans (Welford)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def update_trend(
+    stats: tuple | None, bf: float, ts: float, half_life_days: float
+) -> tuple[int, float, float, float, float, float, float, float, float]:
+    """One O(1) step: (n, first_ts, last_ts, last_bf, level, slope, ew_var, mean, m2).
+
+    Level and slope follow Holt's linear smoothing with a time-dependent factor
+    alpha = 1 - 0.5 ** (dt / half_life), so irregular scan intervals weigh
+    correctly. Scans older than the last one are counted with dt = 0.
+    """
+    if stats is None:
+        return 1, ts, ts, bf, bf, 0.0, 0.0, bf, 0.0
+    n, first_ts, last_ts, _last_bf, level, slope, ew_var, mean, m2 = stats
+    dt = max(ts - last_ts, 0.0) / DAY_S
+    # Repeat scans at the same instant move the level halfway and leave the slope alone.
+    alpha = 1.0 - 0.5 ** (dt / half_life_days) if dt > 0 else 0.5
+
+    forecast = level + slope * dt
+    err = bf - forecast
+    new_level = forecast + alpha * err
+    if dt > 0:
+        slope = (1.0 - alpha) * slope + alpha * (new_level - level) / dt
+    ew_var = (1.0 - alpha) * (ew_var + alpha * err * err)
+
+    n += 1
+    delta = bf - mean
+    mean += delta / n
+    m2 += delta * (bf - mean)
+    return n, first_ts, max(ts, last_ts), bf, new_level, slope, ew_var, mean, m2
+
+
+class SubjectHistory:
+    """SQLite store of estimates per subject, with O(1) trend aggregates.
+
+    Every `record` appends the estimate and updates that subject's aggregate row in
+    the same transaction, so `trend` is a single primary-key lookup regardless of
+    how many scans the subject has.
+    """
+
+    def __init__(self, path: str | Path, half_life_days: float = 28.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.half_life_days = half_life_days
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def record(
+        self,
+        subject_id: str,
+        result: EstimateResult,
+        ts: float | None = None,
+        model_version: str | None = None,
+    ) -> SubjectTrend:
+        ts = time.time() if ts is None else float(ts)
+        bf = float(result.body_fat_percent)
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT INTO estimates (subject_id, ts, body_fat_percent, low_percent, high_percent,"
+                    " confidence, model_version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (subject_id, ts, bf, result.low_percent, result.high_percent, result.confidence, model_version),
+                )
+                row = db.execute(
+                    "SELECT n, first_ts, last_ts, last_bf, level, slope_per_day, ew_var, mean, m2"
+                    " FROM subject_stats WHERE subject_id = ?",
+                    (subject_id,),
+                ).fetchone()
+                stats = update_trend(row, bf, ts, self.half_life_days)
+                db.execute(
+                    "INSERT OR REPLACE INTO subject_stats (subject_id, n, first_ts, last_ts, last_bf, level,"
+                    " slope_per_day, ew_var, mean, m2) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (subject_id, *stats),
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return _trend(subject_id, stats)
+
+    def trend(self, subject_id: str) -> SubjectTrend | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT n, first_ts, last_ts, last_bf, level, slope_per_day, ew_var, mean, m2"
+                " FROM subject_stats WHERE subject_id = ?",
+                (subject_id,),
+            ).fetchone()
+        return None if row is None else _trend(subject_id, row)
+
+    def history(self, subject_id: str, limit: int = 100) -> list[dict]:
+        """Most recent estimates first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ts, body_fat_percent, low_percent, high_percent, confidence, model_version"
+                " FROM estimates WHERE subject_id = ? ORDER BY ts DESC, id DESC LIMIT ?",
+                (subject_id, int(limit)),
+            ).fetchall()
+        keys = ("ts", "body_fat_percent", "low_percent", "high_percent", "confidence", "model_version")
+        return [dict(zip(keys, r, strict=True)) for r in rows]
+
+
+def _trend(subject_id: str, s: tuple) -> SubjectTrend:
+    n, first_ts, last_ts, last_bf, level, slope, ew_var, mean, m2 = s
+    return SubjectTrend(
+        subject_id=subject_id,
+        n=int(n),
+        first_ts=float(first_ts),
+        last_ts=float(last_ts),
+        last_body_fat_percent=float(last_bf),
+        smoothed_body_fat_percent=float(level),
+        trend_percent_per_week=float(slope) * 7.0,
+        ew_std=math.sqrt(max(ew_var, 0.0)),
+        mean_body_fat_percent=float(mean),
+        std_body_fat_percent=math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Pixel box (x0, y0, x1, y1); clamped to the image when cropping.
+Box = tuple[int, int, int, int]
+
+_DONE: Any = object()
+
+
+def crop_box(roi_xywh: Sequence[float]) -> Box:
+    """Integer box cut by `read_image` for a float (x, y, w, h) ROI.
+
+    Edges are truncated (as the scripts always cropped) and the top-left is clamped
+    to 0; the bottom-right is clamped to the image size only when cropping.
+    """
+    x, y, w, h = (float(v) for v in roi_xywh)
+    return max(0, int(x)), max(0, int(y)), int(x + w), int(y + h)
+
+
+def read_image(path: str | Path, box: Box | None = None, rgb: bool = True) -> np.ndarray | None:
+    """Decode an image file, optionally cropped to `box`; None when it cannot be read.
+
+    The crop is taken before the color conversion, so only the ROI is converted.
+    An empty crop is returned as is (size 0, BGR layout).
+    """
+    import cv2
+
+    bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if bgr is None:
+        return None
+    if box is not None:
+        x0, y0, x1, y1 = box
+        bgr = bgr[max(0, y0) : min(bgr.shape[0], y1), max(0, x0) : min(bgr.shape[1], x1)]
+        if bgr.size == 0:
+            return bgr
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB) if rgb else bgr
+
+
+def prefetch(
+    fn: Callable[[T], R], items: Iterable[T], workers: int = 4, depth: int = 16
+) -> Iterator[tuple[T, R]]:
+    """Yield `(item, fn(item))` in item order, computed ahead on a thread pool.
+
+    At most `depth` results are pending or buffered at any time, so memory stays
+    bounded however long `items` is. Meant for I/O and OpenCV work (decoding,
+    cropping, color conversion), which release the GIL and so overlap with the
+    caller's own compute. An exception raised by `fn` is re-raised when its item
+    is reached. Closing the generator early cancels the pending work.
+    """
+    depth = max(1, depth)
+    it = iter(items)
+    pending: deque[tuple[T, Future]] = deque()
+    ex = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+    try:
+        for item in it:
+            pending.append((item, ex.submit(fn, item)))
+            if len(pending) >= depth:
+                break
+        while pending:
+            item, fut = pending.popleft()
+            result = fut.result()
+            nxt = next(it, _DONE)
+            if nxt is not _DONE:
+                pending.append((nxt, ex.submit(fn, nxt)))
+            yield item, result
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_images(
+    paths: Sequence[str | Path],
+    boxes: Sequence[Box | None] | None = None,
+    rgb: bool = True,
+    workers: int = 4,
+    depth: int = 16,
+) -> Iterator[np.ndarray | None]:
+    """`read_image` for each path (and box), decoded ahead of the caller, in order."""
+    jobs = zip(paths, boxes if boxes is not None else [None] * len(paths), strict=True)
+    for _, image in prefetch(lambda job: read_image(job[0], job[1], rgb), jobs, workers, depth):
+        yield image
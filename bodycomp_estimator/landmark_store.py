@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .image_loader import crop_box
+from .pose import NUM_LANDMARKS, PoseBatch, PoseLandmarks
+
+# Per-landmark columns stored on disk (same order as `pose._FIELDS`).
+FIELDS = ("x", "y", "z", "visibility", "presence")
+
+STATUS_OK = "ok"
+STATUS_NO_POSE = "no_pose"
+
+
+def pack_pose(pose: PoseLandmarks) -> np.ndarray:
+    """(L, 5) float32 row in `FIELDS` order; missing fields are 0."""
+    row = np.zeros((pose.xy.shape[0], len(FIELDS)), dtype=np.float32)
+    row[:, 0:2] = pose.xy
+    for j, arr in ((2, pose.z), (3, pose.visibility), (4, pose.presence)):
+        if arr is not None:
+            row[:, j] = arr
+    return row
+
+
+def unpack_pose(row) -> PoseLandmarks:
+    """Inverse of `pack_pose` (also accepts the nested lists of a JSON record)."""
+    arr = np.asarray(row, dtype=np.float32)
+    return PoseLandmarks(xy=arr[:, 0:2], z=arr[:, 2], visibility=arr[:, 3], presence=arr[:, 4])
+
+
+@dataclass(frozen=True)
+class LandmarkKey:
+    """Identity of one pose computation.
+
+    - image: COCO file name / repo-relative path (or any stable image id)
+    - roi: integer (x0, y0, x1, y1) box actually cut (`image_loader.crop_box`), or
+      None for the full image; two ROIs share a key only if they crop the same pixels
+    - model: pose model id (see `PoseExtractor.model_id`)
+    - input_size: max side the image was resized to before inference (0 = native)
+    """
+
+    image: str
+    roi: tuple[int, int, int, int] | None
+    model: str
+    input_size: int = 0
+
+    @classmethod
+    def from_roi(cls, image: str, roi_xywh, model: str, input_size: int = 0) -> LandmarkKey:
+        roi = None if roi_xywh is None else crop_box(roi_xywh)
+        return cls(image=image, roi=roi, model=model, input_size=int(input_size))
+
+    def as_str(self) -> str:
+        # "xyxy:" marks corner boxes; older stores keyed rounded (x, y, w, h) ROIs.
+        roi = "full" if self.roi is None else "xyxy:" + ",".join(str(v) for v in self.roi)
+        return f"{self.image}|{roi}|{self.model}|{self.input_size}"
+
+
+class LandmarkStore:
+    """Append-only on-disk store of pose landmarks for dataset runs.
+
+    Layout (one directory per store):
+      - meta.json: dtype + landmark count
+      - landmarks.bin: raw rows of shape (33, 5) [x, y, z, visibility, presence]
+      - index.jsonl: one line per computed key: {"key", "row", "status"}
+
+    "no_pose" results are indexed too (row = -1), so a failed detection is not
+    recomputed either. Lookups are O(1) via an in-memory dict; bulk reads use a
+    read-only `np.memmap` over `landmarks.bin`.
+    """
+
+    def __init__(self, root: str | Path, dtype: str = "float32", num_landmarks: int = NUM_LANDMARKS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.root / "meta.json"
+        self._data_path = self.root / "landmarks.bin"
+        self._index_path = self.root / "index.jsonl"
+
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            dtype = meta["dtype"]
+            num_landmarks = int(meta["num_landmarks"])
+        else:
+            if np.dtype(dtype) not in (np.dtype("float16"), np.dtype("float32")):
+                raise ValueError("LandmarkStore dtype must be float16 or float32")
+            meta = {"dtype": str(np.dtype(dtype)), "num_landmarks": int(num_landmarks), "fields": list(FIELDS)}
+            self._meta_path.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+
+        self.dtype = np.dtype(dtype)
+        self.num_landmarks = num_landmarks
+        self._row_shape = (num_landmarks, len(FIELDS))
+        self._row_bytes = int(np.prod(self._row_shape)) * self.dtype.itemsize
+
+        self._index: dict[str, tuple[int, str]] = {}
+        self._n_rows = self._data_path.stat().st_size // self._row_bytes if self._data_path.exists() else 0
+        if self._index_path.exists():
+            for line in self._index_path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                row = int(rec["row"])
+                if row < self._n_rows:
+                    self._index[rec["key"]] = (row, rec["status"])
+
+        self._mm: np.memmap | None = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: LandmarkKey) -> bool:
+        return key.as_str() in self._index
+
+    def _rows(self) -> np.ndarray:
+        if self._n_rows == 0:
+            return np.empty((0, *self._row_shape), dtype=self.dtype)
+        if self._mm is None or self._mm.shape[0] != self._n_rows:
+            self._mm = np.memmap(self._data_path, dtype=self.dtype, mode="r", shape=(self._n_rows, *self._row_shape))
+        return self._mm
+
+    def status(self, key: LandmarkKey) -> str | None:
+        """"ok" / "no_pose" if computed, else None."""
+        hit = self._index.get(key.as_str())
+        return None if hit is None else hit[1]
+
+    def get(self, key: LandmarkKey) -> PoseLandmarks | None:
+        """Stored pose, or None for no_pose. Raises KeyError when never computed."""
+        row, status = self._index[key.as_str()]
+        if status != STATUS_OK:
+            return None
+        return unpack_pose(self._rows()[row])
+
+    def get_many(self, keys: Sequence[LandmarkKey]) -> PoseBatch:
+        """Bulk read of stored poses; keys that are missing or no_pose are skipped.
+
+        `PoseBatch.ids` holds the position of each row in `keys`.
+        """
+        pos: list[int] = []
+        rows: list[int] = []
+        for i, key in enumerate(keys):
+            hit = self._index.get(key.as_str())
+            if hit is not None and hit[1] == STATUS_OK:
+                pos.append(i)
+                rows.append(hit[0])
+        return self._batch(np.asarray(rows, dtype=np.int64), np.asarray(pos, dtype=np.int64))
+
+    def as_batch(self) -> PoseBatch:
+        """Every stored pose (insertion order); ids are row numbers."""
+        rows = np.arange(self._n_rows, dtype=np.int64)
+        return self._batch(rows, rows)
+
+    def _batch(self, rows: np.ndarray, ids: np.ndarray) -> PoseBatch:
+        arr = np.asarray(self._rows()[rows], dtype=np.float32)
+        return PoseBatch(xy=arr[:, :, 0:2], z=arr[:, :, 2], visibility=arr[:, :, 3], presence=arr[:, :, 4], ids=ids)
+
+    def put(self, key: LandmarkKey, pose: PoseLandmarks | None) -> None:
+        self.put_many([key], [pose])
+
+    def put_many(self, keys: Iterable[LandmarkKey], poses: Iterable[PoseLandmarks | None]) -> None:
+        """Append results; data rows are flushed before their index lines."""
+        packed: list[np.ndarray] = []
+        index_lines: list[str] = []
+        for key, pose in zip(keys, poses, strict=True):
+            if pose is None:
+                entry = (-1, STATUS_NO_POSE)
+            else:
+                entry = (self._n_rows + len(packed), STATUS_OK)
+                packed.append(pack_pose(pose))
+            self._index[key.as_str()] = entry
+            index_lines.append(json.dumps({"key": key.as_str(), "row": entry[0], "status": entry[1]}) + "\n")
+
+        if packed:
+            with self._data_path.open("ab") as f:
+                f.write(np.stack(packed).astype(self.dtype, copy=False).tobytes())
+            self._n_rows += len(packed)
+        with self._index_path.open("a", encoding="utf-8") as f:
+            f.writelines(index_lines)
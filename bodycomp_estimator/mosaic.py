@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from .features import LEFT_HIP, LEFT_SHOULDER, RIGHT_HIP, RIGHT_SHOULDER
+from .pose import PoseBatch, PoseLandmarks
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Placement of one letterboxed crop on the mosaic canvas (pixels)."""
+
+    src: int  # index into the crops passed to `pack_mosaic`
+    x0: int
+    y0: int
+    w: int  # scaled crop size on the canvas
+    h: int
+    cell: tuple[int, int, int, int]  # grid cell (x0, y0, x1, y1); poses are assigned by cell
+
+
+def pack_mosaic(
+    crops: Sequence[np.ndarray],
+    tile_size: int = 256,
+    cols: int | None = None,
+    fill: int = 0,
+) -> tuple[np.ndarray, list[Tile]]:
+    """Letterbox RGB crops into a grid canvas for a single multi-pose detection.
+
+    Each crop is resized (aspect preserved) to fit a `tile_size` square cell and
+    centered in it. Returns (canvas (H, W, 3) uint8, tiles).
+    """
+    n = len(crops)
+    if n == 0:
+        raise ValueError("pack_mosaic needs at least one crop")
+    cols = cols or math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    canvas = np.full((rows * tile_size, cols * tile_size, 3), fill, dtype=np.uint8)
+
+    tiles: list[Tile] = []
+    for i, crop in enumerate(crops):
+        h, w = crop.shape[:2]
+        scale = tile_size / max(h, w)
+        sw, sh = max(1, round(w * scale)), max(1, round(h * scale))
+        resized = np.asarray(Image.fromarray(crop).resize((sw, sh), Image.BILINEAR))
+
+        cx0, cy0 = (i % cols) * tile_size, (i // cols) * tile_size
+        x0, y0 = cx0 + (tile_size - sw) // 2, cy0 + (tile_size - sh) // 2
+        canvas[y0 : y0 + sh, x0 : x0 + sw] = resized
+        tiles.append(Tile(i, x0, y0, sw, sh, (cx0, cy0, cx0 + tile_size, cy0 + tile_size)))
+    return canvas, tiles
+
+
+def assign_poses_to_tiles(
+    batch: PoseBatch, canvas_hw: tuple[int, int], tiles: Sequence[Tile]
+) -> list[PoseLandmarks | None]:
+    """Map poses detected on a mosaic back to their tiles.
+
+    A pose belongs to the cell containing its torso center (shoulders + hips). If a
+    cell receives several poses, the one with the highest mean visibility wins.
+    Returned landmarks are normalized to the original crop (same convention as
+    running pose on the crop alone); tiles without a pose get None.
+    """
+    out: list[PoseLandmarks | None] = [None] * len(tiles)
+    if len(batch) == 0:
+        return out
+
+    H, W = canvas_hw
+    px = batch.xy * np.array([W, H], dtype=np.float32)  # (N, L, 2) canvas pixels
+    torso = px[:, [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP], :].mean(axis=1)
+    vis = batch.visibility.mean(axis=1) if batch.visibility is not None else np.zeros(len(batch))
+
+    best_vis = np.full(len(tiles), -1.0)
+    for t_i, t in enumerate(tiles):
+        cx0, cy0, cx1, cy1 = t.cell
+        inside = (torso[:, 0] >= cx0) & (torso[:, 0] < cx1) & (torso[:, 1] >= cy0) & (torso[:, 1] < cy1)
+        for p_i in np.flatnonzero(inside):
+            if vis[p_i] <= best_vis[t_i]:
+                continue
+            best_vis[t_i] = vis[p_i]
+            xy = (px[p_i] - np.array([t.x0, t.y0], dtype=np.float32)) / np.array([t.w, t.h], dtype=np.float32)
+            out[t.src] = PoseLandmarks(
+                xy=xy.astype(np.float32),
+                visibility=None if batch.visibility is None else batch.visibility[p_i],
+                presence=None if batch.presence is None else batch.presence[p_i],
+                # z shares the x scale, which changes from canvas to crop width.
+                z=None if batch.z is None else batch.z[p_i] * (W / t.w),
+            )
+    return out
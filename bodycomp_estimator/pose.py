@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
 import numpy as np
 
+# MediaPipe Pose emits 33 landmarks per person.
+NUM_LANDMARKS = 33
+
+# Column order of the packed per-landmark array built from MediaPipe results.
+_FIELDS = ("x", "y", "z", "visibility", "presence")
+
 
 @dataclass(frozen=True)
 class PoseLandmarks:
@@ -12,6 +22,154 @@ class PoseLandmarks:
 
     xy: np.ndarray  # (N, 2)
     visibility: np.ndarray | None = None  # (N,)
+    presence: np.ndarray | None = None  # (N,)
+    z: np.ndarray | None = None  # (N,) relative depth, same scale as x
+
+
+@dataclass(frozen=True)
+class PoseBatch:
+    """Struct-of-arrays container for many poses.
+
+    Arrays share a leading pose axis:
+      - xy: (N, 33, 2) normalized coordinates
+      - visibility / presence: (N, 33)
+      - z: (N, 33) or None
+      - ids: (N,) caller-provided identifiers (image index, annotation id, ...)
+
+    Integer indexing returns a `PoseLandmarks` view and slicing/masking returns a
+    `PoseBatch`; basic slices are views, so no landmark data is copied.
+    """
+
+    xy: np.ndarray
+    visibility: np.ndarray | None = None
+    presence: np.ndarray | None = None
+    z: np.ndarray | None = None
+    ids: np.ndarray | None = None
+
+    def __post_init__(self) -> None:
+        if self.xy.ndim != 3 or self.xy.shape[-1] != 2:
+            raise ValueError(f"PoseBatch.xy must be (N, L, 2); got {self.xy.shape}")
+        if self.ids is None:
+            object.__setattr__(self, "ids", np.arange(self.xy.shape[0], dtype=np.int64))
+
+    def __len__(self) -> int:
+        return int(self.xy.shape[0])
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return PoseLandmarks(
+                xy=self.xy[key],
+                visibility=None if self.visibility is None else self.visibility[key],
+                presence=None if self.presence is None else self.presence[key],
+                z=None if self.z is None else self.z[key],
+            )
+        return PoseBatch(
+            xy=self.xy[key],
+            visibility=None if self.visibility is None else self.visibility[key],
+            presence=None if self.presence is None else self.presence[key],
+            z=None if self.z is None else self.z[key],
+            ids=self.ids[key],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @classmethod
+    def empty(cls, n: int, num_landmarks: int = NUM_LANDMARKS, with_z: bool = True) -> PoseBatch:
+        return cls(
+            xy=np.zeros((n, num_landmarks, 2), dtype=np.float32),
+            visibility=np.zeros((n, num_landmarks), dtype=np.float32),
+            presence=np.zeros((n, num_landmarks), dtype=np.float32),
+            z=np.zeros((n, num_landmarks), dtype=np.float32) if with_z else None,
+            ids=np.zeros((n,), dtype=np.int64),
+        )
+
+    @classmethod
+    def from_poses(cls, poses: Sequence[PoseLandmarks], ids: Sequence[int] | None = None) -> PoseBatch:
+        """Stack single poses (e.g. from older code paths) into one batch."""
+        n = len(poses)
+        n_lm = poses[0].xy.shape[0] if n else NUM_LANDMARKS
+        batch = cls.empty(n, n_lm, with_z=all(p.z is not None for p in poses))
+        for i, p in enumerate(poses):
+            batch.xy[i] = p.xy
+            batch.visibility[i] = p.visibility if p.visibility is not None else 0.0
+            batch.presence[i] = p.presence if p.presence is not None else 0.0
+            if batch.z is not None:
+                batch.z[i] = p.z
+        if ids is not None:
+            batch.ids[:] = np.asarray(ids, dtype=np.int64)
+        else:
+            batch.ids[:] = np.arange(n)
+        return batch
+
+    @classmethod
+    def from_mediapipe(cls, results: Iterable, ids: Iterable[int] | None = None) -> PoseBatch:
+        """Build a batch from MediaPipe `PoseLandmarkerResult`s in a single pass.
+
+        Every detected pose of every result becomes one row; results without a
+        detection are skipped, so `ids` records which input each row came from.
+        """
+        packed: list[np.ndarray] = []
+        row_ids: list[int] = []
+        ids_iter = iter(ids) if ids is not None else None
+        for i, result in enumerate(results):
+            src_id = next(ids_iter) if ids_iter is not None else i
+            for lms in getattr(result, "pose_landmarks", None) or []:
+                packed.append(_pack_landmarks(lms))
+                row_ids.append(int(src_id))
+        return cls._from_packed(packed, row_ids)
+
+    @classmethod
+    def _from_packed(cls, packed: list[np.ndarray], row_ids: list[int]) -> PoseBatch:
+        if not packed:
+            return cls.empty(0)
+        arr = np.stack(packed)  # (N, L, 5) in `_FIELDS` order
+        # Batches are consumed by vectorized code: treat missing optional fields as 0.
+        np.nan_to_num(arr[:, :, 2:], copy=False, nan=0.0)
+        return cls(
+            xy=arr[:, :, 0:2],
+            z=arr[:, :, 2],
+            visibility=arr[:, :, 3],
+            presence=arr[:, :, 4],
+            ids=np.asarray(row_ids, dtype=np.int64),
+        )
+
+
+def _mp_image(image_rgb: np.ndarray):
+    from mediapipe import Image, ImageFormat
+
+    return Image(image_format=ImageFormat.SRGB, data=np.ascontiguousarray(image_rgb))
+
+
+def _first_pose(result) -> PoseLandmarks | None:
+    if not result.pose_landmarks:
+        return None
+
+    # Use the first detected pose.
+    arr = _pack_landmarks(result.pose_landmarks[0])
+
+    # Some models don't expose visibility/presence/z; keep None when missing.
+    def col(j: int) -> np.ndarray | None:
+        c = arr[:, j]
+        return None if np.isnan(c).all() else np.nan_to_num(c, copy=False)
+
+    return PoseLandmarks(xy=arr[:, 0:2], z=col(2), visibility=col(3), presence=col(4))
+
+
+def _pack_landmarks(lms) -> np.ndarray:
+    """Pack MediaPipe landmark objects into a (L, 5) float32 array in one pass.
+
+    Missing optional fields (z/visibility/presence) become NaN.
+    """
+    n = len(lms)
+    nan = float("nan")
+    flat = np.fromiter(
+        (nan if (v := getattr(lm, f, None)) is None else v for lm in lms for f in _FIELDS),
+        dtype=np.float32,
+        count=n * len(_FIELDS),
+    )
+    return flat.reshape(n, len(_FIELDS))
 
 
 class PoseExtractor:
@@ -19,6 +177,10 @@ class PoseExtractor:
 
     We support the modern MediaPipe Tasks API (mediapipe>=0.10.3x).
 
+    `static_image_mode=False` selects VIDEO mode: consecutive `extract` calls track
+    the person across frames (pass increasing `timestamp_ms`), which is cheaper than
+    re-detecting on every frame. Use one extractor per clip in that mode.
+
     Notes:
         - MediaPipe returns *normalized* landmark coordinates.
         - For a photo-based body comp MVP, we only compute geometric ratios.
@@ -35,13 +197,21 @@ class PoseExtractor:
         static_image_mode: bool = True,
         model_complexity: int = 1,
         model_path: str | None = None,
+        num_poses: int = 1,
     ):
         # `model_complexity` kept for compatibility; Tasks model choice is via model file.
         self.static_image_mode = static_image_mode
         self.model_complexity = model_complexity
+        self.num_poses = int(num_poses)
 
         self.model_path = Path(model_path) if model_path else self._default_model_path()
         self._landmarker = None
+        self._video_ts = -1
+
+    @property
+    def model_id(self) -> str:
+        """Stable id of the landmarker configuration (used in cache keys)."""
+        return f"{self.model_path.stem}:n{self.num_poses}"
 
     def _default_model_path(self) -> Path:
         # repo-local cache (works in API + scripts)
@@ -78,14 +248,18 @@ class PoseExtractor:
 
         self._ensure_model()
 
-        options = vision.PoseLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=str(self.model_path)),
-            running_mode=vision.RunningMode.IMAGE,
-            num_poses=1,
-        )
+        options = self._landmarker_options(vision, BaseOptions(model_asset_path=str(self.model_path)))
         self._landmarker = vision.PoseLandmarker.create_from_options(options)
         return self._landmarker
 
+    def _landmarker_options(self, vision, base_options):
+        mode = vision.RunningMode.IMAGE if self.static_image_mode else vision.RunningMode.VIDEO
+        return vision.PoseLandmarkerOptions(
+            base_options=base_options,
+            running_mode=mode,
+            num_poses=self.num_poses,
+        )
+
     def close(self) -> None:
         if self._landmarker is not None:
             try:
@@ -101,26 +275,148 @@ class PoseExtractor:
         except Exception:
             pass
 
-    def extract(self, image_rgb: np.ndarray) -> PoseLandmarks | None:
-        from mediapipe import Image, ImageFormat
-
+    def _detect(self, image_rgb: np.ndarray, timestamp_ms: int | None = None):
         landmarker = self._get_landmarker()
+        if self.static_image_mode:
+            return landmarker.detect(_mp_image(image_rgb))
+        # VIDEO mode requires strictly increasing timestamps.
+        ts = self._video_ts + 1 if timestamp_ms is None else max(int(timestamp_ms), self._video_ts + 1)
+        self._video_ts = ts
+        return landmarker.detect_for_video(_mp_image(image_rgb), ts)
+
+    def extract(self, image_rgb: np.ndarray, timestamp_ms: int | None = None) -> PoseLandmarks | None:
+        return _first_pose(self._detect(image_rgb, timestamp_ms))
+
+    def extract_all(self, image_rgb: np.ndarray) -> PoseBatch:
+        """All detected poses of one image (up to `num_poses`) as a batch."""
+        return PoseBatch.from_mediapipe([self._detect(image_rgb)])
+
+    def extract_batch(self, images_rgb: Iterable[np.ndarray], ids: Iterable[int] | None = None) -> PoseBatch:
+        """Run pose on many images and collect the first pose of each into one batch.
+
+        Images without a detection are skipped; `PoseBatch.ids` maps rows back to inputs.
+        """
+        packed: list[np.ndarray] = []
+        row_ids: list[int] = []
+        ids_iter = iter(ids) if ids is not None else None
+        for i, image_rgb in enumerate(images_rgb):
+            src_id = next(ids_iter) if ids_iter is not None else i
+            result = self._detect(image_rgb)
+            if result.pose_landmarks:
+                packed.append(_pack_landmarks(result.pose_landmarks[0]))
+                row_ids.append(int(src_id))
+        return PoseBatch._from_packed(packed, row_ids)
+
+
+class PoseExtractorPool:
+    """Fixed set of extractors shared by request threads, one caller per instance.
 
-        mp_image = Image(image_format=ImageFormat.SRGB, data=image_rgb)
-        result = landmarker.detect(mp_image)
+    A MediaPipe landmarker must not be used from two threads at once, and
+    `PoseExtractor` creates it lazily without a lock. `checkout` hands out an
+    instance for exclusive use and blocks while all of them are busy, so up to
+    `size` requests run pose in parallel.
+    """
+
+    def __init__(self, factory: Callable[[], PoseExtractor], size: int = 2):
+        self.size = max(1, int(size))
+        self._idle: queue.Queue[PoseExtractor] = queue.Queue()
+        self._lock = threading.Lock()
+        self._retired = False
+        for _ in range(self.size):
+            self._idle.put(factory())
+
+    @contextmanager
+    def checkout(self) -> Iterator[PoseExtractor]:
+        extractor = self._idle.get()
+        try:
+            yield extractor
+        finally:
+            with self._lock:
+                if self._retired:
+                    extractor.close()
+            self._idle.put(extractor)
+
+    def retire(self) -> None:
+        """Release the native landmarkers of a pool that is being replaced.
+
+        Idle extractors are closed now and checked-out ones when they come back, so
+        requests that already hold this pool finish on it. A late `checkout` still
+        works (the landmarker is recreated and closed again on return).
+        """
+        with self._lock:
+            self._retired = True
+        idle: list[PoseExtractor] = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for extractor in idle:
+            extractor.close()
+            self._idle.put(extractor)
+
+
+class LivePoseTracker(PoseExtractor):
+    """LIVE_STREAM-mode landmarker for one client stream (e.g. a guided capture screen).
+
+    MediaPipe tracks the person between frames instead of re-detecting from scratch,
+    which is much cheaper per frame than IMAGE mode. Use one tracker per stream: the
+    tracking state and timestamps belong to a single sequence of frames.
+
+    Only one frame is in flight at a time; `submit` returns False (frame dropped)
+    while the previous frame is still being processed.
+    """
+
+    def __init__(self, model_path: str | None = None):
+        super().__init__(static_image_mode=False, model_path=model_path)
+        self._cond = threading.Condition()
+        self._in_flight: int | None = None
+        self._last_ts = -1
+        self._latest: tuple[int, PoseLandmarks | None] | None = None
+
+    def _landmarker_options(self, vision, base_options):
+        return vision.PoseLandmarkerOptions(
+            base_options=base_options,
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=self.num_poses,
+            result_callback=self._on_result,
+        )
 
-        if not result.pose_landmarks:
-            return None
+    def _on_result(self, result, _image, timestamp_ms: int) -> None:
+        pose = _first_pose(result)
+        with self._cond:
+            self._latest = (int(timestamp_ms), pose)
+            if self._in_flight is not None and timestamp_ms >= self._in_flight:
+                self._in_flight = None
+            self._cond.notify_all()
 
-        # Use the first detected pose.
-        lms = result.pose_landmarks[0]
-        xy = np.array([[lm.x, lm.y] for lm in lms], dtype=np.float32)
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._in_flight is not None
 
-        # Some models expose visibility; if missing, keep None.
-        vis = None
+    def submit(self, image_rgb: np.ndarray, timestamp_ms: int) -> bool:
+        """Queue a frame for async detection; False if dropped because a frame is in flight."""
+        with self._cond:
+            if self._in_flight is not None:
+                return False
+            # MediaPipe requires strictly increasing timestamps.
+            ts = max(int(timestamp_ms), self._last_ts + 1)
+            self._in_flight = self._last_ts = ts
         try:
-            vis = np.array([getattr(lm, "visibility", 0.0) for lm in lms], dtype=np.float32)
+            self._get_landmarker().detect_async(_mp_image(image_rgb), ts)
         except Exception:
-            vis = None
+            with self._cond:
+                self._in_flight = None
+            raise
+        return True
 
-        return PoseLandmarks(xy=xy, visibility=vis)
+    def wait_result(self, timeout_s: float = 1.0) -> tuple[int, PoseLandmarks | None] | None:
+        """Block until the in-flight frame is done; returns (timestamp_ms, pose) or None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight is None, timeout=timeout_s):
+                # Give up on this frame so the stream can move on; a late result is
+                # still recorded by the callback.
+                self._in_flight = None
+                return None
+            return self._latest
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 
 import numpy as np
@@ -22,66 +25,421 @@ class QualityGates:
     min_pose_bbox_area_ratio: float = 0.05  # person must occupy >=8% of image
     min_pose_bbox_min_side_ratio: float = 0.28  # bbox min side >=35% of image min side
 
+    # Pyramid mode: measure brightness/blur on a box-downsampled level whose longer side
+    # is <= pyramid_max_side (0 = full resolution), so gate cost stops growing with upload
+    # size. Laplacian variance rises as the image shrinks, so the blur threshold is
+    # rescaled per level: min_lap_var * factor ** pyramid_lap_exponent.
+    # Calibrate with scripts/actions/quality_pyramid_calibration.py.
+    pyramid_max_side: int = 0
+    pyramid_lap_exponent: float = 1.0
 
-def _to_gray(image_rgb: np.ndarray) -> np.ndarray:
-    r = image_rgb[:, :, 0].astype(np.float32)
-    g = image_rgb[:, :, 1].astype(np.float32)
-    b = image_rgb[:, :, 2].astype(np.float32)
-    return (0.299 * r + 0.587 * g + 0.114 * b).astype(np.float32)
+    def min_lap_var_at(self, factor: int) -> float:
+        """Blur threshold for metrics measured at a level downsampled by `factor`."""
+        if factor <= 1:
+            return self.min_lap_var
+        return self.min_lap_var * float(factor) ** self.pyramid_lap_exponent
 
 
-def laplacian_var(image_rgb: np.ndarray) -> float:
-    """Variance of a discrete Laplacian (blur proxy). No OpenCV dependency."""
-    gray = _to_gray(image_rgb)
-    # 2D Laplacian kernel (4-neighborhood)
+# PT-BR messages per rejection reason (see reports/_plan/quality_reason_contract.md).
+QUALITY_MESSAGES_PTBR = {
+    "too_dark": "Foto escura. Vire para a luz / aumente a iluminação e tente de novo.",
+    "too_bright": "Foto estourada (muita luz). Afaste da luz direta e tente de novo.",
+    "too_blurry": "Foto tremida/desfocada. Apoie o celular, use temporizador e tente de novo.",
+    "too_small": (
+        "A pessoa está pequena no frame. Chegue mais perto e deixe o corpo inteiro visível (cabeça aos pés)."
+    ),
+}
+
+_W_R, _W_G, _W_B = np.float32(0.299), np.float32(0.587), np.float32(0.114)
+
+
+class _ScratchPool:
+    """Per-thread float32 scratch buffers, bucketed by size class.
+
+    Gate intermediates (gray, Laplacian, pyramid level) are written into these with
+    `out=` instead of being allocated per request, so steady traffic reuses the same
+    pages. Buckets are keyed by (tag, element count rounded up to 1 MiB): portrait and
+    landscape frames of one camera share buffers, while buffers that are alive at the
+    same time use different tags. Callers get reshaped views.
+    Each thread keeps at most `max_bytes` (least recently used buckets are dropped
+    first) and requests larger than the budget get fresh arrays.
+    Views are only valid until the next `get` for the same bucket on that thread.
+    """
+
+    _CLASS = 2**18  # elements (1 MiB of float32)
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def get(self, shape: tuple[int, ...], count: int = 1, tag: str = "plane") -> list[np.ndarray]:
+        n = int(np.prod(shape))
+        cap = -(-n // self._CLASS) * self._CLASS
+        if cap * 4 * count > self.max_bytes:
+            return [np.empty(shape, dtype=np.float32) for _ in range(count)]
+
+        buckets: OrderedDict[tuple[str, int], list[np.ndarray]] | None = getattr(self._local, "buckets", None)
+        if buckets is None:
+            buckets = self._local.buckets = OrderedDict()
+        key = (tag, cap)
+        bufs = buckets.pop(key, [])
+        bufs.extend(np.empty(cap, dtype=np.float32) for _ in range(count - len(bufs)))
+        buckets[key] = bufs
+
+        total = sum(b.nbytes for v in buckets.values() for b in v)
+        while total > self.max_bytes and len(buckets) > 1:
+            _, dropped = buckets.popitem(last=False)
+            total -= sum(b.nbytes for b in dropped)
+        return [b[:n].reshape(shape) for b in bufs[:count]]
+
+    def clear(self) -> None:
+        """Release this thread's buffers."""
+        self._local.buckets = OrderedDict()
+
+
+# Large frames are measured in row strips of ~_STRIP_PIXELS; the strip-wise metrics
+# are what bound gate memory (reports/loadtest_quality_rss.md). The pool budget only
+# keeps the planes of small frames (up to ~640x480, the live/video path) warm: strip
+# planes exceed it and are allocated per request, since pinning them in every
+# threadpool thread costs more RSS than it saves.
+_SCRATCH = _ScratchPool(max_bytes=4 * 2**20)
+_STRIP_PIXELS = 2**20
+
+
+def set_scratch_pool_limit(max_bytes: int) -> None:
+    """Per-thread scratch budget in bytes (0 disables pooling; applies to new requests)."""
+    _SCRATCH.max_bytes = int(max_bytes)
+    _SCRATCH.clear()
+
+
+def _to_gray(
+    image_rgb: np.ndarray, scratch: np.ndarray | None = None, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Luma (0.299 R + 0.587 G + 0.114 B) as float32.
+
+    Works on (H, W, 3) and stacked (N, H, W, 3) inputs. Channels are converted
+    straight into the output buffer (no per-channel float copies); `scratch`, if
+    given, is a same-shape float32 buffer reused for the partial products.
+    """
+    shape = image_rgb.shape[:-1]
+    gray = out if out is not None else np.empty(shape, dtype=np.float32)
+    tmp = scratch if scratch is not None else np.empty(shape, dtype=np.float32)
+    np.multiply(image_rgb[..., 0], _W_R, out=gray)
+    np.multiply(image_rgb[..., 1], _W_G, out=tmp)
+    gray += tmp
+    np.multiply(image_rgb[..., 2], _W_B, out=tmp)
+    gray += tmp
+    return gray
+
+
+def _laplacian(gray: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """4-neighbour Laplacian with wrap-around borders over the last two axes.
+
+    Same result as summing `np.roll`ed copies, but built with in-place slice adds,
+    so no shifted full-frame copies are allocated.
+    """
     #   0  1  0
     #   1 -4  1
     #   0  1  0
-    c = gray
-    lap = (
-        -4.0 * c
-        + np.roll(c, 1, axis=0)
-        + np.roll(c, -1, axis=0)
-        + np.roll(c, 1, axis=1)
-        + np.roll(c, -1, axis=1)
-    )
-    return float(lap.var())
+    lap = np.multiply(gray, np.float32(-4.0), out=out)
+    # roll(+1) along rows / cols: out[i] += c[i - 1]
+    lap[..., 1:, :] += gray[..., :-1, :]
+    lap[..., :1, :] += gray[..., -1:, :]
+    # roll(-1): out[i] += c[i + 1]
+    lap[..., :-1, :] += gray[..., 1:, :]
+    lap[..., -1:, :] += gray[..., :1, :]
+    lap[..., :, 1:] += gray[..., :, :-1]
+    lap[..., :, :1] += gray[..., :, -1:]
+    lap[..., :, :-1] += gray[..., :, 1:]
+    lap[..., :, -1:] += gray[..., :, :1]
+    return lap
 
 
-def brightness_L_mean(image_rgb: np.ndarray) -> float:
-    """Approx brightness. Uses mean of grayscale as proxy for L channel."""
-    gray = _to_gray(image_rgb)
-    return float(gray.mean())
+def _var_inplace(x: np.ndarray) -> float:
+    """Variance of `x`, destroying it (avoids the temporary `np.var` allocates)."""
+    x -= x.mean()
+    np.multiply(x, x, out=x)
+    return float(x.mean())
 
 
-def pose_bbox_from_landmarks_xy(pose_xy_norm: np.ndarray) -> tuple[float, float, float, float]:
-    """Return normalized bbox (xmin, ymin, xmax, ymax) from normalized landmark xy."""
-    xs = pose_xy_norm[:, 0]
-    ys = pose_xy_norm[:, 1]
-    return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+def pyramid_factor(height: int, width: int, max_side: int) -> int:
+    """Integer downsampling factor so the longer side fits `max_side` (1 = full res)."""
+    if max_side <= 0:
+        return 1
+    return max(1, -(-max(height, width) // max_side))
 
 
-def quality_gate_message(
+def box_downsample(image_rgb: np.ndarray, factor: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Mean over factor x factor blocks -> float32 (H // factor, W // factor, 3).
+
+    Edge rows/cols that do not fill a block are dropped. Block means preserve
+    brightness, so only the Laplacian threshold needs rescaling.
+    """
+    if factor <= 1:
+        return image_rgb
+    h, w = image_rgb.shape[0] // factor, image_rgb.shape[1] // factor
+    blocks = image_rgb[: h * factor, : w * factor].reshape(h, factor, w, factor, -1)
+    return blocks.mean(axis=(1, 3), dtype=np.float32, out=out)
+
+
+class _NumpyBackend:
+    """Reference metrics: pure numpy, no optional dependency."""
+
+    name = "numpy"
+    col_pad = 0  # strips hold just the image columns; wrap-around is done by slicing
+
+    def for_frame(self, height: int, width: int) -> _NumpyBackend:
+        return self
+
+    def to_gray(self, image_rgb: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> np.ndarray:
+        return _to_gray(image_rgb, scratch=scratch, out=out)
+
+    def laplacian_strip(self, ext: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Laplacian of ext[1:-1] given halo rows ext[0] / ext[-1] (wrap-around columns).
+
+        `out` has the shape of `ext`; the result is the view `out[1:-1]`.
+        """
+        # Same accumulation order as `_laplacian`, so each value matches it exactly.
+        c = ext[1:-1]
+        lap = np.multiply(c, np.float32(-4.0), out=out[1:-1])
+        lap += ext[:-2]
+        lap += ext[2:]
+        lap[:, 1:] += c[:, :-1]
+        lap[:, :1] += c[:, -1:]
+        lap[:, :-1] += c[:, 1:]
+        lap[:, -1:] += c[:, :1]
+        return lap
+
+
+class _OpenCVBackend:
+    """Same metrics through OpenCV kernels (multi-threaded, SIMD).
+
+    Gray uses `cv2.transform` with the luma weights on a float32 copy of each strip
+    (no uint8 rounding); the Laplacian is `cv2.Laplacian(ksize=1)` (the same
+    4-neighbour kernel) written into the caller's buffer, on strips that carry one
+    wrap-around column on each side. Results match the numpy reference to float32
+    rounding (see backend/tests/test_quality.py).
+    """
+
+    name = "opencv"
+    col_pad = 1
+
+    def __init__(self, cv2):
+        self.cv2 = cv2
+        self._weights = np.array([[_W_R, _W_G, _W_B]], dtype=np.float32)
+
+    def for_frame(self, height: int, width: int) -> _OpenCVBackend:
+        return self
+
+    def to_gray(self, image_rgb: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> np.ndarray:
+        h, w = image_rgb.shape[:2]
+        (rgb,) = _SCRATCH.get((h, w, 3), tag="rgb")
+        np.copyto(rgb, image_rgb, casting="unsafe")
+        return self.cv2.transform(rgb, self._weights, dst=out)
+
+    def laplacian_strip(self, ext: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Like `_NumpyBackend.laplacian_strip`, with `ext` padded by one column per side."""
+        ext[:, 0] = ext[:, -2]
+        ext[:, -1] = ext[:, 1]
+        lap = self.cv2.Laplacian(ext, self.cv2.CV_32F, dst=out, ksize=1)
+        return lap[1:-1, 1:-1]
+
+
+# `auto` hands frames from this size up to OpenCV; below it numpy is faster because
+# OpenCV's per-call overhead dominates (reports/bench_quality_backends.md).
+_OPENCV_MIN_PIXELS = 2**20
+
+
+class _AutoBackend:
+    """numpy for small frames (live stream, video), OpenCV for photo-sized ones."""
+
+    name = "auto"
+
+    def __init__(self, cv2, min_pixels: int = _OPENCV_MIN_PIXELS):
+        self._numpy = _NumpyBackend()
+        self._opencv = _OpenCVBackend(cv2)
+        self.min_pixels = min_pixels
+
+    def for_frame(self, height: int, width: int) -> _NumpyBackend | _OpenCVBackend:
+        return self._opencv if height * width >= self.min_pixels else self._numpy
+
+
+Backend = _NumpyBackend | _OpenCVBackend
+
+
+def _load_backend(name: str) -> Backend | _AutoBackend:
+    """numpy | opencv | auto (by frame size when OpenCV is importable, else numpy)."""
+    if name not in {"auto", "numpy", "opencv"}:
+        raise ValueError(f"unknown quality backend: {name!r} (use auto|numpy|opencv)")
+    if name == "numpy":
+        return _NumpyBackend()
+    try:
+        import cv2
+    except ImportError:
+        if name == "opencv":
+            raise
+        return _NumpyBackend()
+    return _OpenCVBackend(cv2) if name == "opencv" else _AutoBackend(cv2)
+
+
+# Chosen once at import; override with BODYCOMP_QUALITY_BACKEND=numpy|opencv|auto.
+_BACKEND = _load_backend(os.environ.get("BODYCOMP_QUALITY_BACKEND", "auto"))
+
+
+def metrics_backend() -> str:
+    """Name of the active metrics backend ("numpy", "opencv" or "auto")."""
+    return _BACKEND.name
+
+
+def set_metrics_backend(name: str) -> str:
+    """Switch backend (numpy | opencv | auto); returns the previous name."""
+    global _BACKEND
+    previous = _BACKEND.name
+    _BACKEND = _load_backend(name)
+    return previous
+
+
+def _gray_metrics(image_rgb: np.ndarray, strip_pixels: int = _STRIP_PIXELS) -> tuple[float, float]:
+    """(brightness, laplacian variance) in one pass sharing two pooled float32 planes.
+
+    Frames larger than two strips are processed strip by strip instead, so scratch
+    memory stays constant however large the upload is. The OpenCV backend always
+    uses the strip path (a small frame is a single strip).
+    """
+    h, w = image_rgb.shape[:2]
+    backend = _BACKEND.for_frame(h, w)
+    if backend.name != "numpy":
+        return _gray_metrics_strips(image_rgb, max(1, strip_pixels // w), backend)
+    if h * w > 2 * strip_pixels and h > 2:
+        return _gray_metrics_strips(image_rgb, max(1, strip_pixels // w), backend)
+    gray_buf, buf = _SCRATCH.get((h, w), 2)
+    gray = _to_gray(image_rgb, scratch=buf, out=gray_buf)
+    brightness = float(gray.mean())
+    return brightness, _var_inplace(_laplacian(gray, out=buf))
+
+
+def _strip_planes(
+    backend: Backend,
     image_rgb: np.ndarray,
-    pose_xy_norm: np.ndarray | None = None,
-    gates: QualityGates | None = None,
-) -> str | None:
-    """Return a PT-BR rejection message if quality is insufficient, else None."""
+    r0: int,
+    r1: int,
+    ext: np.ndarray,
+    scratch: np.ndarray,
+    out: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Luma and Laplacian of rows r0:r1 -> two (r1 - r0, W) views into `ext` / `out`.
 
-    g = gates or QualityGates()
+    `ext` and `out` are (r1 - r0 + 2, W + 2 * backend.col_pad) buffers; `ext` also
+    receives the wrap-around halo rows (r0 - 1, r1) the Laplacian needs.
+    """
+    h, w = image_rgb.shape[:2]
+    k = r1 - r0
+    g = ext[:, backend.col_pad : backend.col_pad + w]
+    backend.to_gray(image_rgb[r0:r1], out=g[1:-1], scratch=scratch[:k])
+    backend.to_gray(image_rgb[(r0 - 1) % h][None], out=g[:1], scratch=scratch[:1])
+    backend.to_gray(image_rgb[r1 % h][None], out=g[-1:], scratch=scratch[:1])
+    return g[1:-1], backend.laplacian_strip(ext, out=out)
+
+
+def _gray_metrics_strips(
+    image_rgb: np.ndarray, rows: int, backend: Backend | None = None
+) -> tuple[float, float]:
+    """Strip-wise `_gray_metrics`: same per-pixel Laplacian (wrap-around borders).
+
+    Each strip gets one halo row above and below. Brightness sums and per-strip
+    (mean, M2) are merged in float64 (Chan et al. parallel variance).
+    """
+    h, w = image_rgb.shape[:2]
+    backend = backend or _BACKEND.for_frame(h, w)
+    rows = min(rows, h)
+    ext_buf, lap_buf = _SCRATCH.get((rows + 2, w + 2 * backend.col_pad), 2, tag="strip")
+    (tmp,) = _SCRATCH.get((rows, w), tag="strip-tmp")
+    total = 0.0
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for r0 in range(0, h, rows):
+        r1 = min(r0 + rows, h)
+        k = r1 - r0
+        ext, out = ext_buf[: k + 2], lap_buf[: k + 2]
+        gray, lap = _strip_planes(backend, image_rgb, r0, r1, ext, tmp, out)
+        total += float(gray.sum(dtype=np.float64))
+
+        nk = k * w
+        mk = float(lap.mean(dtype=np.float64))
+        lap -= np.float32(mk)
+        np.multiply(lap, lap, out=lap)
+        m2k = float(lap.sum(dtype=np.float64))
+        delta = mk - mean
+        n_new = n + nk
+        mean += delta * nk / n_new
+        m2 += m2k + delta * delta * n * nk / n_new
+        n = n_new
+    return total / n, m2 / n
+
+
+def gray_laplacian_planes(image_rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Full-frame luma and Laplacian planes (fresh float32 arrays) from the active backend.
+
+    Same per-pixel values the gates reduce; meant for offline per-region statistics
+    (`regional.RegionalStats.from_image`), not for the request path.
+    """
+    h, w = image_rgb.shape[:2]
+    backend = _BACKEND.for_frame(h, w)
+    shape = (h + 2, w + 2 * backend.col_pad)
+    ext, out = np.empty(shape, dtype=np.float32), np.empty(shape, dtype=np.float32)
+    return _strip_planes(backend, image_rgb, 0, h, ext, np.empty((h, w), dtype=np.float32), out)
 
-    b = brightness_L_mean(image_rgb)
-    if b < g.min_brightness_L_mean:
-        return "Foto escura. Vire para a luz / aumente a iluminação e tente de novo."
-    if b > g.max_brightness_L_mean:
-        return "Foto estourada (muita luz). Afaste da luz direta e tente de novo."
 
-    lv = laplacian_var(image_rgb)
-    if lv < g.min_lap_var:
-        return "Foto tremida/desfocada. Apoie o celular, use temporizador e tente de novo."
+def laplacian_var(image_rgb: np.ndarray) -> float:
+    """Variance of a discrete Laplacian (blur proxy). No OpenCV dependency."""
+    return _gray_metrics(image_rgb)[1]
 
-    if pose_xy_norm is not None:
+
+def brightness_L_mean(image_rgb: np.ndarray) -> float:
+    """Approx brightness. Uses mean of grayscale as proxy for L channel."""
+    gray_buf, buf = _SCRATCH.get(image_rgb.shape[:2], 2)
+    return float(_to_gray(image_rgb, scratch=buf, out=gray_buf).mean())
+
+
+@dataclass(frozen=True)
+class QualityReport:
+    """All quality metrics of one image, computed once.
+
+    Build it with `QualityReport.compute(image_rgb)` and reuse it for the pre-pose
+    (brightness/blur) and post-pose (person bbox) gates instead of recomputing the
+    metrics on every gate call.
+    """
+
+    brightness_L_mean: float
+    lap_var: float  # measured at the pyramid level below
+    height: int  # original image size (the pose gate is resolution-independent)
+    width: int
+    level_factor: int = 1  # downsampling factor the metrics were measured at
+
+    @classmethod
+    def compute(cls, image_rgb: np.ndarray, gates: QualityGates | None = None) -> QualityReport:
+        """Metrics at full resolution, or at the pyramid level set by `gates.pyramid_max_side`."""
+        g = gates or QualityGates()
         h, w = image_rgb.shape[:2]
+        return cls.compute_at_level(image_rgb, pyramid_factor(h, w, g.pyramid_max_side))
+
+    @classmethod
+    def compute_at_level(cls, image_rgb: np.ndarray, factor: int) -> QualityReport:
+        h, w = image_rgb.shape[:2]
+        level = image_rgb
+        if factor > 1:
+            (level_buf,) = _SCRATCH.get((h // factor, w // factor, image_rgb.shape[2]), tag="level")
+            level = box_downsample(image_rgb, factor, out=level_buf)
+        b, lv = _gray_metrics(level)
+        return cls(brightness_L_mean=b, lap_var=lv, height=int(h), width=int(w), level_factor=int(factor))
+
+    def precheck_reason(self, gates: QualityGates | None = None) -> str | None:
+        """too_dark | too_bright | too_blurry, or None if the full-image gates pass."""
+        return precheck_reason(self.brightness_L_mean, self.lap_var, gates, self.level_factor)
+
+    def pose_bbox_ratios(self, pose_xy_norm: np.ndarray) -> tuple[float, float]:
+        """(bbox area ratio, bbox min side / image min side) of the person."""
         xmin, ymin, xmax, ymax = pose_bbox_from_landmarks_xy(pose_xy_norm)
         # Clamp to [0,1] defensively
         xmin = max(0.0, min(1.0, xmin))
@@ -92,11 +450,118 @@ def quality_gate_message(
         bw = max(0.0, xmax - xmin)
         bh = max(0.0, ymax - ymin)
         area_ratio = bw * bh
+        w, h = self.width, self.height
         min_side_ratio = min(bw * w, bh * h) / max(1.0, min(w, h))
+        return area_ratio, min_side_ratio
 
+    def pose_reason(self, pose_xy_norm: np.ndarray, gates: QualityGates | None = None) -> str | None:
+        """too_small if the person bbox is below the pose-relative gates, else None."""
+        g = gates or QualityGates()
+        area_ratio, min_side_ratio = self.pose_bbox_ratios(pose_xy_norm)
         if area_ratio < g.min_pose_bbox_area_ratio or min_side_ratio < g.min_pose_bbox_min_side_ratio:
-            return (
-                "A pessoa está pequena no frame. Chegue mais perto e deixe o corpo inteiro visível (cabeça aos pés)."
-            )
+            return "too_small"
+        return None
 
+    def message(self, pose_xy_norm: np.ndarray | None = None, gates: QualityGates | None = None) -> str | None:
+        """PT-BR rejection message (same contract as `quality_gate_message`)."""
+        reason = self.precheck_reason(gates)
+        if reason is None and pose_xy_norm is not None:
+            reason = self.pose_reason(pose_xy_norm, gates)
+        return None if reason is None else QUALITY_MESSAGES_PTBR[reason]
+
+
+def full_image_metrics_batch(
+    images_rgb: list[np.ndarray], max_stack_pixels: int = 2 * _STRIP_PIXELS
+) -> tuple[np.ndarray, np.ndarray]:
+    """Brightness and Laplacian variance for N images -> two (N,) arrays.
+
+    Small same-shape frames (N x H x W up to `max_stack_pixels`, e.g. video-sized
+    thumbnails) are stacked and scored in one vectorized numpy pass. Anything larger,
+    such as a burst of phone photos, is scored per image through the strip path, so
+    no full-resolution stacked planes are allocated.
+    """
+    if not images_rgb:
+        return np.zeros(0), np.zeros(0)
+    h, w = images_rgb[0].shape[:2]
+    if (
+        _BACKEND.for_frame(h, w).name != "numpy"
+        or len(images_rgb) * h * w > max_stack_pixels
+        or any(im.shape != images_rgb[0].shape for im in images_rgb)
+    ):
+        reports = [QualityReport.compute(im) for im in images_rgb]
+        return np.array([r.brightness_L_mean for r in reports]), np.array([r.lap_var for r in reports])
+
+    stack = np.stack(images_rgb)  # (N, H, W, 3)
+    gray_buf, buf = _SCRATCH.get(stack.shape[:-1], 2)
+    gray = _to_gray(stack, scratch=buf, out=gray_buf)  # (N, H, W)
+    brightness = gray.mean(axis=(1, 2), dtype=np.float64)
+    return brightness, _laplacian(gray, out=buf).var(axis=(1, 2), dtype=np.float64)
+
+
+def quality_reports_batch(
+    images_rgb: list[np.ndarray], gates: QualityGates | None = None
+) -> list[QualityReport]:
+    """One `QualityReport` per image; small same-shape full-resolution batches are stacked."""
+    g = gates or QualityGates()
+    same_shape = all(im.shape == images_rgb[0].shape for im in images_rgb) if images_rgb else True
+    h, w = images_rgb[0].shape[:2] if images_rgb else (0, 0)
+    if not same_shape or pyramid_factor(h, w, g.pyramid_max_side) > 1:
+        return [QualityReport.compute(im, g) for im in images_rgb]
+    b, lv = full_image_metrics_batch(images_rgb)
+    return [QualityReport(float(bi), float(li), int(h), int(w)) for bi, li in zip(b, lv, strict=True)]
+
+
+def pose_bbox_from_landmarks_xy(pose_xy_norm: np.ndarray) -> tuple[float, float, float, float]:
+    """Return normalized bbox (xmin, ymin, xmax, ymax) from normalized landmark xy.
+
+    Accepts one pose (L, 2) or a batch (N, L, 2); a batch yields four (N,) arrays.
+    """
+    xs = pose_xy_norm[..., 0]
+    ys = pose_xy_norm[..., 1]
+    if xs.ndim == 1:
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+    return xs.min(axis=-1), ys.min(axis=-1), xs.max(axis=-1), ys.max(axis=-1)
+
+
+def precheck_reason(
+    brightness: float,
+    lap_var: float | None,
+    gates: QualityGates | None = None,
+    level_factor: int = 1,
+) -> str | None:
+    """Full-image (pre-pose) reason code from already computed metrics.
+
+    `lap_var=None` checks brightness only (lets callers skip the blur metric on dark/bright images).
+    `level_factor` is the pyramid level `lap_var` was measured at.
+    """
+    g = gates or QualityGates()
+    if brightness < g.min_brightness_L_mean:
+        return "too_dark"
+    if brightness > g.max_brightness_L_mean:
+        return "too_bright"
+    if lap_var is not None and lap_var < g.min_lap_var_at(level_factor):
+        return "too_blurry"
     return None
+
+
+def precheck_message(
+    brightness: float, lap_var: float | None, gates: QualityGates | None = None
+) -> str | None:
+    """PT-BR message for `precheck_reason`, or None if the full-image gates pass."""
+    reason = precheck_reason(brightness, lap_var, gates)
+    return None if reason is None else QUALITY_MESSAGES_PTBR[reason]
+
+
+def quality_gate_message(
+    image_rgb: np.ndarray,
+    pose_xy_norm: np.ndarray | None = None,
+    gates: QualityGates | None = None,
+    report: QualityReport | None = None,
+) -> str | None:
+    """Return a PT-BR rejection message if quality is insufficient, else None.
+
+    Pass a precomputed `report` to avoid recomputing the image metrics.
+    """
+
+    report = report or QualityReport.compute(image_rgb, gates)
+    return report.message(pose_xy_norm, gates)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .quality import QUALITY_MESSAGES_PTBR, QualityGates, QualityReport
+
+# Written by scripts/actions/train_quality_multiclass.py (local only, not versioned).
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[1] / "data" / "quality_labeled" / "model" / "quality_multiclass.json"
+
+FEATURES = ("brightness", "lap_var", "width", "height")
+
+
+@dataclass(frozen=True)
+class QualityModel:
+    """Softmax quality classifier trained by `train_quality_multiclass.py`.
+
+    Standardization is folded into the weights at load time
+    (W' = W / sigma, b' = b - (mu / sigma) @ W), so scoring is one matmul plus a
+    softmax on the raw feature vector [brightness, lap_var, width, height].
+    """
+
+    classes: tuple[str, ...]
+    W: np.ndarray  # (4, K) float32, C-contiguous
+    b: np.ndarray  # (K,) float32
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> QualityModel:
+        if tuple(payload.get("features", FEATURES)) != FEATURES:
+            raise ValueError(f"unsupported quality model features: {payload.get('features')}")
+        unknown = set(payload["classes"]) - {"ok", *QUALITY_MESSAGES_PTBR}
+        if unknown:
+            raise ValueError(f"quality model classes without a PT-BR message: {sorted(unknown)}")
+        mu = np.asarray(payload["standardize_mu"], dtype=np.float64)
+        sigma = np.asarray(payload["standardize_sigma"], dtype=np.float64)
+        W = np.asarray(payload["W"], dtype=np.float64)
+        b = np.asarray(payload["b"], dtype=np.float64)
+        if W.shape != (len(FEATURES), len(payload["classes"])) or b.shape != (W.shape[1],):
+            raise ValueError("quality model weights do not match classes/features")
+        W_folded = W / sigma[:, None]
+        b_folded = b - (mu / sigma) @ W
+        return cls(
+            classes=tuple(payload["classes"]),
+            W=np.ascontiguousarray(W_folded, dtype=np.float32),
+            b=np.ascontiguousarray(b_folded, dtype=np.float32),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> QualityModel:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """(N, 4) raw features -> (N, K) class probabilities."""
+        z = np.asarray(X, dtype=np.float32) @ self.W
+        z += self.b
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        z /= z.sum(axis=1, keepdims=True)
+        return z
+
+    def predict_batch(self, reports: Sequence[QualityReport], gates: QualityGates | None = None) -> list[str]:
+        """Most likely class per report ("ok" or a reason code)."""
+        if not reports:
+            return []
+        idx = self.predict_proba(report_features(reports, gates)).argmax(axis=1)
+        return [self.classes[i] for i in idx]
+
+    def predict(self, report: QualityReport, gates: QualityGates | None = None) -> str:
+        return self.predict_batch([report], gates)[0]
+
+
+def report_features(reports: Sequence[QualityReport], gates: QualityGates | None = None) -> np.ndarray:
+    """(N, 4) float32 [brightness, lap_var, width, height].
+
+    The model is trained on full-resolution Laplacian variance; pyramid-level
+    values are mapped back with the same rescaling the blur gate uses.
+    """
+    g = gates or QualityGates()
+    X = np.empty((len(reports), len(FEATURES)), dtype=np.float32)
+    for i, r in enumerate(reports):
+        X[i] = (r.brightness_L_mean, r.lap_var * g.min_lap_var / g.min_lap_var_at(r.level_factor), r.width, r.height)
+    return X
+
+
+_cache_lock = threading.Lock()
+_cache: dict[Path, tuple[float, QualityModel | None]] = {}
+
+
+def load_quality_model(path: str | Path | None = None) -> QualityModel | None:
+    """Model at `path` (default: DEFAULT_MODEL_PATH), or None when it is absent/invalid.
+
+    Parsed once per file version (cached by mtime), so callers may ask per request.
+    """
+    p = Path(path) if path is not None else DEFAULT_MODEL_PATH
+    try:
+        mtime = p.stat().st_mtime
+    except OSError:
+        return None
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        try:
+            model: QualityModel | None = QualityModel.load(p)
+        except (OSError, ValueError, KeyError, TypeError):
+            model = None
+        _cache[p] = (mtime, model)
+        return model
+
+
+def precheck_reasons(
+    reports: Sequence[QualityReport],
+    gates: QualityGates | None = None,
+    model: QualityModel | None = None,
+) -> list[str | None]:
+    """Pre-pose reason per report: the learned model when loaded, else the heuristic gates."""
+    if model is None:
+        return [r.precheck_reason(gates) for r in reports]
+    return [None if label == "ok" else label for label in model.predict_batch(reports, gates)]
+
+
+def precheck_reason(
+    report: QualityReport, gates: QualityGates | None = None, model: QualityModel | None = None
+) -> str | None:
+    return precheck_reasons([report], gates, model)[0]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .quality import gray_laplacian_planes
+
+
+def summed_area_table(plane: np.ndarray, squared: bool = False) -> np.ndarray:
+    """(H+1, W+1) float64 table T with T[y, x] = sum(plane[:y, :x]) (of plane**2 if `squared`)."""
+    h, w = plane.shape
+    sat = np.zeros((h + 1, w + 1), dtype=np.float64)
+    body = sat[1:, 1:]
+    if squared:
+        np.multiply(plane, plane, out=body, dtype=np.float64)
+    else:
+        body[...] = plane
+    np.cumsum(body, axis=0, out=body)
+    np.cumsum(body, axis=1, out=body)
+    return sat
+
+
+def clamp_rois_xywh(rois_xywh, width: int, height: int) -> np.ndarray:
+    """(N, 4) float (x, y, w, h) -> (N, 4) int64 (x0, y0, x1, y1) clipped to the image.
+
+    Same rounding as the scripts' `clamp_bbox` (floor start, ceil end).
+    """
+    r = np.asarray(rois_xywh, dtype=np.float64).reshape(-1, 4)
+    out = np.empty(r.shape, dtype=np.int64)
+    out[:, 0] = np.clip(np.floor(r[:, 0]), 0, width)
+    out[:, 1] = np.clip(np.floor(r[:, 1]), 0, height)
+    out[:, 2] = np.clip(np.ceil(r[:, 0] + r[:, 2]), 0, width)
+    out[:, 3] = np.clip(np.ceil(r[:, 1] + r[:, 3]), 0, height)
+    return out
+
+
+@dataclass(frozen=True)
+class RegionalStats:
+    """Summed-area tables of luma and Laplacian response for one image.
+
+    Built once per image (O(H*W)); mean brightness and Laplacian variance of any
+    axis-aligned ROI then cost four lookups per table, vectorized over many ROIs.
+    The Laplacian is taken on the whole image, so ROI values near the crop edge
+    use the real neighbouring pixels instead of a crop border rule.
+    """
+
+    luma: np.ndarray  # (H+1, W+1) float64 tables
+    luma2: np.ndarray
+    lap: np.ndarray
+    lap2: np.ndarray
+
+    @classmethod
+    def from_planes(cls, luma: np.ndarray, lap: np.ndarray) -> RegionalStats:
+        """Tables from precomputed (H, W) planes, e.g. LAB L and `cv2.Laplacian` output."""
+        if luma.shape != lap.shape:
+            raise ValueError("luma and Laplacian planes must have the same shape")
+        return cls(
+            luma=summed_area_table(luma),
+            luma2=summed_area_table(luma, squared=True),
+            lap=summed_area_table(lap),
+            lap2=summed_area_table(lap, squared=True),
+        )
+
+    @classmethod
+    def from_image(cls, image_rgb: np.ndarray) -> RegionalStats:
+        """Tables on the API gate metrics (float32 luma + 4-neighbour Laplacian, same backend)."""
+        return cls.from_planes(*gray_laplacian_planes(image_rgb))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.luma.shape[0] - 1, self.luma.shape[1] - 1
+
+    @staticmethod
+    def _sums(sat: np.ndarray, r: np.ndarray) -> np.ndarray:
+        x0, y0, x1, y1 = r[:, 0], r[:, 1], r[:, 2], r[:, 3]
+        return sat[y1, x1] - sat[y0, x1] - sat[y1, x0] + sat[y0, x0]
+
+    def _rois(self, rois_xyxy) -> tuple[np.ndarray, np.ndarray]:
+        r = np.asarray(rois_xyxy, dtype=np.int64).reshape(-1, 4)
+        n = (r[:, 2] - r[:, 0]) * (r[:, 3] - r[:, 1])
+        if (n <= 0).any():
+            raise ValueError("empty ROI")
+        return r, n.astype(np.float64)
+
+    def roi_metrics(self, rois_xyxy) -> tuple[np.ndarray, np.ndarray]:
+        """(brightness mean, Laplacian variance) per ROI -> two (N,) arrays.
+
+        `rois_xyxy` is (N, 4) integer (x0, y0, x1, y1), end-exclusive; see `clamp_rois_xywh`.
+        """
+        r, n = self._rois(rois_xyxy)
+        brightness = self._sums(self.luma, r) / n
+        lap_mean = self._sums(self.lap, r) / n
+        lap_var = np.maximum(self._sums(self.lap2, r) / n - lap_mean * lap_mean, 0.0)
+        return brightness, lap_var
+
+    def luma_var(self, rois_xyxy) -> np.ndarray:
+        """Luma variance (contrast) per ROI."""
+        r, n = self._rois(rois_xyxy)
+        mean = self._sums(self.luma, r) / n
+        return np.maximum(self._sums(self.luma2, r) / n - mean * mean, 0.0)
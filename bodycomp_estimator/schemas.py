@@ -3,11 +3,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Literal
 
+import numpy as np
+
 
 Sex = Literal["female", "male", "unknown"]
 
+# Result types are slotted: one is built per request (or per jitter/batch call),
+# so they skip the per-instance __dict__.
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SubjectMetadata:
     sex: Sex = "unknown"
     age_years: float | None = None
@@ -15,7 +20,7 @@ class SubjectMetadata:
     weight_kg: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EstimateResult:
     body_fat_percent: float
     low_percent: float
@@ -23,3 +28,18 @@ class EstimateResult:
     confidence: float  # 0..1
     notes: list[str]
     features: dict[str, float]
+
+
+@dataclass(frozen=True, slots=True)
+class EstimateBatch:
+    """Struct-of-arrays `EstimateResult`s for N subjects (notes are not materialized)."""
+
+    body_fat_percent: np.ndarray  # (N,) float64
+    low_percent: np.ndarray
+    high_percent: np.ndarray
+    confidence: np.ndarray
+    quality: np.ndarray  # (N,) pose quality from `feature_quality_batch`
+    features: dict[str, np.ndarray]  # same keys as `compute_features`, (N,) each
+
+    def __len__(self) -> int:
+        return int(self.body_fat_percent.shape[0])
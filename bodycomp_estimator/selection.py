@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from .features import feature_quality_heuristic
+from .pose import PoseExtractor, PoseLandmarks
+from .quality import QUALITY_MESSAGES_PTBR, QualityGates, QualityReport, quality_reports_batch
+from .quality_model import QualityModel, precheck_reason, precheck_reasons
+
+
+@dataclass(frozen=True)
+class FrameSelection:
+    """Frame chosen for estimation plus the cost spent choosing it."""
+
+    image_rgb: np.ndarray
+    pose: PoseLandmarks
+    frame_index: int
+    timestamp_ms: int
+    pose_quality: float  # key-landmark visibility score from `feature_quality_heuristic`
+    frames_seen: int
+    pose_calls: int
+    early_stop: bool
+
+
+def iter_video_frames(
+    path: str,
+    max_frames: int = 180,
+    stride: int = 2,
+    max_side: int = 720,
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Decode a clip lazily, yielding (frame_index, timestamp_ms, rgb).
+
+    At most `max_frames` frames are read from the container; only every `stride`-th
+    one is decoded (the rest are grabbed and skipped). Frames are downscaled so the
+    longer side is <= `max_side`, keeping per-frame cost bounded too.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError("could not open video")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    try:
+        for i in range(max_frames):
+            if i % stride:
+                if not cap.grab():
+                    return
+                continue
+            ok, bgr = cap.read()
+            if not ok or bgr is None:
+                return
+            h, w = bgr.shape[:2]
+            scale = max_side / max(h, w)
+            if scale < 1.0:
+                bgr = cv2.resize(bgr, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+            ts = cap.get(cv2.CAP_PROP_POS_MSEC)
+            ts_ms = int(ts) if ts and ts > 0 else int(i * 1000.0 / fps)
+            yield i, ts_ms, cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    finally:
+        cap.release()
+
+
+def select_best_frame(
+    frames: Iterable[tuple[int, int, np.ndarray]],
+    extractor: PoseExtractor,
+    gates: QualityGates | None = None,
+    min_pose_quality: float = 0.8,
+    max_pose_calls: int = 12,
+    model: QualityModel | None = None,
+) -> FrameSelection | None:
+    """Pick the best frame of a clip for estimation.
+
+    Cheap brightness/blur gates run on every frame; pose runs only on frames that
+    pass them (use a VIDEO-mode extractor so consecutive calls track). Stops early
+    at the first frame that passes every gate with pose quality >= `min_pose_quality`,
+    or after `max_pose_calls` pose calls. Returns the best gated frame seen, or None.
+    `model` (see `quality_model.load_quality_model`) replaces the heuristic precheck.
+    """
+    best: FrameSelection | None = None
+    seen = 0
+    calls = 0
+    for idx, ts_ms, image_rgb in frames:
+        seen += 1
+        report = QualityReport.compute(image_rgb, gates)
+        if precheck_reason(report, gates, model) is not None:
+            continue
+
+        calls += 1
+        pose = extractor.extract(image_rgb, timestamp_ms=ts_ms)
+        if pose is not None and report.pose_reason(pose.xy, gates) is None:
+            q, _ = feature_quality_heuristic(pose)
+            if best is None or q > best.pose_quality:
+                best = FrameSelection(image_rgb, pose, idx, ts_ms, float(q), seen, calls, False)
+            if q >= min_pose_quality:
+                break
+
+        if calls >= max_pose_calls:
+            break
+
+    if best is None:
+        return None
+    early = best.pose_quality >= min_pose_quality
+    return FrameSelection(
+        best.image_rgb, best.pose, best.frame_index, best.timestamp_ms, best.pose_quality, seen, calls, early
+    )
+
+
+@dataclass(frozen=True)
+class BurstSelection:
+    """Outcome of burst ranking.
+
+    On success `pose` is set and `index` is the chosen image. On failure `pose` is
+    None and `reason`/`message_ptbr` explain the best attempt (precheck|no_pose|too_small).
+    """
+
+    index: int
+    pose: PoseLandmarks | None
+    order: list[int]  # images ranked best-first
+    pose_calls: int
+    reason: str = "ok"
+    message_ptbr: str = ""
+
+
+def rank_burst(
+    images_rgb: list[np.ndarray], gates: QualityGates | None = None, model: QualityModel | None = None
+) -> tuple[list[int], list[str | None]]:
+    """Rank a burst best-first using the full-image gates (`quality_reports_batch`).
+
+    Images passing brightness/blur come first, sharper (higher Laplacian variance)
+    first within each group. Returns (order, per-image precheck message or None).
+    """
+    order, msgs, _ = _rank_burst_reports(images_rgb, gates, model)
+    return order, msgs
+
+
+def _rank_burst_reports(
+    images_rgb: list[np.ndarray], gates: QualityGates | None, model: QualityModel | None
+) -> tuple[list[int], list[str | None], list[QualityReport]]:
+    reports = quality_reports_batch(images_rgb, gates)
+    reasons = precheck_reasons(reports, gates, model)  # one batched model call
+    msgs = [None if r is None else QUALITY_MESSAGES_PTBR[r] for r in reasons]
+    # Rank sharpness relative to each image's threshold so pyramid levels compare fairly.
+    g = gates or QualityGates()
+    order = sorted(
+        range(len(images_rgb)),
+        key=lambda i: (msgs[i] is not None, -reports[i].lap_var / g.min_lap_var_at(reports[i].level_factor)),
+    )
+    return order, msgs, reports
+
+
+def select_burst_frame(
+    images_rgb: list[np.ndarray],
+    extractor: PoseExtractor,
+    gates: QualityGates | None = None,
+    top_k: int = 3,
+    model: QualityModel | None = None,
+) -> BurstSelection:
+    """Run pose only on the top-ranked images until one passes the post-pose bbox gate.
+
+    Pose cost is usually 1 per burst (at most `top_k`).
+    """
+    order, msgs, reports = _rank_burst_reports(images_rgb, gates, model)
+    if not order:
+        raise ValueError("empty burst")
+    if msgs[order[0]] is not None:
+        return BurstSelection(order[0], None, order, 0, "precheck", msgs[order[0]])
+
+    calls = 0
+    failure: tuple[int, str, str] | None = None
+    for i in order[:top_k]:
+        if msgs[i] is not None:
+            break
+        calls += 1
+        pose = extractor.extract(images_rgb[i])
+        if pose is None:
+            failure = failure or (i, "no_pose", "")
+            continue
+        # Post-pose size gate only: the precheck (heuristic or model) already passed.
+        reason = reports[i].pose_reason(pose.xy, gates)
+        if reason is None:
+            return BurstSelection(i, pose, order, calls)
+        # A detected-but-small person is the more actionable message.
+        if failure is None or failure[1] == "no_pose":
+            failure = (i, reason, QUALITY_MESSAGES_PTBR[reason])
+
+    assert failure is not None
+    return BurstSelection(failure[0], None, order, calls, failure[1], failure[2])
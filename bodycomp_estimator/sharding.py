@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any
+
+# Per-item work for the dataset scripts: `process(state, items)` yields one JSON
+# record per item, in order; `state` comes from `init()`, called once per process.
+Process = Callable[[Any, Sequence[Any]], Iterable[dict]]
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    start: int
+    stop: int
+
+
+def plan_shards(n: int, num_shards: int) -> list[Shard]:
+    """Contiguous shards of `range(n)`; sizes differ by at most one item."""
+    num_shards = max(1, min(num_shards, n))
+    base, extra = divmod(n, num_shards)
+    shards: list[Shard] = []
+    start = 0
+    for i in range(num_shards):
+        stop = start + base + (1 if i < extra else 0)
+        shards.append(Shard(i, start, stop))
+        start = stop
+    return shards
+
+
+_state: Any = None  # this worker process's `init()` result
+
+
+def _init_worker(init: Callable[[], Any] | None) -> None:
+    global _state
+    _state = init() if init is not None else None
+    if hasattr(_state, "close"):
+        # Pool processes skip atexit; multiprocessing finalizers still run.
+        Finalize(None, _state.close, exitpriority=10)
+
+
+def _write_shard(process: Process, state: Any, items: Sequence[Any], path: Path) -> Path:
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for rec in process(state, items):
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def _run_shard(process: Process, items: Sequence[Any], path: Path) -> Path:
+    return _write_shard(process, _state, items, path)
+
+
+def _read_shard(path: Path) -> Iterator[dict]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def run_sharded(
+    items: Sequence[Any],
+    process: Process,
+    init: Callable[[], Any] | None = None,
+    workers: int = 1,
+    shards_per_worker: int = 4,
+    shard_dir: str | Path | None = None,
+) -> Iterator[dict]:
+    """Run `process` over `items` on `workers` processes; yield the records in item order.
+
+    `items` is split into contiguous shards (several per worker, so slow images
+    even out); each shard writes `shard-NNNN.jsonl` and the shards are merged in
+    order once all are done. With one worker the shards run in-process (no pool)
+    but take the same JSON round trip, so reports built from the merged records
+    do not depend on `workers`.
+
+    `process`, `init` and the items must be picklable (top-level functions).
+    Workers only compute: shared state such as a `LandmarkStore` should be
+    written by the caller while consuming the records. Shard files are kept
+    in `shard_dir` when given, else in a temporary directory.
+    """
+    with tempfile.TemporaryDirectory(prefix="shards-") as tmp:
+        out_dir = Path(shard_dir) if shard_dir is not None else Path(tmp)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        shards = plan_shards(len(items), workers * shards_per_worker if workers > 1 else 1)
+        paths = [out_dir / f"shard-{s.index:04d}.jsonl" for s in shards]
+
+        if workers <= 1 or len(shards) <= 1:
+            state = init() if init is not None else None
+            try:
+                for s, path in zip(shards, paths, strict=True):
+                    _write_shard(process, state, items[s.start : s.stop], path)
+            finally:
+                if hasattr(state, "close"):
+                    state.close()
+        else:
+            # "spawn": each worker builds its own native state (e.g. a PoseExtractor)
+            # instead of inheriting the parent's threads through fork.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(init,)
+            ) as ex:
+                futures = [
+                    ex.submit(_run_shard, process, items[s.start : s.stop], path)
+                    for s, path in zip(shards, paths, strict=True)
+                ]
+                for fut in futures:
+                    fut.result()
+
+        for path in paths:
+            yield from _read_shard(path)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .quality import QualityGates, QualityReport
+
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Axis:
+    """Fixed binning of one metric; `log` bins are uniform in log10(value).
+
+    Bin 0 counts values below `lo` (and non-positive values on log axes), bin
+    `bins + 1` values at or above `hi`.
+    """
+
+    name: str
+    lo: float
+    hi: float
+    bins: int
+    log: bool = False
+
+    def _scale(self, v: np.ndarray) -> np.ndarray:
+        if not self.log:
+            return np.asarray(v, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.log10(np.asarray(v, dtype=np.float64))
+
+    def index(self, values) -> np.ndarray:
+        lo, hi = self._scale(np.array([self.lo, self.hi]))
+        pos = (self._scale(values) - lo) / (hi - lo) * self.bins
+        pos = np.where(np.isnan(pos), -1.0, pos)
+        return np.clip(np.floor(pos), -1, self.bins).astype(np.int64) + 1
+
+    def edges(self) -> np.ndarray:
+        """(bins + 1,) bin edges in value units."""
+        if self.log:
+            return np.logspace(np.log10(self.lo), np.log10(self.hi), self.bins + 1)
+        return np.linspace(self.lo, self.hi, self.bins + 1)
+
+    def pass_weights(self, lo: float | None = None, hi: float | None = None) -> np.ndarray:
+        """(bins + 2,) fraction of each bin inside [lo, hi), assuming uniform mass per bin.
+
+        Under/overflow mass is treated as sitting at the first/last edge.
+        """
+        e = self._scale(self.edges())
+        a, b = e[:-1], e[1:]
+        w = np.ones(self.bins + 2)
+        if lo is not None:
+            t = float(self._scale(np.array([lo]))[0]) if lo > 0 or not self.log else -np.inf
+            w *= np.concatenate([[float(t <= e[0])], np.clip((b - t) / (b - a), 0.0, 1.0), [float(t <= e[-1])]])
+        if hi is not None:
+            t = float(self._scale(np.array([hi]))[0]) if hi > 0 or not self.log else -np.inf
+            w *= np.concatenate([[float(t > e[0])], np.clip((t - a) / (b - a), 0.0, 1.0), [float(t > e[-1])]])
+        return w
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "lo": self.lo, "hi": self.hi, "bins": self.bins, "log": self.log}
+
+
+class JointHistogram:
+    """Fixed-memory 2D histogram (counts per (x, y) bin), mergeable by addition.
+
+    Joint rather than two marginals so acceptance of *combined* thresholds (e.g.
+    brightness window AND min Laplacian variance) can be read back exactly up to
+    bin resolution.
+    """
+
+    def __init__(self, x: Axis, y: Axis, counts: np.ndarray | None = None):
+        self.x, self.y = x, y
+        shape = (x.bins + 2, y.bins + 2)
+        self.counts = np.zeros(shape, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        if self.counts.shape != shape:
+            raise ValueError(f"counts shape {self.counts.shape} does not match axes {shape}")
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, xs, ys) -> None:
+        np.add.at(self.counts, (self.x.index(np.atleast_1d(xs)), self.y.index(np.atleast_1d(ys))), 1)
+
+    def merge(self, other: JointHistogram) -> None:
+        if (self.x, self.y) != (other.x, other.y):
+            raise ValueError("cannot merge histograms with different axes")
+        self.counts += other.counts
+
+    def marginal(self, axis: str) -> np.ndarray:
+        """(bins + 2,) counts along `axis` (x or y name)."""
+        if axis == self.x.name:
+            return self.counts.sum(axis=1)
+        if axis == self.y.name:
+            return self.counts.sum(axis=0)
+        raise KeyError(axis)
+
+    def acceptance(self, bounds: Mapping[str, tuple[float | None, float | None]]) -> float:
+        """Fraction of samples with every axis inside its [lo, hi) bound (None = open)."""
+        if self.total == 0:
+            return float("nan")
+        wx = self.x.pass_weights(*bounds.get(self.x.name, (None, None)))
+        wy = self.y.pass_weights(*bounds.get(self.y.name, (None, None)))
+        return float(wx @ self.counts @ wy) / self.total
+
+    def as_dict(self) -> dict:
+        return {"x": self.x.as_dict(), "y": self.y.as_dict(), "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> JointHistogram:
+        return cls(Axis(**d["x"]), Axis(**d["y"]), np.asarray(d["counts"], dtype=np.int64))
+
+
+def quantile_from_counts(edges: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Approximate quantile from (len(edges) + 1,) counts incl. under/overflow bins.
+
+    Interpolates linearly inside the bin (in value units); mass in the under/overflow
+    bins is reported at the first/last edge.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return float("nan")
+    cum = np.cumsum(counts)
+    target = q * total
+    i = int(np.searchsorted(cum, target, side="left"))
+    if i == 0:
+        return float(edges[0])
+    if i >= len(counts) - 1:
+        return float(edges[-1])
+    prev = cum[i - 1]
+    frac = (target - prev) / counts[i] if counts[i] else 0.0
+    return float(edges[i - 1] + frac * (edges[i] - edges[i - 1]))
+
+
+# Brightness on the 0..255 luma scale; Laplacian variance at full-resolution scale
+# (pyramid levels are mapped back like the blur gate); bbox ratios as in `pose_reason`.
+PRECHECK_AXES = (Axis("brightness", 0.0, 256.0, 128), Axis("lap_var", 0.1, 1e6, 140, log=True))
+POSE_AXES = (Axis("bbox_area_ratio", 0.0, 1.0, 100), Axis("bbox_min_side_ratio", 0.0, 2.0, 100))
+
+
+class GateTelemetry:
+    """Streaming gate-metric histograms for one API worker.
+
+    Memory is fixed (two small joint histograms). Snapshots from several workers
+    merge by adding counts; no photo or per-request record is kept.
+    """
+
+    def __init__(self) -> None:
+        self.precheck = JointHistogram(*PRECHECK_AXES)
+        self.pose = JointHistogram(*POSE_AXES)
+        self._lock = threading.Lock()
+
+    def record_precheck(self, report: QualityReport, gates: QualityGates | None = None) -> None:
+        g = gates or QualityGates()
+        lap = report.lap_var * g.min_lap_var / g.min_lap_var_at(report.level_factor)
+        with self._lock:
+            self.precheck.add(report.brightness_L_mean, lap)
+
+    def record_pose(self, report: QualityReport, pose_xy_norm: np.ndarray) -> None:
+        area, min_side = report.pose_bbox_ratios(pose_xy_norm)
+        with self._lock:
+            self.pose.add(area, min_side)
+
+    def merge(self, other: GateTelemetry) -> None:
+        with self._lock:
+            self.precheck.merge(other.precheck)
+            self.pose.merge(other.pose)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "schema": SCHEMA_VERSION,
+                "precheck": self.precheck.as_dict(),
+                "pose": self.pose.as_dict(),
+            }
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> GateTelemetry:
+        if d.get("schema") != SCHEMA_VERSION:
+            raise ValueError(f"unsupported telemetry schema: {d.get('schema')}")
+        t = cls()
+        t.precheck = JointHistogram.from_dict(d["precheck"])
+        t.pose = JointHistogram.from_dict(d["pose"])
+        return t
+
+    @classmethod
+    def merged(cls, snapshots: Iterable[Mapping]) -> GateTelemetry:
+        out = cls()
+        for d in snapshots:
+            out.merge(cls.from_dict(d))
+        return out
+
+    def dump(self, path: str | Path) -> None:
+        """Atomic JSON snapshot (for merging across worker processes)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name per call: concurrent dumps (threads or processes) never share it.
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            f.write(json.dumps(self.as_dict()))
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            Path(f.name).unlink(missing_ok=True)
+            raise
+
+    def acceptance(self, gates: QualityGates) -> dict[str, float | None]:
+        """Acceptance rates the histograms imply for `gates` (None when nothing recorded).
+
+        Pose metrics are only recorded for photos that passed the live precheck and
+        had a pose, so "pose" is conditional on that and "combined" = precheck * pose.
+        """
+        with self._lock:
+            pre = self.precheck.acceptance(
+                {
+                    "brightness": (gates.min_brightness_L_mean, gates.max_brightness_L_mean),
+                    "lap_var": (gates.min_lap_var, None),
+                }
+            )
+            pose = self.pose.acceptance(
+                {
+                    "bbox_area_ratio": (gates.min_pose_bbox_area_ratio, None),
+                    "bbox_min_side_ratio": (gates.min_pose_bbox_min_side_ratio, None),
+                }
+            )
+
+        def _num(v: float) -> float | None:
+            return None if np.isnan(v) else round(v, 6)
+
+        return {"precheck": _num(pre), "pose": _num(pose), "combined": _num(pre * pose)}
+
+
+def load_snapshots(paths: Iterable[str | Path]) -> list[dict]:
+    """Telemetry JSON snapshots from files and/or directories (*.json); unreadable files are skipped."""
+    out: list[dict] = []
+    for p in map(Path, paths):
+        files = sorted(p.glob("*.json")) if p.is_dir() else [p]
+        for f in files:
+            try:
+                out.append(json.loads(f.read_text(encoding="utf-8")))
+            except (OSError, json.JSONDecodeError):
+                continue
+    return out
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bodyfat_model import BodyFatModel
+from .estimator import estimate_body_fat_percent_batch, metadata_columns
+from .pose import PoseLandmarks
+from .schemas import SubjectMetadata
+
+
+@dataclass(frozen=True, slots=True)
+class JitterBand:
+    """Empirical BF% quantiles under landmark jitter."""
+
+    low_percent: float
+    median_percent: float
+    high_percent: float
+    samples: int
+    elapsed_ms: float
+    truncated: bool  # stopped by the time budget before `max_samples`
+
+
+def jitter_scale(visibility: np.ndarray | None, sigma: float, num_landmarks: int) -> np.ndarray:
+    """(L,) per-landmark noise std in normalized coordinates.
+
+    `sigma` for a fully visible landmark, up to 3 * `sigma` for an invisible one
+    (or for every landmark when visibility is unknown).
+    """
+    if visibility is None:
+        return np.full(num_landmarks, 3.0 * sigma, dtype=np.float32)
+    vis = np.clip(np.asarray(visibility, dtype=np.float32), 0.0, 1.0)
+    return (sigma * (1.0 + 2.0 * (1.0 - vis))).astype(np.float32)
+
+
+def jitter_uncertainty(
+    pose: PoseLandmarks,
+    meta: SubjectMetadata,
+    model: BodyFatModel | None = None,
+    max_samples: int = 256,
+    budget_ms: float = 5.0,
+    sigma: float = 0.01,
+    quantiles: tuple[float, float] = (0.1, 0.9),
+    chunk: int = 64,
+    rng: np.random.Generator | None = None,
+) -> JitterBand:
+    """BF% band from K jittered copies of `pose`, scored by the batch estimator.
+
+    Samples are drawn and scored `chunk` poses at a time (one vectorized
+    `estimate_body_fat_percent_batch` call each). Scoring stops at `max_samples`
+    or before the next chunk would exceed `budget_ms`; the first chunk always runs.
+    """
+    t0 = time.perf_counter()
+    rng = rng or np.random.default_rng()
+    xy = np.asarray(pose.xy, dtype=np.float32)
+    n_lm = xy.shape[0]
+    scale = jitter_scale(pose.visibility, sigma, n_lm)[None, :, None]
+    vis = None if pose.visibility is None else np.broadcast_to(pose.visibility, (chunk, n_lm))
+    cols = {k: np.repeat(v, chunk) for k, v in metadata_columns([meta]).items()}
+
+    scores: list[np.ndarray] = []
+    done = 0
+    budget_s = budget_ms / 1000.0
+    truncated = False
+    while done < max_samples:
+        c = min(chunk, max_samples - done)
+        noise = rng.standard_normal((c, n_lm, 2), dtype=np.float32)
+        noise *= scale
+        noise += xy
+        out = estimate_body_fat_percent_batch(
+            noise,
+            None if vis is None else vis[:c],
+            **{k: v[:c] for k, v in cols.items()},
+            model=model,
+        )
+        scores.append(out.body_fat_percent)
+        done += c
+        elapsed = time.perf_counter() - t0
+        # Assume the next chunk costs what the chunks so far cost on average.
+        if done < max_samples and elapsed * (done + chunk) / done > budget_s:
+            truncated = True
+            break
+
+    bf = np.concatenate(scores)
+    low, median, high = np.quantile(bf, [quantiles[0], 0.5, quantiles[1]])
+    return JitterBand(
+        low_percent=float(low),
+        median_percent=float(median),
+        high_percent=float(high),
+        samples=int(bf.size),
+        elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+        truncated=truncated,
+    )
@@ -0,0 +1,99 @@
+"""Microbenchmark: quality metrics backends (numpy reference vs OpenCV).
+
+Both backends compute the same metrics (float32 luma, 4-neighbour Laplacian with
+wrap-around borders); this reports latency per frame size and the numeric drift
+between them, so switching backends cannot move a gate verdict unnoticed.
+
+Outputs:
+- reports/bench_quality_backends.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/bench_quality_backends.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator import quality
+from bodycomp_estimator.quality import QualityReport, set_metrics_backend
+
+SIZES = [(480, 640), (1080, 1920), (3000, 4000)]
+
+
+def timed(image: np.ndarray, repeats: int) -> tuple[float, QualityReport]:
+    report = QualityReport.compute(image)  # warm-up (scratch pool, OpenCV threads)
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        report = QualityReport.compute(image)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), report
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeats", type=int, default=7)
+    ap.add_argument("--out-md", default="reports/bench_quality_backends.md")
+    args = ap.parse_args()
+
+    try:
+        import cv2
+    except ImportError:
+        raise SystemExit("OpenCV not installed: only the numpy backend is available") from None
+
+    rng = np.random.default_rng(0)
+    lines = [
+        "# Benchmark — quality metrics backends",
+        "",
+        f"OpenCV {cv2.__version__}, {cv2.getNumThreads()} thread(s); median of {args.repeats} runs.",
+        "",
+        "| frame | numpy | opencv | speedup | auto uses | brightness rel. diff | lap_var rel. diff |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    previous = set_metrics_backend("numpy")
+    try:
+        for h, w in SIZES:
+            image = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+            set_metrics_backend("numpy")
+            t_np, r_np = timed(image, args.repeats)
+            set_metrics_backend("opencv")
+            t_cv, r_cv = timed(image, args.repeats)
+            db = abs(r_cv.brightness_L_mean - r_np.brightness_L_mean) / r_np.brightness_L_mean
+            dl = abs(r_cv.lap_var - r_np.lap_var) / r_np.lap_var
+            set_metrics_backend("auto")
+            auto = quality._BACKEND.for_frame(h, w).name
+            lines.append(
+                f"| {w}x{h} | {t_np * 1000:.1f} ms | {t_cv * 1000:.1f} ms | {t_np / t_cv:.2f}x | {auto} "
+                f"| {db:.1e} | {dl:.1e} |"
+            )
+    finally:
+        set_metrics_backend(previous)
+
+    lines += [
+        "",
+        "- Backend is chosen at import (`BODYCOMP_QUALITY_BACKEND=auto|numpy|opencv`, default auto).",
+        f"- auto: numpy below {quality._OPENCV_MIN_PIXELS / 1e6:.2g} MP (live/video frames, where OpenCV's",
+        "  per-call overhead dominates), OpenCV from there up (photo uploads).",
+        "- Drift is float32 rounding only; parity is enforced in backend/tests/test_quality.py.",
+        "",
+        "Reproduce: `python3 scripts/actions/bench_quality_backends.py`",
+    ]
+    out = REPO / args.out_md
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""Benchmark: compute-once QualityReport vs the legacy two-call gate path.
+
+Legacy path (before QualityReport): `/estimate` called `quality_gate_message` twice
+(pre- and post-pose); each call recomputed `brightness_L_mean` and `laplacian_var`,
+each of those re-ran `_to_gray` (3 float32 channel copies + temporaries) and the
+Laplacian used four `np.roll` full-frame copies.
+
+New path: `QualityReport.compute` once (fused gray + slice-based Laplacian sharing
+two float32 planes), then both gates read the report.
+
+Outputs:
+- reports/bench_quality_report.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/bench_quality_report.py --width 4000 --height 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.quality import QualityReport
+
+
+def _legacy_gray(image_rgb: np.ndarray) -> np.ndarray:
+    r = image_rgb[:, :, 0].astype(np.float32)
+    g = image_rgb[:, :, 1].astype(np.float32)
+    b = image_rgb[:, :, 2].astype(np.float32)
+    return (0.299 * r + 0.587 * g + 0.114 * b).astype(np.float32)
+
+
+def _legacy_gate(image_rgb: np.ndarray) -> tuple[float, float]:
+    b = float(_legacy_gray(image_rgb).mean())
+    c = _legacy_gray(image_rgb)
+    lap = -4.0 * c + np.roll(c, 1, axis=0) + np.roll(c, -1, axis=0) + np.roll(c, 1, axis=1) + np.roll(c, -1, axis=1)
+    return b, float(lap.var())
+
+
+def legacy_request(image_rgb: np.ndarray) -> None:
+    _legacy_gate(image_rgb)  # pre-pose gate
+    _legacy_gate(image_rgb)  # post-pose gate recomputed everything
+
+
+def new_request(image_rgb: np.ndarray, pose_xy: np.ndarray) -> None:
+    report = QualityReport.compute(image_rgb)
+    report.message()
+    report.message(pose_xy_norm=pose_xy)
+
+
+def measure(fn, repeats: int) -> tuple[float, float]:
+    """(median seconds, peak traced MiB)."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 2**20
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--width", type=int, default=4000)
+    ap.add_argument("--height", type=int, default=3000)
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--out-md", default="reports/bench_quality_report.md")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    pose_xy = rng.uniform(0.2, 0.8, (33, 2)).astype(np.float32)
+
+    b_old, lv_old = _legacy_gate(image)
+    report = QualityReport.compute(image)
+    t_old, m_old = measure(lambda: legacy_request(image), args.repeats)
+    t_new, m_new = measure(lambda: new_request(image, pose_xy), args.repeats)
+
+    mp = args.width * args.height / 1e6
+    lines = [
+        "# Benchmark — QualityReport (compute once) vs legacy gates",
+        "",
+        f"Input: {args.width}x{args.height} RGB uint8 ({mp:.1f} MP), median of {args.repeats} runs.",
+        "",
+        "| path | latency per request | peak traced allocation |",
+        "|---|---|---|",
+        f"| legacy (2x quality_gate_message) | {t_old * 1000:.0f} ms | {m_old:.0f} MiB |",
+        f"| QualityReport (1x compute) | {t_new * 1000:.0f} ms | {m_new:.0f} MiB |",
+        "",
+        f"- Speedup: **{t_old / t_new:.1f}x**; peak allocation **{m_old / m_new:.1f}x** smaller.",
+        f"- Parity: brightness {b_old:.4f} vs {report.brightness_L_mean:.4f}; "
+        f"lap_var {lv_old:.4f} vs {report.lap_var:.4f}.",
+        "",
+        "Reproduce: `python3 scripts/actions/bench_quality_report.py`",
+    ]
+    out = REPO / args.out_md
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""Benchmark: per-response JSON serialization cost and payload size of /estimate.
+
+Legacy path: the handler returned a dict, FastAPI walked it with `jsonable_encoder`
+and Starlette's `JSONResponse` ran `json.dumps`.
+
+New path: the handler returns `FastJSONResponse(payload)`, rendered in one call
+(orjson when installed, else compact `json.dumps`); `compact=true` also drops the
+debug `features`.
+
+Outputs:
+- reports/bench_response_encoding.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/bench_response_encoding.py --repeats 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from backend.app import responses
+from backend.app.main import _estimate_payload
+from bodycomp_estimator.estimator import estimate_body_fat_percent
+from bodycomp_estimator.pose import PoseLandmarks
+from bodycomp_estimator.schemas import SubjectMetadata
+
+
+def _sample_payload(compact: bool) -> dict:
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0.3, 0.7, (33, 2)).astype(np.float32)
+    xy[0], xy[27], xy[28] = [0.5, 0.1], [0.47, 0.95], [0.53, 0.95]
+    pose = PoseLandmarks(xy=xy, visibility=np.ones(33, dtype=np.float32))
+    meta = SubjectMetadata(sex="female", age_years=30, height_cm=165, weight_kg=65)
+    result = estimate_body_fat_percent(pose, meta)
+    payload = _estimate_payload(result, "2026-10-19.1", "heuristic-v0", compact)
+    payload["jitter"] = {"low": 21.0, "median": 23.5, "high": 26.0, "samples": 256, "truncated": False}
+    return payload
+
+
+def measure(fn, repeats: int) -> tuple[float, int]:
+    """(microseconds per response, bytes per response)."""
+    body = fn()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats * 1e6, len(body)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeats", type=int, default=20000)
+    ap.add_argument("--out-md", default="reports/bench_response_encoding.md")
+    args = ap.parse_args()
+
+    full = _sample_payload(compact=False)
+    compact = _sample_payload(compact=True)
+    orjson = responses.orjson
+
+    rows = [("legacy (jsonable_encoder + JSONResponse)", lambda: JSONResponse(jsonable_encoder(full)).body)]
+    rows.append(("FastJSONResponse", lambda: responses.FastJSONResponse(full).body))
+    rows.append(("FastJSONResponse, compact", lambda: responses.FastJSONResponse(compact).body))
+    if orjson is not None:
+        # What the fast path costs on deployments without orjson.
+        def stdlib(payload: dict) -> bytes:
+            responses.orjson = None
+            try:
+                return responses.FastJSONResponse(payload).body
+            finally:
+                responses.orjson = orjson
+
+        rows.insert(1, ("FastJSONResponse, stdlib fallback", lambda: stdlib(full)))
+
+    results = [(name, *measure(fn, args.repeats)) for name, fn in rows]
+    base_us, base_bytes = results[0][1], results[0][2]
+
+    lines = [
+        "# Benchmark — /estimate response serialization",
+        "",
+        f"- Payload: one estimate with {len(full['features'])} features, notes and a jitter band.",
+        f"- orjson installed: {'yes (' + orjson.__version__ + ')' if orjson is not None else 'no'}",
+        f"- Mean of {args.repeats} renders per path (model/handler work excluded).",
+        "",
+        "| path | µs / response | speedup | bytes | size |",
+        "|---|---|---|---|---|",
+    ]
+    for name, us, size in results:
+        lines.append(f"| {name} | {us:.1f} | {base_us / us:.1f}x | {size} | {size / base_bytes:.0%} |")
+
+    out = REPO / args.out_md
+    lines += ["", "Artifacts:", f"- {out.relative_to(REPO)}"]
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
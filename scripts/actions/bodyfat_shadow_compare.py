@@ -0,0 +1,100 @@
+"""Shadow comparison of body-fat model versions on stored landmarks.
+
+Goal:
+- Try a refit coefficient/tree artifact without touching the estimator code.
+- Every version is scored on the same poses in one feature pass (no pose
+  inference, no repeated landmark math), and compared against the first model.
+
+Inputs:
+- --store: a LandmarkStore directory (see landmark_store.py)
+- --models: body-fat model JSON files; "builtin" = the hand-tuned coefficients
+- --sex/--age/--height/--weight: metadata applied to every pose (COCO has none)
+
+Outputs:
+- reports/bodyfat_shadow_compare.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/bodyfat_shadow_compare.py --store data/landmarks/coco_val \
+      --models builtin data/models/bodyfat/refit-2026-10.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.bodyfat_model import HEURISTIC_V0, BodyFatModel, score_versions
+from bodycomp_estimator.landmark_store import LandmarkStore
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--store", required=True)
+    ap.add_argument("--models", nargs="+", default=["builtin"])
+    ap.add_argument("--sex", default="unknown", choices=["female", "male", "unknown"])
+    ap.add_argument("--age", type=float, default=float("nan"))
+    ap.add_argument("--height", type=float, default=float("nan"))
+    ap.add_argument("--weight", type=float, default=float("nan"))
+    ap.add_argument("--out-md", default="reports/bodyfat_shadow_compare.md")
+    args = ap.parse_args()
+
+    models = [
+        BodyFatModel.from_dict(HEURISTIC_V0) if m == "builtin" else BodyFatModel.load(REPO / m)
+        for m in args.models
+    ]
+    batch = LandmarkStore(REPO / args.store).as_batch()
+    n = len(batch)
+    if n == 0:
+        raise SystemExit(f"no poses in {args.store}")
+    meta = {
+        "sex": np.full(n, args.sex, dtype=object),
+        "age_years": np.full(n, args.age),
+        "height_cm": np.full(n, args.height),
+        "weight_kg": np.full(n, args.weight),
+    }
+
+    t0 = time.perf_counter()
+    scores = score_versions(batch, meta, models)
+    elapsed = time.perf_counter() - t0
+    ref_version = models[0].version
+    ref = np.clip(scores[ref_version], 3.0, 60.0)
+
+    lines = [
+        "# Body-fat models — shadow comparison",
+        "",
+        f"- Store: {args.store} ({n} poses)",
+        f"- Metadata: sex={args.sex}, age={args.age:g}, height={args.height:g}, weight={args.weight:g}",
+        f"- Scoring time, all versions: {elapsed * 1000:.1f} ms",
+        "",
+        f"Differences are against `{ref_version}`, after the estimator's 3..60 clamp.",
+        "",
+        "| version | mean | p05 | p50 | p95 | mean abs diff | p95 abs diff |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for version, raw in scores.items():
+        bf = np.clip(raw, 3.0, 60.0)
+        diff = np.abs(bf - ref)
+        p05, p50, p95 = np.percentile(bf, [5, 50, 95])
+        lines.append(
+            f"| {version} | {bf.mean():.2f} | {p05:.2f} | {p50:.2f} | {p95:.2f} | "
+            f"{diff.mean():.2f} | {np.percentile(diff, 95):.2f} |"
+        )
+
+    out = REPO / args.out_md
+    lines += ["", "Artifacts:", f"- {out.relative_to(REPO)}"]
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""Features + body-fat estimates from COCO ground-truth keypoints (no pose inference).
+
+Goal:
+- Dataset-scale analysis of `compute_features` / the estimator without running
+  MediaPipe: the 17 human-labeled COCO keypoints are mapped into the MediaPipe
+  33-landmark layout (`bodycomp_estimator.coco`) and scored in one vectorized
+  batch call.
+- The output is a "perfect pose" baseline to compare MediaPipe runs against.
+
+Inputs:
+- --split / --ann: COCO person_keypoints_<split>2017.json
+- --sex/--age/--height/--weight: metadata applied to every person (COCO has none)
+- --model: optional body-fat model JSON (default: the built-in coefficients)
+
+Outputs:
+- reports/coco_<split>2017_keypoints_baseline.md
+- optional --out-npz: per-person ann_id/image_id, features and estimates
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/coco_keypoints_baseline.py --split train \
+      --out-npz data/baselines/coco_train2017_keypoints.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.bodyfat_model import BodyFatModel
+from bodycomp_estimator.coco import coco_to_pose_batch, complete_mask, load_coco_persons
+from bodycomp_estimator.estimator import estimate_body_fat_percent_batch
+
+
+def _pct_row(name: str, v: np.ndarray) -> str:
+    p05, p50, p95 = np.percentile(v, [5, 50, 95])
+    return f"| {name} | {v.mean():.4f} | {p05:.4f} | {p50:.4f} | {p95:.4f} |"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--split", choices=["train", "val"], default="val")
+    ap.add_argument("--ann", default="", help="Annotation JSON (default: inferred from --split)")
+    ap.add_argument("--sex", default="unknown", choices=["female", "male", "unknown"])
+    ap.add_argument("--age", type=float, default=float("nan"))
+    ap.add_argument("--height", type=float, default=float("nan"))
+    ap.add_argument("--weight", type=float, default=float("nan"))
+    ap.add_argument("--model", default="", help="Body-fat model JSON (default: built-in coefficients)")
+    ap.add_argument("--out-npz", default="")
+    ap.add_argument("--out-md", default="")
+    args = ap.parse_args()
+
+    ann = args.ann or f"data/datasets/coco2017/annotations/person_keypoints_{args.split}2017.json"
+    out = REPO / (args.out_md or f"reports/coco_{args.split}2017_keypoints_baseline.md")
+    model = BodyFatModel.load(REPO / args.model) if args.model else None
+
+    t0 = time.perf_counter()
+    persons = load_coco_persons(REPO / ann)
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    keep = complete_mask(persons.keypoints)
+    batch = coco_to_pose_batch(persons.keypoints[keep], persons.image_wh[keep], ids=persons.ann_ids[keep])
+    n = len(batch)
+    t_convert = time.perf_counter() - t0
+    if n == 0:
+        raise SystemExit(f"no person with the feature keypoints labeled in {ann}")
+
+    t0 = time.perf_counter()
+    est = estimate_body_fat_percent_batch(
+        batch.xy,
+        batch.visibility,
+        sex=np.full(n, args.sex, dtype=object),
+        age_years=np.full(n, args.age),
+        height_cm=np.full(n, args.height),
+        weight_kg=np.full(n, args.weight),
+        model=model,
+    )
+    t_score = time.perf_counter() - t0
+
+    lines = [
+        f"# COCO {args.split}2017 — estimator on ground-truth keypoints",
+        "",
+        f"- Annotations: {ann}",
+        f"- Persons: {len(persons)}; with every feature keypoint labeled: {n} ({n / max(len(persons), 1):.1%})",
+        f"- Metadata: sex={args.sex}, age={args.age:g}, height={args.height:g}, weight={args.weight:g}",
+        f"- Model: {model.version if model else 'built-in coefficients'}",
+        f"- Load JSON: {t_load:.2f} s; map keypoints: {t_convert * 1000:.0f} ms; "
+        f"features + estimates: {t_score * 1000:.0f} ms ({n / max(t_score, 1e-9):,.0f} persons/s)",
+        "",
+        "| value | mean | p05 | p50 | p95 |",
+        "|---|---|---|---|---|",
+    ]
+    for name, v in est.features.items():
+        lines.append(_pct_row(name, v))
+    lines += [
+        _pct_row("body_fat_percent", est.body_fat_percent),
+        _pct_row("confidence", est.confidence),
+        _pct_row("range width", est.high_percent - est.low_percent),
+    ]
+
+    artifacts = [out]
+    if args.out_npz:
+        npz = REPO / args.out_npz
+        npz.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            npz,
+            ann_id=batch.ids,
+            image_id=persons.image_ids[keep],
+            body_fat_percent=est.body_fat_percent,
+            low_percent=est.low_percent,
+            high_percent=est.high_percent,
+            confidence=est.confidence,
+            **{f"feature_{k}": v for k, v in est.features.items()},
+        )
+        artifacts.append(npz)
+
+    lines += ["", "Artifacts:", *(f"- {p.relative_to(REPO)}" for p in artifacts)]
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+"""Mosaic (tiled) multi-ROI pose inference vs per-crop inference on COCO ROIs.
+
+Goal:
+- COCO images often contain several persons. Instead of one MediaPipe call per ROI
+  crop, pack K letterboxed crops into one canvas, run a single detection with
+  num_poses=K, and map each pose back to its tile (crop-normalized coordinates).
+- Measure throughput gain and agreement with per-crop inference.
+
+Inputs:
+- reports/coco_val2017_roi_from_keypoints.jsonl (file, roi_xywh)
+
+Outputs:
+- reports/coco_val2017_pose_mosaic_vs_crop.jsonl
+- reports/coco_val2017_pose_mosaic_vs_crop.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/coco_roi_mosaic_pose.py --n 400 --tiles 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.features import (
+    LEFT_ANKLE,
+    LEFT_HIP,
+    LEFT_SHOULDER,
+    NOSE,
+    RIGHT_ANKLE,
+    RIGHT_HIP,
+    RIGHT_SHOULDER,
+)
+from bodycomp_estimator.image_loader import prefetch, read_image
+from bodycomp_estimator.mosaic import assign_poses_to_tiles, pack_mosaic
+from bodycomp_estimator.pose import PoseExtractor
+
+KEY_IDS = [NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_ANKLE, RIGHT_ANKLE]
+
+
+def load_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def resolve_img_path(fn: str) -> Path:
+    coco_val = REPO / "data" / "datasets" / "coco2017" / "val2017"
+    if "/" in fn:
+        return (REPO / fn).resolve()
+    return coco_val / fn
+
+
+def clamp_bbox(xywh, w_img: int, h_img: int):
+    x, y, w, h = xywh
+    x0 = max(0, int(math.floor(x)))
+    y0 = max(0, int(math.floor(y)))
+    x1 = min(w_img, int(math.ceil(x + w)))
+    y1 = min(h_img, int(math.ceil(y + h)))
+    return x0, y0, x1, y1
+
+
+def load_crops(sample: list[dict]) -> list[tuple[dict, np.ndarray]]:
+    """Read each image once and cut all of its ROIs (rows are grouped by file).
+
+    Images are decoded ahead on background threads.
+    """
+    rows = [
+        (r.get("file") or r.get("file_name"), r.get("roi_xywh") or r.get("bbox_xywh") or r.get("bbox"))
+        for r in sample
+    ]
+    files: list[str] = []
+    for fn, roi in rows:
+        if fn and roi and (not files or files[-1] != fn):
+            files.append(fn)
+    loaded = prefetch(lambda fn: read_image(resolve_img_path(fn)), files)
+
+    out: list[tuple[dict, np.ndarray]] = []
+    last_fn: str | None = None
+    rgb: np.ndarray | None = None
+    for fn, roi in rows:
+        if not fn or not roi:
+            continue
+        if fn != last_fn:
+            _, rgb = next(loaded)
+            last_fn = fn
+        if rgb is None:
+            continue
+        x0, y0, x1, y1 = clamp_bbox(roi, rgb.shape[1], rgb.shape[0])
+        crop = rgb[y0:y1, x0:x1]
+        if crop.size:
+            out.append(({"file": fn, "roi": roi}, np.ascontiguousarray(crop)))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--roi-jsonl", default="reports/coco_val2017_roi_from_keypoints.jsonl")
+    ap.add_argument("--n", type=int, default=400)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--tiles", type=int, default=4, help="ROIs per mosaic (num_poses)")
+    ap.add_argument("--tile-size", type=int, default=256)
+    ap.add_argument("--out-stem", default="coco_val2017_pose_mosaic_vs_crop")
+    args = ap.parse_args()
+
+    rows = load_jsonl((REPO / args.roi_jsonl).resolve())
+    random.seed(args.seed)
+    sample = random.sample(rows, k=min(args.n, len(rows)))
+    # Group by image so multi-person images share a read and tend to share a mosaic.
+    sample.sort(key=lambda r: str(r.get("file") or r.get("file_name") or ""))
+
+    crops = load_crops(sample)
+    if not crops:
+        raise SystemExit("no readable ROI crops")
+
+    # Per-crop baseline.
+    single = PoseExtractor(static_image_mode=True)
+    t0 = time.perf_counter()
+    per_crop = [single.extract(crop) for _, crop in crops]
+    t_crop = time.perf_counter() - t0
+    single.close()
+
+    # Mosaic: one detection per group of `tiles` crops.
+    multi = PoseExtractor(static_image_mode=True, num_poses=args.tiles)
+    t0 = time.perf_counter()
+    mosaic: list = []
+    for i in range(0, len(crops), args.tiles):
+        group = [c for _, c in crops[i : i + args.tiles]]
+        canvas, tiles = pack_mosaic(group, tile_size=args.tile_size)
+        mosaic.extend(assign_poses_to_tiles(multi.extract_all(canvas), canvas.shape[:2], tiles))
+    t_mosaic = time.perf_counter() - t0
+    multi.close()
+
+    out_jsonl = REPO / "reports" / f"{args.out_stem}.jsonl"
+    out_md = REPO / "reports" / f"{args.out_stem}.md"
+    out_jsonl.parent.mkdir(parents=True, exist_ok=True)
+
+    agree = both_ok = crop_only = mosaic_only = 0
+    dists: list[float] = []
+    with out_jsonl.open("w", encoding="utf-8") as f:
+        for (rec, _), pc, pm in zip(crops, per_crop, mosaic, strict=True):
+            rec = dict(rec)
+            rec["crop_status"] = "ok" if pc is not None else "no_pose"
+            rec["mosaic_status"] = "ok" if pm is not None else "no_pose"
+            agree += rec["crop_status"] == rec["mosaic_status"]
+            if pc is not None and pm is not None:
+                both_ok += 1
+                d = float(np.linalg.norm(pc.xy[KEY_IDS] - pm.xy[KEY_IDS], axis=-1).mean())
+                rec["key_landmark_dist"] = d
+                dists.append(d)
+            elif pc is not None:
+                crop_only += 1
+            elif pm is not None:
+                mosaic_only += 1
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    n = len(crops)
+    lines = [
+        "# COCO val2017 — Pose: mosaic (tiled) vs per-crop",
+        "",
+        f"- ROI crops: {n}",
+        f"- Tiles per mosaic: {args.tiles} (tile size {args.tile_size}px)",
+        "",
+        "## Throughput",
+        f"- Per-crop: {t_crop:.2f}s ({n / max(t_crop, 1e-9):.1f} ROI/s)",
+        f"- Mosaic: {t_mosaic:.2f}s ({n / max(t_mosaic, 1e-9):.1f} ROI/s)",
+        f"- Speedup: {t_crop / max(t_mosaic, 1e-9):.2f}x",
+        "",
+        "## Agreement with per-crop inference",
+        f"- Same status (ok/no_pose): {agree}/{n} ({agree / n:.1%})",
+        f"- Both ok: {both_ok}",
+        f"- Per-crop ok only: {crop_only}",
+        f"- Mosaic ok only: {mosaic_only}",
+    ]
+    if dists:
+        lines.append(
+            f"- Key-landmark distance (crop-normalized, both ok): mean {np.mean(dists):.4f}, "
+            f"p90 {np.percentile(dists, 90):.4f}"
+        )
+    lines += ["", "Artifacts:", f"- {out_jsonl.relative_to(REPO)}", f"- {out_md.relative_to(REPO)}"]
+    out_md.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out_md.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,19 +7,24 @@ Outputs:
 - reports/coco_val2017_pose_roi_vs_full.md
 - reports/coco_val2017_pose_on_full_from_roi_sample.jsonl
 
+Full-image poses are persisted in data/landmark_store/coco_val2017 (shared with the
+worker), so reruns only run MediaPipe on images not seen before. `--workers N` runs
+those images on N processes (one PoseExtractor each); only this process writes the
+store, and the outputs are identical to `--workers 1`.
+
 Run:
   . .venv/bin/activate
-  python3 scripts/actions/compare_pose_roi_vs_full.py
+  python3 scripts/actions/compare_pose_roi_vs_full.py --workers 4
 """
 
 from __future__ import annotations
 
+import argparse
+import functools
 import json
 from collections import Counter, defaultdict
 from pathlib import Path
 
-import cv2
-
 REPO = Path(__file__).resolve().parents[2]
 
 # Allow running as a script without installing the package.
@@ -39,8 +44,32 @@ def resolve_img_path(fn: str) -> Path:
     return coco_val / fn
 
 
+def extract_full(extractor, files: list[str]):
+    """Full-image pose per file: {"file", "status", "landmarks" (packed rows or None)}."""
+    from bodycomp_estimator.image_loader import iter_images
+    from bodycomp_estimator.landmark_store import pack_pose
+
+    # Decoding runs ahead on background threads while this thread runs pose.
+    for fn, rgb in zip(files, iter_images([resolve_img_path(fn) for fn in files]), strict=True):
+        if rgb is None:
+            yield {"file": fn, "status": "read_fail", "landmarks": None}
+            continue
+        pose = extractor.extract(rgb)
+        yield {
+            "file": fn,
+            "status": "ok" if pose is not None else "no_pose",
+            "landmarks": None if pose is None else pack_pose(pose).tolist(),
+        }
+
+
 def main() -> int:
+    from bodycomp_estimator.landmark_store import LandmarkKey, LandmarkStore, unpack_pose
     from bodycomp_estimator.pose import PoseExtractor
+    from bodycomp_estimator.sharding import run_sharded
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (sharded run)")
+    args = ap.parse_args()
 
     roi_jsonl = REPO / "reports" / "coco_val2017_pose_on_roi_sample.jsonl"
     if not roi_jsonl.exists():
@@ -49,7 +78,9 @@ def main() -> int:
     rows = load_jsonl(roi_jsonl)
     # Keep order; compare per-row. Some files can repeat with different bboxes.
 
+    # Built lazily by each worker; here only its `model_id` is needed.
     extractor = PoseExtractor(static_image_mode=True)
+    store = LandmarkStore(REPO / "data" / "landmark_store" / "coco_val2017")
 
     out_full_jsonl = REPO / "reports" / "coco_val2017_pose_on_full_from_roi_sample.jsonl"
     out_md = REPO / "reports" / "coco_val2017_pose_roi_vs_full.md"
@@ -61,28 +92,35 @@ def main() -> int:
     ex_roi_ok_full_no: list[dict] = []
     ex_roi_no_full_ok: list[dict] = []
 
-    # Cache full-image inference by file to reduce repeats.
+    # Full-image status per file: from the store, else one inference per file.
     full_cache: dict[str, str] = {}
+    todo: list[str] = []
+    for r in rows:
+        fn = r.get("file")
+        if not fn or fn in full_cache:
+            continue
+        stored = store.status(LandmarkKey.from_roi(fn, None, model=extractor.model_id))
+        if stored is not None:
+            full_cache[fn] = stored
+        else:
+            todo.append(fn)
+            full_cache[fn] = ""  # filled below; keeps first-seen order
+
+    init = functools.partial(PoseExtractor, static_image_mode=True)
+    keys, poses = [], []
+    for rec in run_sharded(todo, extract_full, init=init, workers=args.workers):
+        fn = rec["file"]
+        full_cache[fn] = rec["status"]
+        if rec["status"] != "read_fail":
+            keys.append(LandmarkKey.from_roi(fn, None, model=extractor.model_id))
+            poses.append(None if rec["landmarks"] is None else unpack_pose(rec["landmarks"]))
+    store.put_many(keys, poses)
 
     with out_full_jsonl.open("w", encoding="utf-8") as f:
         for r in rows:
             fn = r.get("file")
             roi_status = r.get("status")
-            if not fn:
-                full_status = "missing_file_name"
-            else:
-                if fn in full_cache:
-                    full_status = full_cache[fn]
-                else:
-                    img_path = resolve_img_path(fn)
-                    bgr = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
-                    if bgr is None:
-                        full_status = "read_fail"
-                    else:
-                        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-                        pose = extractor.extract(rgb)
-                        full_status = "ok" if pose is not None else "no_pose"
-                    full_cache[fn] = full_status
+            full_status = full_cache[fn] if fn else "missing_file_name"
 
             status_pairs[(roi_status, full_status)] += 1
             full_status_counts[full_status] += 1
@@ -100,11 +138,6 @@ def main() -> int:
 
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
-    try:
-        extractor.close()
-    except Exception:
-        pass
-
     # Summaries
     roi_counts = Counter(r.get("status") for r in rows)
     n = len(rows)
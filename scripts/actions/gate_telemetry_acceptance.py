@@ -0,0 +1,123 @@
+"""Acceptance rates for candidate quality thresholds from live gate telemetry.
+
+Goal:
+- `QualityGates` defaults were tuned offline on COCO; production photos differ.
+- The API keeps fixed-memory histograms of the gate metrics (`GET /telemetry/gates`,
+  or per-worker dumps in BODYCOMP_TELEMETRY_DIR). This merges them and reports the
+  acceptance rate each candidate threshold would have had, without any photo.
+
+Inputs (any mix):
+- --snapshots: telemetry JSON files and/or directories of dumps
+- --url: a running API (fetches /telemetry/gates)
+
+Outputs:
+- reports/gate_telemetry_acceptance.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/gate_telemetry_acceptance.py --url http://localhost:8000 \
+      --min-lap-var 40,60,80,100 --min-brightness 45,55,65
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import urllib.request
+from dataclasses import replace
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.quality import QualityGates
+from bodycomp_estimator.telemetry import GateTelemetry, load_snapshots, quantile_from_counts
+
+
+def floats(s: str) -> list[float]:
+    return [float(v) for v in s.split(",") if v.strip()]
+
+
+def pct(v: float | None) -> str:
+    return "n/a" if v is None else f"{v:.1%}"
+
+
+def main() -> int:
+    d = QualityGates()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--snapshots", nargs="*", default=[])
+    ap.add_argument("--url", default="")
+    ap.add_argument("--min-brightness", default=f"{d.min_brightness_L_mean:g}")
+    ap.add_argument("--max-brightness", default=f"{d.max_brightness_L_mean:g}")
+    ap.add_argument("--min-lap-var", default="30,45,60,80,100,150")
+    ap.add_argument("--min-area", default="0.03,0.05,0.08")
+    ap.add_argument("--min-side", default="0.2,0.28,0.35")
+    ap.add_argument("--out-md", default="reports/gate_telemetry_acceptance.md")
+    args = ap.parse_args()
+
+    snapshots = load_snapshots([(REPO / p).resolve() for p in args.snapshots])
+    if args.url:
+        with urllib.request.urlopen(args.url.rstrip("/") + "/telemetry/gates", timeout=10) as resp:
+            snapshots.append(json.loads(resp.read().decode("utf-8")))
+    if not snapshots:
+        raise SystemExit("no telemetry snapshots (use --snapshots and/or --url)")
+    t = GateTelemetry.merged(snapshots)
+
+    lines = [
+        "# Quality gates — acceptance from live telemetry",
+        "",
+        f"- Snapshots merged: {len(snapshots)}",
+        f"- Photos (precheck): {t.precheck.total}; with pose: {t.pose.total}",
+        "",
+        "## Metric quantiles",
+        "",
+        "| metric | p05 | p25 | p50 | p75 | p95 |",
+        "|---|---|---|---|---|---|",
+    ]
+    for hist in (t.precheck, t.pose):
+        for axis in (hist.x, hist.y):
+            qs = [quantile_from_counts(axis.edges(), hist.marginal(axis.name), q) for q in (0.05, 0.25, 0.5, 0.75, 0.95)]
+            lines.append(f"| {axis.name} | " + " | ".join(f"{q:.3g}" for q in qs) + " |")
+
+    current = t.acceptance(d)
+    lines += [
+        "",
+        f"Current defaults: precheck {pct(current['precheck'])}, pose {pct(current['pose'])}, "
+        f"combined {pct(current['combined'])}.",
+        "",
+        "## Precheck candidates (brightness window + blur)",
+        "",
+        "| min_brightness | max_brightness | min_lap_var | acceptance |",
+        "|---|---|---|---|",
+    ]
+    for bmin, bmax, lv in itertools.product(
+        floats(args.min_brightness), floats(args.max_brightness), floats(args.min_lap_var)
+    ):
+        g = replace(d, min_brightness_L_mean=bmin, max_brightness_L_mean=bmax, min_lap_var=lv)
+        lines.append(f"| {bmin:g} | {bmax:g} | {lv:g} | {pct(t.acceptance(g)['precheck'])} |")
+
+    lines += [
+        "",
+        "## Pose bbox candidates",
+        "",
+        "Only photos that passed the live precheck and had a pose are in this histogram.",
+        "",
+        "| min_area_ratio | min_side_ratio | acceptance |",
+        "|---|---|---|",
+    ]
+    for area, side in itertools.product(floats(args.min_area), floats(args.min_side)):
+        g = replace(d, min_pose_bbox_area_ratio=area, min_pose_bbox_min_side_ratio=side)
+        lines.append(f"| {area:g} | {side:g} | {pct(t.acceptance(g)['pose'])} |")
+
+    out = REPO / args.out_md
+    lines += ["", "Artifacts:", f"- {out.relative_to(REPO)}"]
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""Load test: process RSS of the quality gates under concurrency, strips vs scratch pool budgets.
+
+Simulates `/estimate` traffic on the gate path only: W worker threads (the API runs
+gates in the threadpool) each compute `QualityReport` + both messages for a stream
+of phone-sized RGB frames. A sampler thread reads VmRSS from /proc/self/status.
+
+Modes (each runs in its own subprocess so none inherits another's heap):
+- legacy: previous behaviour, two fresh full-frame float32 planes per request
+- strips: strip-wise metrics with the scratch pool disabled (fresh strip planes)
+- pooled: strip-wise metrics + the default per-thread pool budget (small frames only)
+- pooled32: strip-wise metrics + a 32 MiB per-thread pool (strip planes kept resident)
+
+Outputs:
+- reports/loadtest_quality_rss.md
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/loadtest_quality_rss.py --workers 8 --requests 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator import quality
+from bodycomp_estimator.quality import QualityReport
+
+SIZES = [(3000, 4000), (1920, 1080), (1280, 720), (4000, 3000)]
+DEFAULT_POOL_BYTES = quality._SCRATCH.max_bytes
+# Per-thread pool budget of each mode.
+MODES = {"legacy": 0, "strips": 0, "pooled": DEFAULT_POOL_BYTES, "pooled32": 32 * 2**20}
+
+
+def rss_mib() -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _legacy_gray_metrics(image_rgb: np.ndarray) -> tuple[float, float]:
+    buf = np.empty(image_rgb.shape[:2], dtype=np.float32)
+    gray = quality._to_gray(image_rgb, scratch=buf)
+    brightness = float(gray.mean())
+    return brightness, quality._var_inplace(quality._laplacian(gray, out=buf))
+
+
+def run(frames: list[np.ndarray], workers: int, requests: int, mode: str) -> dict[str, float]:
+    quality.set_scratch_pool_limit(MODES[mode])
+    if mode == "legacy":
+        quality._gray_metrics = _legacy_gray_metrics
+    pose_xy = np.random.default_rng(0).uniform(0.2, 0.8, (33, 2)).astype(np.float32)
+
+    def request(i: int) -> None:
+        report = QualityReport.compute(frames[i % len(frames)])
+        report.message()
+        report.message(pose_xy_norm=pose_xy)
+
+    samples: list[float] = []
+    stop = threading.Event()
+
+    def sampler() -> None:
+        while not stop.is_set():
+            samples.append(rss_mib())
+            time.sleep(0.005)
+
+    base = rss_mib()
+    th = threading.Thread(target=sampler, daemon=True)
+    th.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(request, range(requests)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    th.join()
+
+    tail = samples[len(samples) // 2 :] or [base]
+    return {
+        "base": base,
+        "peak": max(samples, default=base),
+        "steady": statistics.median(tail),
+        "rps": requests / elapsed,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--out-md", default="reports/loadtest_quality_rss.md")
+    ap.add_argument("--mode", choices=MODES, default=None, help=argparse.SUPPRESS)  # child process
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for h, w in SIZES]
+    frames_mib = sum(f.nbytes for f in frames) / 2**20
+
+    if args.mode is not None:
+        run(frames, 1, len(frames), args.mode)  # warm-up
+        print(json.dumps(run(frames, args.workers, args.requests, args.mode)))
+        return 0
+
+    def child(mode: str) -> dict[str, float]:
+        cmd = [sys.executable, __file__, "--workers", str(args.workers), "--requests", str(args.requests)]
+        out = subprocess.run([*cmd, "--mode", mode], check=True, capture_output=True, text=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    results = {mode: child(mode) for mode in MODES}
+
+    def row(name: str, r: dict[str, float]) -> str:
+        return (
+            f"| {name} | {r['peak'] - r['base']:.0f} MiB | {r['steady'] - r['base']:.0f} MiB | "
+            f"{r['peak']:.0f} MiB | {r['rps']:.1f} |"
+        )
+
+    lines = [
+        "# Load test — quality gates RSS (strip metrics, scratch pool)",
+        "",
+        f"- Workers: {args.workers}, requests: {args.requests}",
+        f"- Frames: {', '.join(f'{w}x{h}' for h, w in SIZES)} (resident inputs {frames_mib:.0f} MiB)",
+        f"- Default pool budget: {DEFAULT_POOL_BYTES / 2**20:.0f} MiB per thread",
+        f"- Metrics backend: {quality.metrics_backend()}",
+        "",
+        "| path | peak RSS over start | steady RSS over start | peak RSS | requests/s |",
+        "|---|---|---|---|---|",
+        row("before: full-frame planes per request", results["legacy"]),
+        row("strips, no pool", results["strips"]),
+        row(f"after: strips + {DEFAULT_POOL_BYTES / 2**20:.0f} MiB pool (default)", results["pooled"]),
+        row("strips + 32 MiB pool (strip planes resident)", results["pooled32"]),
+        "",
+        "Steady = median of the second half of the RSS samples.",
+        "",
+        "- The RSS drop comes from the strip-wise metrics: full-frame planes scale with",
+        "  the upload (96 MiB per in-flight 12 MP request), strips cap gate scratch at",
+        "  ~12 MiB per request regardless of resolution.",
+        "- A pool large enough to hold strip planes makes it worse: every thread pins its",
+        "  planes (up to threads x budget) instead of returning them to the allocator.",
+        "  The default budget only keeps small-frame planes (<= 640x480) warm; strip",
+        "  planes are allocated per request.",
+        "",
+        "Reproduce: `python3 scripts/actions/loadtest_quality_rss.py`",
+    ]
+    out = REPO / args.out_md
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(out.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
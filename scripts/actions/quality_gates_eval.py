@@ -12,25 +12,44 @@ Outputs:
 - reports/quality_eval.jsonl
 - reports/quality_eval.md
 
+Brightness/blur are the API gate metrics (`bodycomp_estimator.quality`: float32 luma
+and the 4-neighbour Laplacian, through the same numpy/OpenCV backend), so offline
+verdicts match what `/estimate` would compute. They are read from per-image
+summed-area tables (planes computed once per image, O(1) per ROI; rows are processed
+grouped by image). `--per-crop` runs `QualityReport.compute` on each crop instead
+(the Laplacian border rule differs on the 1px crop edge only).
+
+Images are decoded (and their tables built) ahead on background threads
+(`bodycomp_estimator.image_loader`) while the gates run on the previous one.
+`--workers N` splits the sample into contiguous shards run on N processes
+(`bodycomp_estimator.sharding`); the outputs are identical to `--workers 1`.
+
 Run:
   . .venv/bin/activate
-  python3 scripts/actions/quality_gates_eval.py --n 1000
+  python3 scripts/actions/quality_gates_eval.py --n 1000 --workers 8
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import math
 import random
+import sys
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 
-import cv2
 import numpy as np
 
 REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.image_loader import prefetch, read_image
+from bodycomp_estimator.quality import QualityReport
+from bodycomp_estimator.regional import RegionalStats
+from bodycomp_estimator.sharding import run_sharded
 
 
 def load_jsonl(path: Path) -> list[dict]:
@@ -55,22 +74,11 @@ def resolve_img_path(fn: str, images_dir: Path | None = None) -> Path:
 class Gates:
     min_side_px: int = 160
     min_area_px: int = 160 * 160
-    min_brightness: float = 60.0  # mean L channel approx
+    min_brightness: float = 60.0  # mean luma (same metric as the API gates)
     max_brightness: float = 215.0
     min_lap_var: float = 80.0  # blur threshold
 
 
-def brightness_score(bgr: np.ndarray) -> float:
-    lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB)
-    L = lab[:, :, 0].astype(np.float32)
-    return float(L.mean())
-
-
-def blur_score_laplacian(bgr: np.ndarray) -> float:
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
-
-
 def clamp_bbox(xywh, w_img: int, h_img: int):
     x, y, w, h = xywh
     x0 = max(0, int(math.floor(x)))
@@ -80,6 +88,86 @@ def clamp_bbox(xywh, w_img: int, h_img: int):
     return x0, y0, x1, y1
 
 
+def row_input(r: dict):
+    # Support multiple ROI list formats produced during development.
+    fn = r.get("file") or r.get("file_name")
+    roi = r.get("roi_xywh") or r.get("bbox_xywh") or r.get("bbox") or r.get("roi")
+    return fn, roi
+
+
+def evaluate_rows(_state, rows: list[dict], gates: Gates, images_dir: Path | None, per_crop: bool):
+    """Gate records for `rows`, in order (rows sorted by image share one read)."""
+
+    def load(fn: str) -> tuple[np.ndarray | None, RegionalStats | None]:
+        rgb = read_image(resolve_img_path(fn, images_dir=images_dir))
+        return rgb, RegionalStats.from_image(rgb) if rgb is not None and not per_crop else None
+
+    # One load per run of rows on the same image, in row order.
+    files: list[str] = []
+    for fn, roi in map(row_input, rows):
+        if fn and roi and (not files or files[-1] != fn):
+            files.append(fn)
+    loaded = prefetch(load, files)
+
+    last_fn: str | None = None
+    rgb: np.ndarray | None = None
+    stats: RegionalStats | None = None
+
+    for r in rows:
+        fn, roi = row_input(r)
+        rec = {"file": fn, "roi": roi}
+
+        if not fn or not roi:
+            rec["gate"] = "missing_input"
+            rec["ok"] = False
+            yield rec
+            continue
+
+        if fn != last_fn:
+            _, (rgb, stats) = next(loaded)
+            last_fn = fn
+        if rgb is None:
+            rec["gate"] = "read_fail"
+            rec["ok"] = False
+            yield rec
+            continue
+
+        x0, y0, x1, y1 = clamp_bbox(roi, rgb.shape[1], rgb.shape[0])
+        crop = rgb[y0:y1, x0:x1]
+
+        h, w = crop.shape[:2]
+        area = int(h * w)
+        rec.update({"w": w, "h": h, "area": area})
+
+        if min(w, h) < gates.min_side_px or area < gates.min_area_px:
+            rec["gate"] = "too_small"
+            rec["ok"] = False
+            yield rec
+            continue
+
+        if stats is not None:
+            b_arr, lv_arr = stats.roi_metrics([(x0, y0, x1, y1)])
+            b, lv = float(b_arr[0]), float(lv_arr[0])
+        else:
+            report = QualityReport.compute(crop)
+            b, lv = report.brightness_L_mean, report.lap_var
+        rec.update({"brightness_L_mean": b, "lap_var": lv})
+
+        if b < gates.min_brightness:
+            rec["gate"] = "too_dark"
+            rec["ok"] = False
+        elif b > gates.max_brightness:
+            rec["gate"] = "too_bright"
+            rec["ok"] = False
+        elif lv < gates.min_lap_var:
+            rec["gate"] = "too_blurry"
+            rec["ok"] = False
+        else:
+            rec["gate"] = "ok"
+            rec["ok"] = True
+        yield rec
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--roi-jsonl", default="reports/coco_val2017_roi_from_keypoints.jsonl")
@@ -96,6 +184,8 @@ def main() -> int:
 
     # Output naming (avoid overwriting when sweeping thresholds)
     ap.add_argument("--out-stem", default="quality_eval", help="Writes reports/<out-stem>.jsonl and .md")
+    ap.add_argument("--per-crop", action="store_true", help="Recompute metrics on each crop (legacy path)")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (sharded run)")
 
     args = ap.parse_args()
 
@@ -108,6 +198,8 @@ def main() -> int:
 
     random.seed(args.seed)
     sample = random.sample(rows, k=min(args.n, len(rows)))
+    # Group by image so each image is read (and its tables built) once.
+    sample.sort(key=lambda r: str(r.get("file") or r.get("file_name") or ""))
 
     gates = Gates(
         min_side_px=int(args.min_side_px),
@@ -124,70 +216,14 @@ def main() -> int:
     reasons = Counter()
     status = Counter()
 
+    process = functools.partial(evaluate_rows, gates=gates, images_dir=images_dir, per_crop=args.per_crop)
     with out_jsonl.open("w", encoding="utf-8") as f:
-        for r in sample:
-            # Support multiple ROI list formats produced during development.
-            fn = r.get("file") or r.get("file_name")
-            roi = r.get("roi_xywh") or r.get("bbox_xywh") or r.get("bbox") or r.get("roi")
-            rec = {"file": fn, "roi": roi}
-
-            if not fn or not roi:
-                rec["gate"] = "missing_input"
-                rec["ok"] = False
-                reasons["missing_input"] += 1
-                status["reject"] += 1
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                continue
-
-            img_path = resolve_img_path(fn, images_dir=images_dir)
-            bgr = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
-            if bgr is None:
-                rec["gate"] = "read_fail"
-                rec["ok"] = False
-                reasons["read_fail"] += 1
-                status["reject"] += 1
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                continue
-
-            x0, y0, x1, y1 = clamp_bbox(roi, bgr.shape[1], bgr.shape[0])
-            crop = bgr[y0:y1, x0:x1]
-
-            h, w = crop.shape[:2]
-            area = int(h * w)
-            rec.update({"w": w, "h": h, "area": area})
-
-            if min(w, h) < gates.min_side_px or area < gates.min_area_px:
-                rec["gate"] = "too_small"
-                rec["ok"] = False
-                reasons["too_small"] += 1
-                status["reject"] += 1
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                continue
-
-            b = brightness_score(crop)
-            lv = blur_score_laplacian(crop)
-            rec.update({"brightness_L_mean": b, "lap_var": lv})
-
-            if b < gates.min_brightness:
-                rec["gate"] = "too_dark"
-                rec["ok"] = False
-                reasons["too_dark"] += 1
-                status["reject"] += 1
-            elif b > gates.max_brightness:
-                rec["gate"] = "too_bright"
-                rec["ok"] = False
-                reasons["too_bright"] += 1
-                status["reject"] += 1
-            elif lv < gates.min_lap_var:
-                rec["gate"] = "too_blurry"
-                rec["ok"] = False
-                reasons["too_blurry"] += 1
-                status["reject"] += 1
-            else:
-                rec["gate"] = "ok"
-                rec["ok"] = True
+        for rec in run_sharded(sample, process, workers=args.workers):
+            if rec["ok"]:
                 status["ok"] += 1
-
+            else:
+                reasons[rec["gate"]] += 1
+                status["reject"] += 1
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
     lines = []
@@ -196,7 +232,7 @@ def main() -> int:
     lines.append("\n## Current thresholds\n")
     lines.append(f"- min_side_px: {gates.min_side_px}\n")
     lines.append(f"- min_area_px: {gates.min_area_px}\n")
-    lines.append(f"- brightness L mean: [{gates.min_brightness}, {gates.max_brightness}]\n")
+    lines.append(f"- brightness (luma mean): [{gates.min_brightness}, {gates.max_brightness}]\n")
     lines.append(f"- min_lap_var: {gates.min_lap_var}\n")
     lines.append("\n## Results\n")
     lines.append(f"- ok: **{status['ok']}**\n")
@@ -0,0 +1,158 @@
+"""Calibrate pyramid-level quality gates against full-resolution verdicts.
+
+Goal:
+- `QualityGates.pyramid_max_side` measures brightness/blur on a box-downsampled
+  level. Brightness is preserved by block means; Laplacian variance is not (it
+  rises as fine texture is averaged into fewer, higher-contrast edges), so the blur
+  threshold is rescaled as min_lap_var * factor ** pyramid_lap_exponent.
+- Fit that exponent per factor and measure how often the level verdict
+  (pass / too_dark / too_bright / too_blurry) agrees with the full-resolution one.
+
+Inputs:
+- reports/coco_val2017_roi_from_keypoints.jsonl (file, roi_xywh); full images are used
+
+Outputs:
+- reports/quality_pyramid_calibration.md
+- reports/_plan/quality_pyramid_candidate.json (copy to quality_pyramid_applied.json
+  and update QualityGates once reviewed)
+
+Run:
+  . .venv/bin/activate
+  python3 scripts/actions/quality_pyramid_calibration.py --n 1000 --factors 2,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from bodycomp_estimator.image_loader import iter_images
+from bodycomp_estimator.quality import QualityGates, QualityReport
+
+
+def load_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def resolve_img_path(fn: str) -> Path:
+    coco_val = REPO / "data" / "datasets" / "coco2017" / "val2017"
+    if "/" in fn:
+        return (REPO / fn).resolve()
+    return coco_val / fn
+
+
+def verdict(report: QualityReport, gates: QualityGates) -> str:
+    return report.precheck_reason(gates) or "pass"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--roi-jsonl", default="reports/coco_val2017_roi_from_keypoints.jsonl")
+    ap.add_argument("--n", type=int, default=1000, help="Distinct images to sample")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--factors", default="2,4")
+    ap.add_argument("--exponent-grid", default="0.0:3.0:0.05", help="start:stop:step searched for agreement")
+    ap.add_argument("--out-stem", default="quality_pyramid_calibration")
+    args = ap.parse_args()
+
+    files = sorted({str(r.get("file") or r.get("file_name")) for r in load_jsonl(REPO / args.roi_jsonl)})
+    random.seed(args.seed)
+    files = random.sample(files, k=min(args.n, len(files)))
+    factors = [int(f) for f in args.factors.split(",") if f.strip()]
+    start, stop, step = (float(v) for v in args.exponent_grid.split(":"))
+    grid = np.arange(start, stop + step / 2, step)
+    gates = QualityGates()
+
+    full: list[QualityReport] = []
+    levels: dict[int, list[QualityReport]] = {f: [] for f in factors}
+    # Decoding runs ahead on background threads while the reports are computed.
+    for rgb in iter_images([resolve_img_path(fn) for fn in files]):
+        if rgb is None:
+            continue
+        full.append(QualityReport.compute_at_level(rgb, 1))
+        for f in factors:
+            levels[f].append(QualityReport.compute_at_level(rgb, f))
+    if not full:
+        raise SystemExit("no readable images")
+
+    n = len(full)
+    ref = [verdict(r, gates) for r in full]
+    lines = [
+        "# Quality gates — pyramid level calibration",
+        "",
+        f"- Images: {n} (seed {args.seed})",
+        f"- Gates: brightness [{gates.min_brightness_L_mean}, {gates.max_brightness_L_mean}], "
+        f"min_lap_var {gates.min_lap_var} (full resolution)",
+        f"- Full-resolution verdicts: {dict(Counter(ref))}",
+        "",
+        "| factor | median log-ratio exponent | best exponent | verdict agreement | brightness max abs diff |",
+        "|---|---|---|---|---|",
+    ]
+    candidate: dict[str, dict] = {}
+    for f in factors:
+        lv_full = np.array([r.lap_var for r in full])
+        lv_lvl = np.array([r.lap_var for r in levels[f]])
+        ok = (lv_full > 0) & (lv_lvl > 0)
+        fit = float(np.median(np.log(lv_lvl[ok] / lv_full[ok]) / np.log(f))) if ok.any() else 0.0
+
+        best_e, best_agree = 0.0, -1
+        for e in grid:
+            g = QualityGates(pyramid_lap_exponent=float(e))
+            agree = sum(verdict(r, g) == v for r, v in zip(levels[f], ref, strict=True))
+            if agree > best_agree:
+                best_e, best_agree = float(e), agree
+        db = max(abs(a.brightness_L_mean - b.brightness_L_mean) for a, b in zip(full, levels[f], strict=True))
+        lines.append(f"| {f} | {fit:.2f} | {best_e:.2f} | {best_agree}/{n} ({best_agree / n:.1%}) | {db:.3f} |")
+        candidate[str(f)] = {"median_exponent": round(fit, 3), "best_exponent": round(best_e, 3), "agreement": best_agree / n}
+
+    # One exponent must serve every level: pick the one maximizing total agreement.
+    best_e, best_total = 0.0, -1
+    for e in grid:
+        g = QualityGates(pyramid_lap_exponent=float(e))
+        total = sum(verdict(r, g) == v for f in factors for r, v in zip(levels[f], ref, strict=True))
+        if total > best_total:
+            best_e, best_total = float(e), total
+    overall = best_total / (n * len(factors))
+
+    out_md = REPO / "reports" / f"{args.out_stem}.md"
+    out_json = REPO / "reports" / "_plan" / "quality_pyramid_candidate.json"
+    lines += [
+        "",
+        f"- Shared exponent (all factors): **{best_e:.2f}**, agreement {overall:.1%}",
+        "- `pyramid_max_side` stays 0 (off) in code until this candidate is reviewed and applied.",
+        "",
+        "Artifacts:",
+        f"- {out_md.relative_to(REPO)}",
+        f"- {out_json.relative_to(REPO)}",
+    ]
+    out_md.parent.mkdir(parents=True, exist_ok=True)
+    out_md.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out_json.write_text(
+        json.dumps(
+            {
+                "note": "Candidate pyramid settings from calibration. Update QualityGates next.",
+                "pyramid_lap_exponent": round(best_e, 3),
+                "agreement": round(overall, 4),
+                "per_factor": candidate,
+                "n_images": n,
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    print(out_md.read_text(encoding="utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
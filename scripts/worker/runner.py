@@ -30,6 +30,10 @@ STATE_PATH = REPO / "reports" / "worker_state.json"
 OUTBOX_PATH = REPO / "reports" / "outbox_telegram.txt"
 ERROR_PATH = REPO / "reports" / "worker_last_error.txt"
 ACTIONS_LOG_PATH = REPO / "reports" / "actions_log.jsonl"
+# Pose results are computed once per (image, ROI, model, input size) and reused across ticks.
+LANDMARK_STORE_DIR = REPO / "data" / "landmark_store" / "coco_val2017"
+# Processes for the image-heavy actions (sharded; results do not depend on it).
+WORKER_PROCESSES = int(os.environ.get("WORKER_PROCESSES", "1"))
 
 
 @dataclass
@@ -114,7 +118,7 @@ def action_roi_list_from_keypoints(pad_frac: float = 0.15) -> tuple[str, str]:
 def action_quality_gates(n: int = 1000) -> tuple[str, str]:
     import subprocess
 
-    cmd = ["python3", "scripts/actions/quality_gates_eval.py", "--n", str(n)]
+    cmd = ["python3", "scripts/actions/quality_gates_eval.py", "--n", str(n), "--workers", str(WORKER_PROCESSES)]
     r = subprocess.run(cmd, cwd=str(REPO), capture_output=True, text=True)
     if r.returncode != 0:
         return ("erro em quality gates", "ver logs/traceback")
@@ -126,10 +130,34 @@ def action_quality_gates(n: int = 1000) -> tuple[str, str]:
     return (f"quality gates {ok_line} {rej_line}", "ajustar ROI pad e rerodar quality gates")
 
 
+def extract_roi_poses(extractor, items: list[tuple[str, tuple[int, int, int, int]]]):
+    """ROI-crop pose per (image path, crop box): {"status", "landmarks" (packed rows or None)}."""
+    from bodycomp_estimator.image_loader import iter_images
+    from bodycomp_estimator.landmark_store import pack_pose
+
+    # Crops are decoded ahead on background threads while this thread runs pose.
+    paths = [img_path for img_path, _ in items]
+    boxes = [box for _, box in items]
+    for crop in iter_images(paths, boxes):
+        if crop is None:
+            yield {"status": "read_fail", "landmarks": None}
+            continue
+        if crop.size == 0:
+            yield {"status": "empty_crop", "landmarks": None}
+            continue
+        pose = extractor.extract(crop)
+        yield {
+            "status": "ok" if pose is not None else "no_pose",
+            "landmarks": None if pose is None else pack_pose(pose).tolist(),
+        }
+
+
 def action_rerun_pose_on_roi_sample(n: int = 200, seed: int = 42) -> tuple[str, str]:
-    import cv2
+    import functools
 
+    from bodycomp_estimator.landmark_store import LandmarkKey, LandmarkStore, unpack_pose
     from bodycomp_estimator.pose import PoseExtractor
+    from bodycomp_estimator.sharding import run_sharded
 
     roi_list = REPO / "reports" / "coco_val2017_roi_from_keypoints.jsonl"
     img_dir = REPO / "data" / "datasets" / "coco2017" / "val2017"
@@ -143,68 +171,82 @@ def action_rerun_pose_on_roi_sample(n: int = 200, seed: int = 42) -> tuple[str,
     random.seed(seed)
     sample = random.sample(rows, k=min(n, len(rows)))
 
+    # Only `model_id` is used here; the worker processes build their own landmarker.
     extractor = PoseExtractor(static_image_mode=True)
+    store = LandmarkStore(LANDMARK_STORE_DIR)
 
     ok = 0
     no_pose = 0
     read_fail = 0
+    cached = 0
+
+    # Pass 1 (in order): invalid rows and store hits are resolved here; the rest
+    # are run on the worker processes.
+    recs: list[dict] = []
+    todo: list[tuple[int, LandmarkKey]] = []
+    items: list[tuple[str, tuple[int, int, int, int]]] = []
+    first: dict[str, int] = {}  # key -> rec of its first occurrence in `todo`
+    repeats: list[tuple[int, int]] = []  # later occurrences count as cache hits, as in a serial run
+    for r in sample:
+        fn = r.get("file_name") or r.get("file") or ""
+        bbox = r.get("bbox") or r.get("roi_xywh") or r.get("bbox_xywh")
+        rec = {"file": fn or None, "bbox": bbox}
+        recs.append(rec)
+
+        if not isinstance(fn, str) or not fn.strip():
+            rec["status"] = "missing_file_name"
+            continue
+        fn = fn.strip()
+
+        if not (isinstance(bbox, (list, tuple)) and len(bbox) == 4):
+            rec["status"] = "missing_or_invalid_bbox"
+            continue
+
+        key = LandmarkKey.from_roi(fn, bbox, model=extractor.model_id)
+        stored = store.status(key)
+        if stored is not None or key.as_str() in first:
+            if stored is not None:
+                rec["status"] = stored
+            else:
+                repeats.append((len(recs) - 1, first[key.as_str()]))
+            rec["cached"] = True
+            continue
+        first[key.as_str()] = len(recs) - 1
+
+        # `fn` may be a bare COCO file_name (0000.jpg) or a repo-relative path.
+        img_path = (REPO / fn).resolve() if "/" in fn else img_dir / fn
+        todo.append((len(recs) - 1, key))
+        # Crop exactly the box the key was built from.
+        items.append((str(img_path), key.roi))
+
+    init = functools.partial(PoseExtractor, static_image_mode=True)
+    keys, poses = [], []
+    results = run_sharded(items, extract_roi_poses, init=init, workers=WORKER_PROCESSES)
+    for (i, key), res in zip(todo, results, strict=True):
+        recs[i]["status"] = res["status"]
+        if res["status"] in ("ok", "no_pose"):
+            keys.append(key)
+            poses.append(None if res["landmarks"] is None else unpack_pose(res["landmarks"]))
+    store.put_many(keys, poses)
+    for i, j in repeats:
+        status = recs[j]["status"]
+        # read/crop failures are not stored, so a serial run would have retried them
+        recs[i]["status"] = status
+        if status not in ("ok", "no_pose"):
+            recs[i].pop("cached")
 
     with out_jsonl.open("w", encoding="utf-8") as f:
-        for r in sample:
-            fn = r.get("file_name") or r.get("file") or ""
-            bbox = r.get("bbox") or r.get("roi_xywh") or r.get("bbox_xywh")
-            rec = {"file": fn or None, "bbox": bbox}
-
-            if not isinstance(fn, str) or not fn.strip():
-                rec["status"] = "missing_file_name"
-                read_fail += 1
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                continue
-            fn = fn.strip()
-
-            if not (isinstance(bbox, (list, tuple)) and len(bbox) == 4):
-                rec["status"] = "missing_or_invalid_bbox"
-                read_fail += 1
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                continue
-
-            # `fn` may be a bare COCO file_name (0000.jpg) or a repo-relative path.
-            if "/" in fn:
-                img_path = (REPO / fn).resolve()
+        for rec in recs:
+            if rec.pop("cached", False):
+                cached += 1
+            if rec["status"] == "ok":
+                ok += 1
+            elif rec["status"] == "no_pose":
+                no_pose += 1
             else:
-                img_path = img_dir / fn
-
-            bgr = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
-            if bgr is None:
-                rec["status"] = "read_fail"
                 read_fail += 1
-            else:
-                x, y, w, h = bbox
-                x0 = max(0, int(x))
-                y0 = max(0, int(y))
-                x1 = min(bgr.shape[1], int(x + w))
-                y1 = min(bgr.shape[0], int(y + h))
-                crop = bgr[y0:y1, x0:x1]
-                if crop.size == 0:
-                    rec["status"] = "empty_crop"
-                    read_fail += 1
-                else:
-                    rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
-                    pose = extractor.extract(rgb)
-                    if pose is None:
-                        rec["status"] = "no_pose"
-                        no_pose += 1
-                    else:
-                        rec["status"] = "ok"
-                        ok += 1
-
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
-    try:
-        extractor.close()
-    except Exception:
-        pass
-
     out_md.write_text(
         "\n".join(
             [
@@ -213,6 +255,7 @@ def action_rerun_pose_on_roi_sample(n: int = 200, seed: int = 42) -> tuple[str,
                 f"- OK: {ok}",
                 f"- No pose: {no_pose}",
                 f"- Read/crop fail: {read_fail}",
+                f"- From landmark store (cached): {cached}",
                 "",
                 "Artifacts:",
                 f"- {out_jsonl.relative_to(REPO)}",
@@ -223,7 +266,7 @@ def action_rerun_pose_on_roi_sample(n: int = 200, seed: int = 42) -> tuple[str,
         encoding="utf-8",
     )
 
-    return (f"rodei pose em ROI sample {len(sample)} (ok={ok}, no_pose={no_pose})", "aumentar sample p/ 1000 + quality gates")
+    return (f"rodei pose em ROI sample {len(sample)} (ok={ok}, no_pose={no_pose}, cache={cached})", "aumentar sample p/ 1000 + quality gates")
 
 
 def maybe_milestone_commit(tick: int) -> None: